@@ -8,8 +8,53 @@ from pathlib import Path
 # Whisper model configuration
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")  # Options: tiny, base, small, medium, large
 
+# Acoustic feature configuration
+ACOUSTIC_ENGINE = os.getenv("ACOUSTIC_ENGINE", "opensmile")  # Options: opensmile, numpy
+ANALYSIS_SAMPLE_RATE = int(os.getenv("ANALYSIS_SAMPLE_RATE", "16000"))
+TIMESERIES_WINDOW = float(os.getenv("TIMESERIES_WINDOW", "1.0"))  # Seconds per time series point
+
+# Windowed extraction for long recordings (both engines: NumPy windows on a process pool, openSMILE on threads)
+ACOUSTIC_WINDOWED_MIN_DURATION = float(os.getenv("ACOUSTIC_WINDOWED_MIN_DURATION", "600"))  # Seconds
+ACOUSTIC_WINDOW_SECONDS = float(os.getenv("ACOUSTIC_WINDOW_SECONDS", "60"))
+ACOUSTIC_MAX_WORKERS = int(os.getenv("ACOUSTIC_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+# Sampling-based estimation for very long recordings (NumPy engine only; openSMILE extracts every window)
+ACOUSTIC_SAMPLING_MIN_DURATION = float(os.getenv("ACOUSTIC_SAMPLING_MIN_DURATION", "2700"))  # Seconds
+ACOUSTIC_SAMPLE_WINDOW_SECONDS = float(os.getenv("ACOUSTIC_SAMPLE_WINDOW_SECONDS", "10"))
+ACOUSTIC_SAMPLING_CI_WIDTH = float(os.getenv("ACOUSTIC_SAMPLING_CI_WIDTH", "0.1"))  # Relative to the estimate
+ACOUSTIC_SAMPLING_INITIAL_WINDOWS = int(os.getenv("ACOUSTIC_SAMPLING_INITIAL_WINDOWS", "24"))
+
+# Live rehearsal meter (WebSocket)
+LIVE_SAMPLE_RATE = int(os.getenv("LIVE_SAMPLE_RATE", "16000"))  # Default rate of the streamed PCM16
+LIVE_UPDATE_INTERVAL = float(os.getenv("LIVE_UPDATE_INTERVAL", "0.1"))  # Seconds between updates
+LIVE_HISTORY_SECONDS = float(os.getenv("LIVE_HISTORY_SECONDS", "3.0"))  # Pitch history for monotony
+LIVE_MAX_MESSAGE_BYTES = int(os.getenv("LIVE_MAX_MESSAGE_BYTES", "32768"))
+LIVE_MAX_CONNECTIONS = int(os.getenv("LIVE_MAX_CONNECTIONS", "100"))  # Concurrent streams per worker
+
+# Text analysis configuration
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+TEXT_BATCH_SIZE = int(os.getenv("TEXT_BATCH_SIZE", "64"))  # Transcripts per nlp.pipe batch
+TEXT_N_PROCESS = int(os.getenv("TEXT_N_PROCESS", "1"))  # spaCy processes for bulk analysis, -1 for all cores
+LONG_SENTENCE_WORDS = int(os.getenv("LONG_SENTENCE_WORDS", "25"))  # Words above which a sentence is flagged as long
+TEXT_RATE_WINDOW = float(os.getenv("TEXT_RATE_WINDOW", "30"))  # Seconds covered by live word and filler rates
+READABILITY_SYLLABLE_CACHE_SIZE = int(os.getenv("READABILITY_SYLLABLE_CACHE_SIZE", "65536"))  # Distinct words
+FILLER_LEXICON_CACHE_SIZE = int(os.getenv("FILLER_LEXICON_CACHE_SIZE", "128"))  # Compiled custom lexicons kept
+
+# Time-series analytics (pace curve, filler density, pause histogram)
+ANALYTICS_BIN_SECONDS = float(os.getenv("ANALYTICS_BIN_SECONDS", "5"))  # Width of a chart bin
+ANALYTICS_PACE_WINDOW = float(os.getenv("ANALYTICS_PACE_WINDOW", "30"))  # Seconds averaged per pace point
+
+# Repeated phrase (verbal tic) detection
+PHRASE_MIN_N = int(os.getenv("PHRASE_MIN_N", "2"))  # Fewest words in a phrase
+PHRASE_MAX_N = int(os.getenv("PHRASE_MAX_N", "6"))  # Most words in a phrase
+PHRASE_MIN_REPEATS = int(os.getenv("PHRASE_MIN_REPEATS", "3"))  # Occurrences before a phrase is reported
+PHRASE_TRACKED_MAX = int(os.getenv("PHRASE_TRACKED_MAX", "50000"))  # Bound on distinct phrases counted
+PHRASE_REPORT_LIMIT = int(os.getenv("PHRASE_REPORT_LIMIT", "10"))  # Phrases returned per transcript
+PHRASE_MAX_OFFSETS = int(os.getenv("PHRASE_MAX_OFFSETS", "20"))  # Occurrences located per phrase
+
 # OpenSMILE configuration (for acoustic features)
 OPENSMILE_PATH = os.getenv("OPENSMILE_PATH", "opensmile/SMILExtract")
+OPENSMILE_FEATURE_SET = os.getenv("OPENSMILE_FEATURE_SET", "eGeMAPSv02")  # Options: eGeMAPSv02, ComParE_2016
 
 # Application settings
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
@@ -25,11 +70,47 @@ LLM_API_KEY = os.getenv("LLM_API_KEY", "")
 LLM_API_URL = os.getenv("LLM_API_URL", "https://api.openai.com/v1/completions")
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
 
+# Groq client (coaching feedback); one pooled client is shared per worker
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))  # Seconds to establish a connection
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "60"))  # Seconds to wait for a completion
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "10"))
+GROQ_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "5"))
+GROQ_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "60"))  # Seconds an idle connection is kept
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))  # Provider request budget
+GROQ_TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))  # Provider token budget
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # LLM requests in flight per worker
+LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "3"))  # Retries after a 429 or transient error
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "2"))  # First backoff without Retry-After
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1000"))  # Completion tokens per feedback request
+LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "3000"))  # Prompt tokens per feedback request
+PROMPT_TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "cl100k_base")  # tiktoken encoding for counts
+
+# Supabase (analysis storage and access-token validation)
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
+
 # File upload settings
 MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB
 ALLOWED_AUDIO_FORMATS = [".wav", ".mp3", ".flac", ".ogg", ".m4a"]
 STATIC_DIR = Path("static")
 TEMP_DIR = STATIC_DIR / "temp"
 
+# Private application data (indexes, caches); unlike STATIC_DIR it is never served
+DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
+
+# Per-user corpus statistics (keywords and overused words across sessions)
+CORPUS_INDEX_PATH = Path(os.getenv("CORPUS_INDEX_PATH", str(DATA_DIR / "corpus_index.db")))  # Holds users' vocabulary
+CORPUS_KEYWORD_LIMIT = int(os.getenv("CORPUS_KEYWORD_LIMIT", "10"))  # Keywords and overused words returned
+CORPUS_OVERUSE_MIN_COUNT = int(os.getenv("CORPUS_OVERUSE_MIN_COUNT", "3"))  # Session occurrences to be overused
+CORPUS_OVERUSE_RATIO = float(os.getenv("CORPUS_OVERUSE_RATIO", "2.0"))  # Times the usual rate to be overused
+
+# LLM feedback cache
+FEEDBACK_CACHE_ENABLED = os.getenv("FEEDBACK_CACHE_ENABLED", "true").lower() == "true"
+FEEDBACK_CACHE_PATH = Path(os.getenv("FEEDBACK_CACHE_PATH", str(DATA_DIR / "feedback_cache.db")))
+FEEDBACK_CACHE_TTL = float(os.getenv("FEEDBACK_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds an entry stays valid
+FEEDBACK_CACHE_MAX_ENTRIES = int(os.getenv("FEEDBACK_CACHE_MAX_ENTRIES", "10000"))  # Entries kept on disk
+FEEDBACK_CACHE_MEMORY_ENTRIES = int(os.getenv("FEEDBACK_CACHE_MEMORY_ENTRIES", "256"))  # Entries kept in memory
+
 # Ensure temp directory exists
 os.makedirs(TEMP_DIR, exist_ok=True)
\ No newline at end of file
@@ -6,7 +6,11 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 
 from app.config import API_PREFIX, ALLOWED_ORIGINS, DEBUG, STATIC_DIR
-from app.routers import audio
+from app.routers import audio, live
+from app.services.acoustic_features import check_feature_columns, shutdown_smile_executor
+from app.services.corpus_index import close_corpus_index
+from app.services.llm_feedback import close_llm_client, init_llm_client
+from app.services.windowed_acoustics import shutdown_executor
 
 # Configure logging
 logging.basicConfig(
@@ -51,6 +55,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Include routers
 app.include_router(audio.router, prefix=API_PREFIX)
+app.include_router(live.router, prefix=API_PREFIX)
 
 @app.get("/")
 async def root():
@@ -70,11 +75,17 @@ async def startup_event():
     logger.info(f"Debug mode: {DEBUG}")
     logger.info(f"API prefix: {API_PREFIX}")
     logger.info(f"Static directory: {STATIC_DIR}")
+    check_feature_columns()
+    init_llm_client()
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("PitchPerfect API shutting down")
+    shutdown_executor()
+    shutdown_smile_executor()
+    close_corpus_index()
+    await close_llm_client()
 
 if __name__ == "__main__":
     import uvicorn
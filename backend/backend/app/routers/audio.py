@@ -1,26 +1,38 @@
+import asyncio
 import os
 import uuid
 import json
+import logging
 import shutil
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Optional
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, Depends, Form
+from fastapi import APIRouter, File, HTTPException, UploadFile, Depends, Form, Query
 from fastapi.responses import JSONResponse
 from supabase import create_client, Client
 
 from app.config import ALLOWED_AUDIO_FORMATS, MAX_UPLOAD_SIZE, TEMP_DIR, SUPABASE_URL, SUPABASE_KEY
+from app.services.corpus_index import get_corpus_index
+from app.services.feature_groups import parse_fields
 from app.services.pipeline import process_audio_pipeline
 from app.services.report_generator import generate_report
 from models.response import UploadAudioResponse
 from app.dependencies import get_current_user
 
+# Configure logger
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 @router.post("/analyze", response_model=UploadAudioResponse)
-async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[str] = Form(None), current_user: dict = Depends(get_current_user)):
+async def analyze_audio(
+    audio_file: UploadFile = File(...),
+    duration: Optional[str] = Form(None),
+    fields: Optional[str] = Query(None, description="Comma-separated acoustic fields or groups to return"),
+    current_user: dict = Depends(get_current_user),
+):
     """
     Comprehensive audio analysis endpoint that processes uploaded audio file
     and returns a complete analysis including transcription, text analysis, 
@@ -29,6 +41,9 @@ async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[s
     Args:
         audio_file: Audio file uploaded via multipart/form-data
         duration: Optional duration of the audio recording
+        fields: Optional projection of the acoustic features in the response,
+            e.g. "speech_rate,prosody"; the feedback and the stored analysis
+            always use the full acoustic summary
         current_user: Current authenticated user information
         
     Returns:
@@ -37,6 +52,12 @@ async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[s
     Raises:
         HTTPException: For validation errors or processing failures
     """
+    # Validate the acoustic field projection
+    try:
+        acoustic_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     # Validate file size
     content = await audio_file.read()
     if len(content) > MAX_UPLOAD_SIZE:
@@ -67,7 +88,7 @@ async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[s
             buffer.write(content)
         
         # Process audio through pipeline
-        pipeline_result = process_audio_pipeline(str(temp_file_path))
+        pipeline_result = await process_audio_pipeline(str(temp_file_path), fields=acoustic_fields)
         
         if not pipeline_result.get("success", False):
             # If pipeline processing fails, use demo.json as fallback
@@ -92,6 +113,18 @@ async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[s
                     detail=f"Pipeline processing failed and error loading fallback data: {str(e)}"
                 )
         
+        # Compare the session with the user's earlier sessions
+        corpus_index = get_corpus_index()
+        if corpus_index is not None and pipeline_result.get("text_analysis"):
+            try:
+                # SQLite is blocking; keep it off the event loop
+                insights = await asyncio.to_thread(
+                    corpus_index.session_insights, current_user["id"], pipeline_result["transcript"]
+                )
+                pipeline_result["text_analysis"].update(insights)
+            except Exception as e:
+                logger.error(f"Error computing corpus keywords: {str(e)}")
+        
         # Generate final report
         report = generate_report(
             transcript=pipeline_result["transcript"],
@@ -99,7 +132,8 @@ async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[s
             acoustic_features=pipeline_result["acoustic_features"],
             llm_feedback=pipeline_result["llm_feedback"],
             user_id=current_user["id"],
-            session_id=process_id
+            session_id=process_id,
+            analytics=pipeline_result.get("analytics")
         )
         
         # Store in Supabase
@@ -110,10 +144,19 @@ async def analyze_audio(audio_file: UploadFile = File(...), duration: Optional[s
             "audio_duration": pipeline_result.get("audio_duration", 0.0),
             "transcript": pipeline_result["transcript"],
             "text_analysis": pipeline_result["text_analysis"],
-            "acoustic_features": pipeline_result["acoustic_features"],
+            "acoustic_features": pipeline_result.get("acoustic_summary", pipeline_result["acoustic_features"]),
             "llm_feedback": pipeline_result["llm_feedback"]
         }).execute()
         
+        # Add the stored transcript to the user's corpus statistics
+        if corpus_index is not None:
+            try:
+                await asyncio.to_thread(
+                    corpus_index.add_document, current_user["id"], process_id, pipeline_result["transcript"]
+                )
+            except Exception as e:
+                logger.error(f"Error updating corpus index: {str(e)}")
+        
         # Create response object
         response = UploadAudioResponse(**report)
         return response
@@ -0,0 +1,126 @@
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.config import (
+    LIVE_MAX_CONNECTIONS,
+    LIVE_MAX_MESSAGE_BYTES,
+    LIVE_SAMPLE_RATE,
+    LIVE_UPDATE_INTERVAL,
+    SUPABASE_KEY,
+    SUPABASE_URL,
+)
+from app.services.live_meter import LiveMeter
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Check if the Supabase client is available for token validation
+supabase_available = importlib.util.find_spec("supabase") is not None
+
+router = APIRouter()
+
+# Accepted sample rates of the streamed PCM, in Hz
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+
+# Open live meter streams in this worker
+_active_connections = 0
+_supabase = None
+
+
+def _verify_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a Supabase access token to its user.
+
+    Blocking; call it off the event loop. Fails closed: without a
+    configured Supabase client every token is rejected.
+
+    Args:
+        token: Access token sent by the client
+
+    Returns:
+        Dictionary with the user's "id", or None if the token is invalid
+    """
+    global _supabase
+    if not supabase_available or not SUPABASE_URL:
+        logger.warning("Supabase is not configured, rejecting live meter token")
+        return None
+    try:
+        if _supabase is None:
+            from supabase import create_client
+            _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        response = _supabase.auth.get_user(token)
+    except Exception as e:
+        logger.warning(f"Live meter token validation failed: {str(e)}")
+        return None
+    if response is None or response.user is None:
+        return None
+    return {"id": response.user.id}
+
+
+@router.websocket("/live")
+async def live_meter(websocket: WebSocket, token: Optional[str] = None, sample_rate: int = LIVE_SAMPLE_RATE):
+    """
+    Live loudness and pitch feedback while the user rehearses.
+
+    The client authenticates with its access token in the token query
+    parameter, since browsers cannot set headers on a WebSocket handshake
+    (close code 1008 if it is missing or invalid, 1013 when the worker
+    already serves LIVE_MAX_CONNECTIONS streams). It then streams binary
+    messages of little-endian PCM16 mono audio (text messages close the
+    connection with code 1003) and receives a small JSON update with
+    rms_db, pitch, voiced, pitch_spread and monotone at most every
+    LIVE_UPDATE_INTERVAL seconds of wall-clock time, so a client sending
+    faster than real time cannot make the server analyse every interval.
+
+    Args:
+        websocket: WebSocket connection
+        token: Access token of the user
+        sample_rate: Sample rate of the streamed audio in Hz
+    """
+    global _active_connections
+    await websocket.accept()
+    if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        await websocket.close(code=1003, reason=f"sample_rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE}")
+        return
+    user = await asyncio.to_thread(_verify_token, token) if token else None
+    if user is None:
+        await websocket.close(code=1008, reason="A valid access token is required")
+        return
+    if _active_connections >= LIVE_MAX_CONNECTIONS:
+        await websocket.close(code=1013, reason="Too many live sessions, try again later")
+        return
+
+    _active_connections += 1
+    meter = LiveMeter(sr=sample_rate)
+    last_update = float("-inf")
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            data = message.get("bytes")
+            if data is None:
+                await websocket.close(code=1003, reason="Only binary PCM16 messages are accepted")
+                return
+            if len(data) > LIVE_MAX_MESSAGE_BYTES:
+                await websocket.close(code=1009, reason=f"Messages are limited to {LIVE_MAX_MESSAGE_BYTES} bytes")
+                return
+            if not meter.feed(data):
+                continue
+            now = time.monotonic()
+            if now - last_update < LIVE_UPDATE_INTERVAL:
+                continue
+            last_update = now
+            # YIN is CPU-bound; keep it off the event loop
+            update = await asyncio.to_thread(meter.update)
+            await websocket.send_json(update)
+    except WebSocketDisconnect:
+        logger.info(f"Live meter for user {user['id']} closed after {meter.samples_seen / meter.sr:.1f}s of audio")
+    finally:
+        _active_connections -= 1
@@ -1,11 +1,36 @@
+import importlib.util
 import logging
+import math
 import os
+import threading
 import wave
 import librosa
+import numpy as np
 import soundfile as sf
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
-import opensmile
+from typing import Dict, Any, List, Optional
+
+from app.config import (
+    ACOUSTIC_ENGINE,
+    ACOUSTIC_MAX_WORKERS,
+    ACOUSTIC_SAMPLING_MIN_DURATION,
+    ACOUSTIC_WINDOW_SECONDS,
+    ACOUSTIC_WINDOWED_MIN_DURATION,
+    ANALYSIS_SAMPLE_RATE,
+    OPENSMILE_FEATURE_SET,
+    TIMESERIES_WINDOW,
+)
+from app.services.feature_groups import FIELD_GROUPS, PUBLIC_GROUPS, AcousticFeatureGroups
+from app.services.numpy_acoustics import (
+    FrameFeatures,
+    downsample_frames,
+    summarize_frames,
+    timeseries_to_json,
+)
+from app.services.sampled_acoustics import extract_features_sampled
+from app.services.spectral_cache import SpectralCache
+from app.services.speech_rate import apply_speech_rate
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -19,6 +44,211 @@ if not logger.handlers:
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
+# Check if openSMILE is available
+opensmile_available = importlib.util.find_spec("opensmile") is not None
+if opensmile_available:
+    try:
+        import opensmile
+    except ImportError:
+        opensmile_available = False
+        logger.warning("openSMILE import failed despite module being found")
+
+# Frame options shared by every cached Smile instance. Per-file options such as
+# the start/end of the analysed segment are passed to process_file instead.
+SMILE_OPTIONS = {
+    'frameMode': 'fixed',
+    'frameSize': 0.025,  # 25ms frame size
+    'frameStep': 0.01,   # 10ms frame step
+}
+
+# Smile instances are not safe to share between threads, so each worker thread
+# keeps its own cache keyed by (feature_set, feature_level).
+_smile_local = threading.local()
+
+# Threads extracting the windows of long recordings; openSMILE runs in native
+# code, and each thread reuses its own cached Smile across requests
+_smile_executor: Optional[ThreadPoolExecutor] = None
+
+# Functionals read from each feature set (OPENSMILE_FEATURE_SET). eGeMAPSv02 computes 88 functionals
+# instead of ComParE_2016's 6,373 and covers everything AudioFeatures needs.
+FEATURE_COLUMNS = {
+    "eGeMAPSv02": {
+        "pitch_mean": "F0semitoneFrom27.5Hz_sma3nz_amean",
+        "pitch_std": "F0semitoneFrom27.5Hz_sma3nz_stddevNorm",
+        "energy_mean": "loudness_sma3_amean",
+        "energy_std": "loudness_sma3_stddevNorm",
+        "jitter": "jitterLocal_sma3nz_amean",
+        "shimmer": "shimmerLocaldB_sma3nz_amean",
+        "speech_rate": "VoicedSegmentsPerSec",
+    },
+    "ComParE_2016": {
+        "pitch_mean": "F0final_sma_amean",
+        "pitch_std": "F0final_sma_stddev",
+        "energy_mean": "pcm_RMSenergy_sma_amean",
+        "energy_std": "pcm_RMSenergy_sma_stddev",
+        "jitter": "jitterLocal_sma_amean",
+        "shimmer": "shimmerLocal_sma_amean",
+        "speech_rate": "voicingFinalUnclipped_sma_amean",
+    },
+}
+
+# Low-level descriptors read when frame-level output is requested
+LLD_COLUMNS = {
+    "eGeMAPSv02": {
+        "f0": "F0semitoneFrom27.5Hz_sma3nz",
+        "energy": "Loudness_sma3",
+        "jitter": "jitterLocal_sma3nz",
+        "shimmer": "shimmerLocaldB_sma3nz",
+    },
+    "ComParE_2016": {
+        "f0": "F0final_sma",
+        "energy": "pcm_RMSenergy_sma",
+        "jitter": "jitterLocal_sma",
+        "shimmer": "shimmerLocal_sma",
+    },
+}
+
+# openSMILE frame step for both feature sets, in seconds
+LLD_FRAME_STEP = 0.01
+
+# Audio read on either side of a window so edge frames see their full context, in seconds
+LLD_WINDOW_CONTEXT = 0.5
+
+# eGeMAPS reports F0 in semitones relative to 27.5 Hz
+SEMITONE_REFERENCE_HZ = 27.5
+
+def shimmer_db_to_ratio(shimmer_db):
+    """
+    Convert local shimmer in dB to the relative amplitude difference ComParE reports.
+    
+    Local shimmer in dB averages |20 * log10(A[i+1] / A[i])| over consecutive
+    periods, so 10 ** (dB / 20) - 1 recovers the mean relative difference
+    |A[i+1] - A[i]| / A[i] to first order.
+    
+    Args:
+        shimmer_db: Shimmer in dB, a float or array
+        
+    Returns:
+        Shimmer as a ratio, of the same shape
+    """
+    return np.power(10.0, np.asarray(shimmer_db, dtype=np.float64) / 20) - 1
+
+def get_smile(
+    feature_set: str = OPENSMILE_FEATURE_SET,
+    feature_level: str = "Functionals",
+) -> "opensmile.Smile":
+    """
+    Get the calling thread's openSMILE extractor for a configuration.
+    
+    Building a Smile parses the config and initializes the component graph,
+    so instances are created once per thread and configuration and reused.
+    
+    Args:
+        feature_set: Name of an opensmile.FeatureSet member
+        feature_level: Name of an opensmile.FeatureLevel member
+        
+    Returns:
+        Cached Smile instance for the current thread
+    """
+    instances = getattr(_smile_local, "instances", None)
+    if instances is None:
+        instances = _smile_local.instances = {}
+    key = (feature_set, feature_level)
+    smile = instances.get(key)
+    if smile is None:
+        logger.debug(f"Building openSMILE extractor for {feature_set} / {feature_level}")
+        smile = opensmile.Smile(
+            feature_set=getattr(opensmile.FeatureSet, feature_set),
+            feature_level=getattr(opensmile.FeatureLevel, feature_level),
+            options=SMILE_OPTIONS,
+        )
+        instances[key] = smile
+    return smile
+
+def get_smile_executor() -> ThreadPoolExecutor:
+    """Get the shared openSMILE thread pool, creating it on first use."""
+    global _smile_executor
+    if _smile_executor is None:
+        _smile_executor = ThreadPoolExecutor(max_workers=ACOUSTIC_MAX_WORKERS, thread_name_prefix="opensmile")
+    return _smile_executor
+
+def shutdown_smile_executor() -> None:
+    """Shut down the shared openSMILE thread pool if it was started."""
+    global _smile_executor
+    if _smile_executor is not None:
+        _smile_executor.shutdown(wait=True)
+        _smile_executor = None
+
+def check_feature_columns(feature_set_name: str = OPENSMILE_FEATURE_SET) -> None:
+    """
+    Confirm the configured feature set produces every column we read.
+    
+    Both the functionals (FEATURE_COLUMNS) and the low-level descriptors
+    (LLD_COLUMNS) are checked, since requests with time series are served
+    from the descriptors. Meant to run once at startup so a renamed or
+    misconfigured feature set fails loudly instead of silently reporting zeros.
+    
+    Args:
+        feature_set_name: Name of the feature set, a key of FEATURE_COLUMNS
+        
+    Raises:
+        ValueError: If the feature set is unknown or columns are missing
+    """
+    if ACOUSTIC_ENGINE != "opensmile" or not opensmile_available:
+        logger.info(f"Skipping openSMILE column check (engine: {ACOUSTIC_ENGINE})")
+        return
+    if feature_set_name not in FEATURE_COLUMNS:
+        raise ValueError(
+            f"Unknown openSMILE feature set '{feature_set_name}'. "
+            f"Supported: {', '.join(FEATURE_COLUMNS)}"
+        )
+    missing: List[str] = []
+    for columns, feature_level in (
+        (FEATURE_COLUMNS, "Functionals"),
+        (LLD_COLUMNS, "LowLevelDescriptors"),
+    ):
+        available = set(get_smile(feature_set_name, feature_level).feature_names)
+        missing += [
+            f"{column} ({feature_level})" for column in columns[feature_set_name].values()
+            if column not in available
+        ]
+    if missing:
+        raise ValueError(
+            f"openSMILE feature set '{feature_set_name}' is missing columns: {', '.join(missing)}"
+        )
+    logger.info(f"openSMILE feature set '{feature_set_name}' provides all required columns")
+
+def map_functionals(feature_set_name: str, row: Dict[str, float]) -> Dict[str, float]:
+    """
+    Map one row of openSMILE functionals onto AudioFeatures fields.
+    
+    eGeMAPS values are converted to the units ComParE reports: pitch in Hz,
+    shimmer as a ratio instead of dB, and standard deviations instead of
+    coefficients of variation. Energy cannot be converted: with eGeMAPS it
+    is perceived loudness (sone), with ComParE RMS energy.
+    
+    Args:
+        feature_set_name: Name of the feature set the row came from
+        row: Functionals keyed by openSMILE column name
+        
+    Returns:
+        Dictionary with pitch, energy, voice quality and rate fields
+    """
+    columns = FEATURE_COLUMNS[feature_set_name]
+    values = {field: float(row.get(column, 0.0)) for field, column in columns.items()}
+    
+    if feature_set_name == "eGeMAPSv02":
+        semitone_mean = values["pitch_mean"]
+        semitone_std = values["pitch_std"] * semitone_mean
+        pitch_hz = SEMITONE_REFERENCE_HZ * 2 ** (semitone_mean / 12) if semitone_mean > 0 else 0.0
+        values["pitch_mean"] = pitch_hz
+        # First-order conversion of a semitone spread around the mean to Hz
+        values["pitch_std"] = pitch_hz * math.log(2) / 12 * semitone_std
+        values["energy_std"] = values["energy_std"] * values["energy_mean"]
+        values["shimmer"] = float(shimmer_db_to_ratio(values["shimmer"]))
+    
+    return values
+
 def get_audio_duration(audio_path: Path) -> float:
     """Get the duration of an audio file in seconds."""
     try:
@@ -28,14 +258,155 @@ def get_audio_duration(audio_path: Path) -> float:
         logger.error(f"Error getting audio duration: {str(e)}")
         return 5.0  # Default duration
 
-def extract_features(audio_path: Path) -> Dict[str, Any]:
-    """Extract acoustic features from audio using openSMILE.
+def load_audio(audio_path: Path, sr: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an audio file to a mono float32 signal.
+    
+    Args:
+        audio_path: Path to the audio file
+        sr: Target sample rate in Hz
+        
+    Returns:
+        Mono signal resampled to sr
+    """
+    y, _ = librosa.load(str(audio_path), sr=sr, mono=True)
+    return y.astype(np.float32, copy=False)
+
+def _extract_opensmile(audio_path: Path, duration: float) -> Dict[str, Any]:
+    """Extract acoustic features from a WAV file with openSMILE."""
+    # Reuse this thread's extractor; the segment comes from the call
+    smile = get_smile(OPENSMILE_FEATURE_SET)
+    
+    # Extract features
+    features_df = smile.process_file(str(audio_path), start=0.0, end=duration)
+    
+    # Map the functionals to our required format
+    features = map_functionals(OPENSMILE_FEATURE_SET, features_df.iloc[0].to_dict())
+    features["speaking_duration"] = duration
+    
+    logger.info("Successfully extracted acoustic features with openSMILE")
+    return features
+
+def _opensmile_lld(audio_path: Path, start: float, end: float) -> Dict[str, np.ndarray]:
+    """Low-level descriptors of LLD_COLUMNS for a segment of a file, by field."""
+    smile = get_smile(OPENSMILE_FEATURE_SET, "LowLevelDescriptors")
+    lld_df = smile.process_file(str(audio_path), start=start, end=end)
+    return {
+        field: lld_df[column].to_numpy(dtype=np.float64)
+        for field, column in LLD_COLUMNS[OPENSMILE_FEATURE_SET].items()
+    }
+
+def _opensmile_lld_windowed(
+    audio_path: Path,
+    duration: float,
+    window_seconds: float = ACOUSTIC_WINDOW_SECONDS,
+) -> Dict[str, np.ndarray]:
+    """
+    Low-level descriptors of a long recording, extracted in parallel windows.
+    
+    Each window is extracted with LLD_WINDOW_CONTEXT seconds of audio on
+    either side, which covers the 60 ms pitch frames and the sma3 smoothing,
+    and the context frames are trimmed so each window keeps only the frames
+    of its own span on the global frame grid. The concatenation therefore
+    approximately equals the descriptors of a single pass; openSMILE state
+    reaching further than the context (e.g. pitch candidate tracking) can
+    still make frames near window edges differ slightly.
+    """
+    per_window = max(1, int(round(window_seconds / LLD_FRAME_STEP)))
+    window_seconds = per_window * LLD_FRAME_STEP
+    context_frames = int(round(LLD_WINDOW_CONTEXT / LLD_FRAME_STEP))
+    context = context_frames * LLD_FRAME_STEP
+    starts = [i * window_seconds for i in range(max(1, math.ceil(duration / window_seconds)))]
+    logger.info(f"Extracting openSMILE descriptors over {len(starts)} windows of {window_seconds:.0f}s")
+    
+    def extract(start: float) -> Dict[str, np.ndarray]:
+        # The first window has no audio before it to use as context
+        lead = min(context_frames, int(round(start / LLD_FRAME_STEP)))
+        end = min(start + window_seconds + context + SMILE_OPTIONS['frameSize'], duration)
+        part = _opensmile_lld(audio_path, start - lead * LLD_FRAME_STEP, end)
+        return {field: values[lead:lead + per_window] for field, values in part.items()}
+    
+    parts = list(get_smile_executor().map(extract, starts))
+    return {field: np.concatenate([part[field] for part in parts]) for field in parts[0]}
+
+def _extract_opensmile_frames(
+    audio_path: Path,
+    duration: float,
+    timeseries_window: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Extract acoustic features and time series from one openSMILE LLD pass.
+    
+    The functionals are reduced from the same low-level descriptors that feed
+    the time series, so no second pass over the audio is needed. Recordings
+    longer than ACOUSTIC_WINDOWED_MIN_DURATION are extracted in parallel
+    windows. The functionals are therefore not those of _extract_opensmile:
+    
+    - pitch_mean, pitch_std: mean and standard deviation of the voiced F0
+      descriptor in Hz (summarize_frames)
+    - energy_mean, energy_std: mean and standard deviation of the energy
+      descriptor over all frames (summarize_frames)
+    - jitter, shimmer: mean of the jitter and shimmer descriptors over voiced
+      frames, shimmer converted to a ratio
+    - pauses and speech rate: from the voicing of the F0 descriptor
+      (summarize_frames); the speech rate is replaced by syllable nuclei
+    
+    Time series are added only when timeseries_window is given.
+    """
+    if duration >= ACOUSTIC_WINDOWED_MIN_DURATION:
+        lld = _opensmile_lld_windowed(audio_path, duration)
+    else:
+        lld = _opensmile_lld(audio_path, 0.0, duration)
+    
+    f0 = lld["f0"]
+    voiced = f0 > 0
+    if OPENSMILE_FEATURE_SET == "eGeMAPSv02":
+        f0 = np.where(voiced, SEMITONE_REFERENCE_HZ * 2 ** (f0 / 12), 0.0)
+    energy = lld["energy"]
+    frames = FrameFeatures(f0=f0, energy=energy, peak=energy, voiced=voiced, frame_step=LLD_FRAME_STEP)
+    
+    features = summarize_frames(frames, duration)
+    for field in ("jitter", "shimmer"):
+        values = lld[field][voiced]
+        if field == "shimmer" and OPENSMILE_FEATURE_SET == "eGeMAPSv02":
+            values = shimmer_db_to_ratio(values)
+        features[field] = float(values.mean()) if values.size else 0.0
+    if timeseries_window:
+        features["timeseries"] = timeseries_to_json(downsample_frames(frames, timeseries_window), timeseries_window)
+    
+    logger.info("Successfully extracted acoustic features from openSMILE descriptors")
+    return features
+
+def extract_feature_groups(
+    audio_path: Path,
+    engine: str = ACOUSTIC_ENGINE,
+    include_timeseries: bool = True,
+    timeseries_window: float = TIMESERIES_WINDOW,
+    cache: Optional[SpectralCache] = None,
+) -> AcousticFeatureGroups:
+    """Prepare lazily computed acoustic feature groups for an audio file.
+    
+    With the NumPy engine nothing is analysed until a group is requested;
+    recordings longer than ACOUSTIC_WINDOWED_MIN_DURATION are then analysed
+    in parallel windows, and recordings longer than
+    ACOUSTIC_SAMPLING_MIN_DURATION are estimated from a sample of windows.
+    openSMILE and the sampling estimator compute everything in one pass, so
+    their results fill every group at once; openSMILE extracts recordings
+    longer than ACOUSTIC_WINDOWED_MIN_DURATION in parallel windows but does
+    not sample. The NumPy engine is also the fallback when openSMILE
+    is missing or fails.
     
     Args:
         audio_path: Path to the audio file (supports WAV and MP3)
+        engine: Feature engine, "opensmile" or "numpy"
+        include_timeseries: Whether openSMILE should produce time series;
+            the NumPy engine computes them only when requested
+        timeseries_window: Time series window length in seconds
+        cache: Spectral cache of the already decoded recording; its samples
+            and spectra are reused instead of decoding the file again
         
     Returns:
-        Dictionary containing extracted acoustic features
+        AcousticFeatureGroups for the recording
     """
     logger.info(f"Extracting acoustic features from: {audio_path}")
     
@@ -49,8 +420,10 @@ def extract_features(audio_path: Path) -> Dict[str, Any]:
         logger.error(error_msg)
         raise FileNotFoundError(error_msg)
     
-    # Convert any audio format to WAV if needed
-    if audio_path.suffix.lower() != '.wav':
+    # Convert any audio format to WAV if needed; only openSMILE reads the file
+    # again when the decoded audio is already cached
+    needs_file = cache is None or (engine == "opensmile" and opensmile_available)
+    if needs_file and audio_path.suffix.lower() != '.wav':
         logger.info("Converting audio to WAV for analysis")
         wav_path = audio_path.with_suffix('.wav')
         try:
@@ -63,52 +436,68 @@ def extract_features(audio_path: Path) -> Dict[str, Any]:
         except Exception as e:
             logger.error(f"Audio conversion failed: {str(e)}")
             raise
+    
+    duration = get_audio_duration(audio_path) if cache is None else cache.duration
+    y = load_audio(audio_path) if cache is None else cache.y
+    
+    if engine == "opensmile" and opensmile_available:
+        try:
+            if include_timeseries or duration >= ACOUSTIC_WINDOWED_MIN_DURATION:
+                features = _extract_opensmile_frames(
+                    audio_path, duration, timeseries_window if include_timeseries else None
+                )
+            else:
+                features = _extract_opensmile(audio_path, duration)
+            # Speech rate comes from syllable nuclei for both engines
+            features = apply_speech_rate(features, y, ANALYSIS_SAMPLE_RATE, cache=cache)
+            return AcousticFeatureGroups.from_features(features)
+        except Exception as e:
+            logger.error(f"openSMILE extraction failed, falling back to NumPy: {str(e)}")
+    
+    if duration >= ACOUSTIC_SAMPLING_MIN_DURATION:
+        # Very long recordings are estimated from a sample of windows,
+        # including the speech rate; no time series are produced
+        return AcousticFeatureGroups.from_features(extract_features_sampled(y, ANALYSIS_SAMPLE_RATE))
+    return AcousticFeatureGroups(y, ANALYSIS_SAMPLE_RATE, cache=cache, timeseries_window=timeseries_window)
 
+def extract_features(
+    audio_path: Path,
+    engine: str = ACOUSTIC_ENGINE,
+    include_timeseries: bool = False,
+    timeseries_window: float = TIMESERIES_WINDOW,
+    cache: Optional[SpectralCache] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Extract acoustic features from audio using openSMILE or NumPy.
     
-    # Get audio duration first
-    duration = get_audio_duration(audio_path)
+    See extract_feature_groups for how the engine is chosen. Only the
+    groups needed for the requested fields are computed.
     
-    try:
-        # Initialize openSMILE with ComParE feature set and appropriate options
-        smile = opensmile.Smile(
-            feature_set=opensmile.FeatureSet.ComParE_2016,
-            feature_level=opensmile.FeatureLevel.Functionals,
-            options={
-                'audiofile_start': 0.0,
-                'audiofile_end': duration,
-                'frameMode': 'fixed',
-                'frameSize': 0.025,  # 25ms frame size
-                'frameStep': 0.01,   # 10ms frame step
-            }
-        )
-        
-        # Extract features
-        features_df = smile.process_file(str(audio_path))
-        
-        # Get audio duration
-        duration = get_audio_duration(audio_path)
-        
-        # Map ComParE features to our required format
-        # Log available features for debugging
-        # logger.debug(f"Available features: {features_df.columns.tolist()}")
-        
-        # Map ComParE features to our required format using available columns
-        features = {
-            "pitch_mean": float(features_df['F0final_sma_amean'].iloc[0]) if 'F0final_sma_amean' in features_df.columns else 0.0,
-            "pitch_std": float(features_df['F0final_sma_stddev'].iloc[0]) if 'F0final_sma_stddev' in features_df.columns else 0.0,
-            "energy_mean": float(features_df['pcm_RMSenergy_sma_amean'].iloc[0]) if 'pcm_RMSenergy_sma_amean' in features_df.columns else 0.0,
-            "energy_std": float(features_df['pcm_RMSenergy_sma_stddev'].iloc[0]) if 'pcm_RMSenergy_sma_stddev' in features_df.columns else 0.0,
-            "jitter": float(features_df['jitterLocal_sma_amean'].iloc[0]) if 'jitterLocal_sma_amean' in features_df.columns else 0.0,
-            "shimmer": float(features_df['shimmerLocal_sma_amean'].iloc[0]) if 'shimmerLocal_sma_amean' in features_df.columns else 0.0,
-            "speaking_duration": duration,
-            "speech_rate": float(features_df['voicingFinalUnclipped_sma_amean'].iloc[0]) if 'voicingFinalUnclipped_sma_amean' in features_df.columns else 0.0
-        }
-        
-        logger.info("Successfully extracted acoustic features with openSMILE")
-        return features
+    Args:
+        audio_path: Path to the audio file (supports WAV and MP3)
+        engine: Feature engine, "opensmile" or "numpy"
+        include_timeseries: Also return per-window pitch, energy and voicing
+            series computed from the same extraction pass
+        timeseries_window: Time series window length in seconds
+        cache: Spectral cache of the already decoded recording
+        fields: Field and group names to return; defaults to every group,
+            without time series unless include_timeseries is set
         
+    Returns:
+        Dictionary containing extracted acoustic features
+    """
+    if fields is None:
+        fields = [name for name in PUBLIC_GROUPS if include_timeseries or name != "timeseries"]
+    include_timeseries = include_timeseries or any(FIELD_GROUPS.get(name, name) == "timeseries" for name in fields)
+    
+    try:
+        groups = extract_feature_groups(audio_path, engine, include_timeseries, timeseries_window, cache)
+        return groups.select(fields)
+    except FileNotFoundError:
+        raise
     except Exception as e:
         logger.error(f"Error extracting acoustic features: {str(e)}")
+        duration = cache.duration if cache is not None else get_audio_duration(Path(audio_path))
         # Return default features in case of error
         return {
             "pitch_mean": 120.5,
@@ -0,0 +1,141 @@
+"""
+Time-series analytics for the dashboard charts.
+
+Word and filler positions are mapped to times with one np.interp over the
+segment timestamps, binned with np.bincount, and smoothed with a
+convolution, so an hour-long talk takes a few milliseconds. All outputs
+are short lists, one entry per time bin or histogram bucket.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.config import ANALYTICS_BIN_SECONDS, ANALYTICS_PACE_WINDOW
+from app.services.pause_detection import MIN_PAUSE, pause_histogram
+from app.services.readability import WORD_PATTERN
+from app.services.speech_rate import moving_sum
+from app.services.text_analysis import segment_starts
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def _time_map(transcript: str, segments: List[Dict[str, Any]]):
+    """Character offsets and times of segment starts and ends, for np.interp."""
+    timed = [s for s in segments if s.get("text", "").strip()]
+    starts = segment_starts(transcript, timed)
+    if len(starts) != len(timed):
+        # Fall back to segments laid end to end if the texts cannot be located
+        starts, cursor = [], 0
+        for segment in timed:
+            starts.append(cursor)
+            cursor += len(segment["text"].strip()) + 1
+    offsets, times = [], []
+    for start, segment in zip(starts, timed):
+        offsets += [start, start + len(segment["text"].strip())]
+        times += [float(segment["start"]), float(segment["end"])]
+    return np.asarray(offsets, dtype=np.float64), np.maximum.accumulate(np.asarray(times, dtype=np.float64))
+
+
+def _pauses(segments: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Silences between consecutive words when timed, otherwise between segments.
+
+    Whisper's transcribe is asked for word timestamps; segment gaps are the
+    fallback for transcripts without them and miss pauses within a segment.
+    Transcripts without segments (the fallback transcript) have no gaps.
+    """
+    words = [word for segment in segments for word in segment.get("words") or []]
+    spans = words if words else segments
+    if len(spans) < 2:
+        return np.zeros(0)
+    starts = np.array([float(span["start"]) for span in spans])
+    ends = np.array([float(span["end"]) for span in spans])
+    return np.maximum(starts[1:] - ends[:-1], 0.0)
+
+
+def compute_analytics(
+    transcript: str,
+    segments: List[Dict[str, Any]],
+    filler_offsets: Optional[List[Dict[str, Any]]] = None,
+    duration: float = 0.0,
+    bin_seconds: float = ANALYTICS_BIN_SECONDS,
+    pace_window: float = ANALYTICS_PACE_WINDOW,
+    acoustic_pauses: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Pace curve, filler density and pause histogram of a timed transcript.
+
+    Words and fillers are placed in time by interpolating their character
+    offsets within the Whisper segment that contains them, or by the word
+    timestamps when segments carry them. Without segments they are spread
+    evenly over duration.
+
+    The pause histogram uses the acoustic pause detector's buckets and
+    minimum pause, so both histograms agree on what a pause is. Gaps come
+    from the timestamps; a transcript without timed gaps falls back to the
+    acoustic histogram, measured from silence.
+
+    Args:
+        transcript: Transcript text
+        segments: Whisper segments with start, end and text
+        filler_offsets: Filler occurrences as returned by analyze_text
+        duration: Audio duration in seconds; the segment ends are used if longer
+        bin_seconds: Width of the time bins
+        pace_window: Seconds the words-per-minute curve averages over
+        acoustic_pauses: pause_histogram of the acoustic features, used
+            when the transcript has no timed gaps
+
+    Returns:
+        Dictionary with bin_seconds, words_per_minute (per bin), fillers
+        (total and per filler, counts per bin) and pauses (edges and counts)
+    """
+    offsets, times = _time_map(transcript, segments)
+    if not len(offsets) and duration > 0 and transcript.strip():
+        # Without segments the transcript is spread evenly over the recording
+        offsets, times = np.array([0.0, float(len(transcript))]), np.array([0.0, float(duration)])
+    end = max(duration, float(times[-1]) if len(times) else 0.0)
+    n_bins = max(1, int(np.ceil(end / bin_seconds)))
+
+    def binned(positions: np.ndarray) -> np.ndarray:
+        bins = np.clip((positions // bin_seconds).astype(np.int64), 0, n_bins - 1)
+        return np.bincount(bins, minlength=n_bins)
+
+    # Word times: timestamps when present, else interpolated character offsets
+    word_times = np.array([float(w["start"]) for s in segments for w in s.get("words") or []])
+    if not len(word_times) and len(offsets):
+        word_offsets = np.fromiter((m.start() for m in WORD_PATTERN.finditer(transcript)), dtype=np.float64)
+        word_times = np.interp(word_offsets, offsets, times)
+    words = binned(word_times)
+
+    # Words per minute over a centred window, normalized by the time it covers
+    width = max(1, int(round(pace_window / bin_seconds)))
+    covered = moving_sum(np.ones(n_bins), width) * bin_seconds
+    pace = moving_sum(words, width) / covered * 60
+
+    # Filler counts per bin, in total and for each filler
+    fillers = filler_offsets or []
+    by_filler: Dict[str, List[int]] = {}
+    total = np.zeros(n_bins, dtype=np.int64)
+    if fillers and len(offsets):
+        filler_times = np.interp([f["start"] for f in fillers], offsets, times)
+        total = binned(filler_times)
+        names = np.array([f["filler"] for f in fillers])
+        for name in np.unique(names):
+            by_filler[str(name)] = binned(filler_times[names == name]).tolist()
+
+    # Pause lengths on the acoustic buckets; the last bucket has no upper bound
+    gaps = _pauses(segments)
+    if gaps.size or acoustic_pauses is None:
+        pauses = pause_histogram(gaps[gaps >= MIN_PAUSE])
+    else:
+        pauses = acoustic_pauses
+
+    return {
+        "bin_seconds": bin_seconds,
+        "words_per_minute": np.round(pace, 1).tolist(),
+        "fillers": {"total": total.tolist(), "by_filler": by_filler},
+        "pauses": pauses,
+    }
@@ -0,0 +1,216 @@
+"""
+Incremental per-user term statistics across sessions.
+
+For every user the index keeps the number of stored transcripts and words,
+and per term the document frequency (transcripts containing it) and total
+term frequency. Each stored transcript updates only the rows of its own
+terms, and a new session is scored by looking up only its own terms, so
+neither operation touches older transcripts. The index lives in SQLite at
+CORPUS_INDEX_PATH, under DATA_DIR by default. It holds every user's
+vocabulary, so it must not be placed in a served directory such as
+STATIC_DIR.
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+
+from app.config import (
+    CORPUS_INDEX_PATH,
+    CORPUS_KEYWORD_LIMIT,
+    CORPUS_OVERUSE_MIN_COUNT,
+    CORPUS_OVERUSE_RATIO,
+)
+from app.services.readability import WORD_PATTERN
+from app.services.repeated_phrases import STOPWORDS
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Host parameter limit of older SQLite builds
+MAX_QUERY_TERMS = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS corpus_users (
+    user_id TEXT PRIMARY KEY,
+    documents INTEGER NOT NULL,
+    words INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS corpus_documents (
+    user_id TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    PRIMARY KEY (user_id, document_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS corpus_terms (
+    user_id TEXT NOT NULL,
+    term TEXT NOT NULL,
+    df INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (user_id, term)
+) WITHOUT ROWID;
+"""
+
+_index = None
+
+
+def term_counts(text: str) -> Counter:
+    """Occurrences of each lowercase content word of a transcript."""
+    return Counter(
+        word for word in (match.lower() for match in WORD_PATTERN.findall(text))
+        if len(word) > 1 and word not in STOPWORDS
+    )
+
+
+class CorpusIndex:
+    """Term and document frequencies of each user's stored transcripts."""
+
+    def __init__(self, path: Union[str, Path] = CORPUS_INDEX_PATH):
+        """
+        Args:
+            path: SQLite database file, or ":memory:"
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def add_document(self, user_id: str, document_id: str, text: str) -> bool:
+        """
+        Add a stored transcript to the user's statistics.
+
+        Args:
+            user_id: Owner of the transcript
+            document_id: Unique id of the transcript, e.g. the process id
+            text: Transcript text
+
+        Returns:
+            False if the document was already indexed, True otherwise
+        """
+        counts = term_counts(text)
+        with self.lock, self.connection:
+            added = self.connection.execute(
+                "INSERT OR IGNORE INTO corpus_documents (user_id, document_id) VALUES (?, ?)",
+                (user_id, document_id),
+            ).rowcount
+            if not added:
+                return False
+            self.connection.execute(
+                "INSERT INTO corpus_users (user_id, documents, words) VALUES (?, 1, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET documents = documents + 1, words = words + excluded.words",
+                (user_id, sum(counts.values())),
+            )
+            self.connection.executemany(
+                "INSERT INTO corpus_terms (user_id, term, df, tf) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (user_id, term) DO UPDATE SET df = df + 1, tf = tf + excluded.tf",
+                ((user_id, term, count) for term, count in counts.items()),
+            )
+        logger.debug(f"Indexed document {document_id} with {len(counts)} terms for user {user_id}")
+        return True
+
+    def _history(self, user_id: str, terms: Iterable[str]) -> Tuple[int, int, Dict[str, Tuple[int, int]]]:
+        """Documents and words of a user, and (df, tf) of the given terms."""
+        terms = list(terms)
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT documents, words FROM corpus_users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            stats: Dict[str, Tuple[int, int]] = {}
+            for i in range(0, len(terms), MAX_QUERY_TERMS):
+                chunk = terms[i:i + MAX_QUERY_TERMS]
+                placeholders = ",".join("?" * len(chunk))
+                for term, df, tf in self.connection.execute(
+                    f"SELECT term, df, tf FROM corpus_terms WHERE user_id = ? AND term IN ({placeholders})",
+                    [user_id, *chunk],
+                ):
+                    stats[term] = (df, tf)
+        documents, words = row if row else (0, 0)
+        return documents, words, stats
+
+    def session_insights(
+        self,
+        user_id: str,
+        text: str,
+        limit: int = CORPUS_KEYWORD_LIMIT,
+        min_count: int = CORPUS_OVERUSE_MIN_COUNT,
+        min_ratio: float = CORPUS_OVERUSE_RATIO,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Keywords of a new session and the words it overuses compared with the user's history.
+
+        Only the session's own terms are looked up, so the cost grows with
+        the session's vocabulary rather than with the user's history.
+
+        Args:
+            user_id: Owner of the session
+            text: Transcript of the session, not yet added to the index
+            limit: Most keywords and overused words to return
+            min_count: Fewest occurrences in the session for a word to be overused
+            min_ratio: How many times its usual rate a word must be used to be overused
+
+        Returns:
+            Dictionary with "keywords" (term and TF-IDF score) and
+            "overused_words" (term, session count and ratio to the usual
+            rate; empty without history)
+        """
+        counts = term_counts(text)
+        total = sum(counts.values())
+        if not total:
+            return {"keywords": [], "overused_words": []}
+        documents, history_words, stats = self._history(user_id, counts)
+
+        # Smoothed IDF over the history plus this session
+        keywords = []
+        for term, count in counts.items():
+            df = stats.get(term, (0, 0))[0]
+            idf = math.log((1 + documents + 1) / (1 + df + 1)) + 1
+            keywords.append({"term": term, "score": round(count / total * idf, 4)})
+        keywords.sort(key=lambda item: (-item["score"], item["term"]))
+
+        # Session rate against the add-one smoothed rate in earlier sessions
+        overused = []
+        if documents:
+            smoothing = history_words + len(counts)
+            for term, count in counts.items():
+                if count < min_count:
+                    continue
+                usual_rate = (stats.get(term, (0, 0))[1] + 1) / smoothing
+                ratio = count / total / usual_rate
+                if ratio >= min_ratio:
+                    overused.append({"term": term, "count": count, "ratio": round(ratio, 2)})
+            overused.sort(key=lambda item: (-item["ratio"], item["term"]))
+
+        return {"keywords": keywords[:limit], "overused_words": overused[:limit]}
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+def get_corpus_index() -> Optional[CorpusIndex]:
+    """
+    Get the shared corpus index, opening it on first use.
+
+    Returns:
+        CorpusIndex, or None if the database cannot be opened
+    """
+    global _index
+    if _index is None:
+        try:
+            _index = CorpusIndex()
+        except Exception as e:
+            logger.error(f"Error opening corpus index at {CORPUS_INDEX_PATH}: {str(e)}")
+    return _index
+
+
+def close_corpus_index() -> None:
+    """Close the shared corpus index, called at shutdown."""
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
@@ -0,0 +1,221 @@
+"""
+Lazy, named groups of acoustic features.
+
+Acoustic features are organized in groups with declared dependencies. A
+group is computed on first access, after the groups it depends on, and
+memoized for the lifetime of the AcousticFeatureGroups object, which is one
+request. Asking for a couple of scalars therefore skips the expensive groups
+(pitch tracking, time series) entirely. The analysis pipeline always needs
+the scalar summary, so there a ?fields= projection only skips the time series.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import ACOUSTIC_WINDOWED_MIN_DURATION, ANALYSIS_SAMPLE_RATE, TIMESERIES_WINDOW
+from app.services.numpy_acoustics import compute_frame_features, downsample_frames, timeseries_to_json
+from app.services.pause_detection import detect_pauses
+from app.services.spectral_cache import SpectralCache
+from app.services.speech_rate import estimate_speech_rate
+from app.services.windowed_acoustics import STATISTICS, frame_statistics, summarize_statistics, windowed_frames
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FeatureGroup:
+    """A named set of AudioFeatures fields and the groups they are computed from."""
+    dependencies: Tuple[str, ...]
+    fields: Tuple[str, ...]
+
+
+# Groups in dependency order. "frames" is internal: per-frame pitch, energy
+# and voicing that several public groups reduce.
+FEATURE_GROUPS = {
+    "frames": FeatureGroup((), ()),
+    "duration": FeatureGroup((), ("speaking_duration",)),
+    "rate": FeatureGroup((), ("speech_rate", "syllable_count")),
+    "prosody": FeatureGroup(("frames",), ("pitch_mean", "pitch_std", "energy_mean", "energy_std")),
+    "voice_quality": FeatureGroup(("frames",), ("jitter", "shimmer")),
+    "pauses": FeatureGroup(
+        ("frames", "rate"),
+        ("pause_count", "longest_pause", "total_pause_time", "phonation_time", "pause_histogram", "articulation_rate"),
+    ),
+    "statistics": FeatureGroup(("frames",), ("statistics",)),
+    "timeseries": FeatureGroup(("frames", "rate"), ("timeseries",)),
+    # Only produced when features are estimated from a sample of windows
+    "estimation": FeatureGroup((), ("estimation",)),
+}
+
+# Public groups, i.e. the ones that produce fields
+PUBLIC_GROUPS = [name for name, group in FEATURE_GROUPS.items() if group.fields]
+
+# Group that produces each field
+FIELD_GROUPS = {field: name for name, group in FEATURE_GROUPS.items() for field in group.fields}
+
+# Groups summarizing a recording in a few scalars, e.g. for the LLM prompt
+SUMMARY_GROUPS = ["duration", "rate", "prosody", "voice_quality", "pauses"]
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated ?fields= projection of field and group names.
+
+    Args:
+        fields: Comma-separated names, or None for everything
+
+    Returns:
+        List of names, or None if no projection was given
+
+    Raises:
+        ValueError: If a name is neither a field nor a public group
+    """
+    if fields is None or not fields.strip():
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FIELD_GROUPS and name not in PUBLIC_GROUPS]
+    if unknown:
+        raise ValueError(
+            f"Unknown acoustic fields: {', '.join(unknown)}. "
+            f"Use fields or groups: {', '.join(PUBLIC_GROUPS)}"
+        )
+    return names
+
+
+class AcousticFeatureGroups:
+    """Acoustic features of one recording, computed group by group on demand."""
+
+    def __init__(
+        self,
+        y: Optional[np.ndarray],
+        sr: int = ANALYSIS_SAMPLE_RATE,
+        cache: Optional[SpectralCache] = None,
+        timeseries_window: float = TIMESERIES_WINDOW,
+        parallel: bool = True,
+    ):
+        """
+        Args:
+            y: Mono float signal in [-1, 1], or None for precomputed features
+            sr: Sample rate in Hz
+            cache: Spectral cache of the same signal, if one is available
+            timeseries_window: Time series window length in seconds
+            parallel: Analyse long recordings on the shared process pool
+        """
+        self.y = y
+        self.sr = sr
+        self.cache = cache
+        self.timeseries_window = timeseries_window
+        self.parallel = parallel
+        self._groups: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_features(cls, features: Dict[str, Any]) -> "AcousticFeatureGroups":
+        """
+        Wrap features that were computed in one pass, e.g. by openSMILE.
+
+        Every group is filled at once; fields missing from features are
+        left out of projections.
+        """
+        groups = cls(None)
+        for name, group in FEATURE_GROUPS.items():
+            groups._groups[name] = {field: features[field] for field in group.fields if field in features}
+        return groups
+
+    def group(self, name: str) -> Dict[str, Any]:
+        """
+        Get a group's values, computing it and its dependencies on first use.
+
+        Args:
+            name: Key of FEATURE_GROUPS
+
+        Returns:
+            Dictionary holding at least the group's fields
+        """
+        if name not in self._groups:
+            if name not in FEATURE_GROUPS:
+                raise ValueError(f"Unknown acoustic feature group '{name}'")
+            for dependency in FEATURE_GROUPS[name].dependencies:
+                self.group(dependency)
+            logger.debug(f"Computing acoustic feature group '{name}'")
+            self._groups[name] = getattr(self, f"_compute_{name}")()
+        return self._groups[name]
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Get one field, computing only the groups it needs."""
+        return self.group(FIELD_GROUPS[field]).get(field, default)
+
+    def select(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Project the features onto fields and groups.
+
+        Args:
+            names: Field and group names, or None for every public group
+
+        Returns:
+            Dictionary of the requested fields that are available
+        """
+        names = PUBLIC_GROUPS if names is None else list(names)
+        fields: List[str] = []
+        for name in names:
+            fields.extend(FEATURE_GROUPS[name].fields if name in FEATURE_GROUPS else [name])
+        selected: Dict[str, Any] = {}
+        for field in dict.fromkeys(fields):
+            values = self.group(FIELD_GROUPS[field])
+            if field in values:
+                selected[field] = values[field]
+        return selected
+
+    def _compute_frames(self) -> Dict[str, Any]:
+        """Per-frame descriptors and their mergeable statistics."""
+        if len(self.y) / self.sr >= ACOUSTIC_WINDOWED_MIN_DURATION:
+            # Long recordings are split into windows analysed in parallel
+            stats, onsets, frames = windowed_frames(self.y, self.sr, parallel=self.parallel)
+        else:
+            frames = compute_frame_features(self.y, self.sr)
+            stats, onsets = frame_statistics(frames, has_previous=False)
+        return {"frames": frames, "stats": stats, "onsets": onsets}
+
+    def _compute_duration(self) -> Dict[str, Any]:
+        return {"speaking_duration": len(self.y) / self.sr}
+
+    def _compute_rate(self) -> Dict[str, Any]:
+        rate = estimate_speech_rate(self.y, self.sr, curve_step=self.timeseries_window, cache=self.cache)
+        return {
+            "speech_rate": rate["speech_rate"],
+            "syllable_count": rate["syllable_count"],
+            "rate_curve": rate["rate_curve"],
+        }
+
+    def _functionals(self) -> Dict[str, Any]:
+        frames = self._groups["frames"]
+        return summarize_statistics(frames["stats"], frames["onsets"], len(self.y) / self.sr)
+
+    def _compute_prosody(self) -> Dict[str, Any]:
+        functionals = self._functionals()
+        return {field: functionals[field] for field in FEATURE_GROUPS["prosody"].fields}
+
+    def _compute_voice_quality(self) -> Dict[str, Any]:
+        functionals = self._functionals()
+        return {field: functionals[field] for field in FEATURE_GROUPS["voice_quality"].fields}
+
+    def _compute_pauses(self) -> Dict[str, Any]:
+        frames = self._groups["frames"]["frames"]
+        syllables = self._groups["rate"]["syllable_count"]
+        return detect_pauses(frames.energy, frames.voiced, frames.frame_step, syllables)
+
+    def _compute_statistics(self) -> Dict[str, Any]:
+        stats = self._groups["frames"]["stats"]
+        return {"statistics": {name: stats[name].to_dict() for name in STATISTICS}}
+
+    def _compute_timeseries(self) -> Dict[str, Any]:
+        frames = self._groups["frames"]["frames"]
+        timeseries = timeseries_to_json(downsample_frames(frames, self.timeseries_window), self.timeseries_window)
+        timeseries["speech_rate"] = np.round(self._groups["rate"]["rate_curve"].astype(np.float64), 4).tolist()
+        return {"timeseries": timeseries}
+
+    def _compute_estimation(self) -> Dict[str, Any]:
+        return {}
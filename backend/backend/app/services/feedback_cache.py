@@ -0,0 +1,227 @@
+"""
+Persistent cache of LLM feedback.
+
+Feedback is keyed on the prompt template version, the model, a hash of the
+transcript and the analysis metrics quantized to two significant digits,
+so re-analysis of the same recording, retries and duplicate uploads reuse
+an earlier completion even when the measured metrics differ slightly.
+Entries live in SQLite at FEEDBACK_CACHE_PATH, under the private DATA_DIR
+by default, with a TTL and a size bound (least recently used entries are
+evicted first), behind a small in-memory LRU front that serves repeated
+hits without touching the disk; their access times are written with the
+next put, before anything is evicted. The methods block on SQLite, so
+async callers run them in a worker thread.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from app.config import (
+    FEEDBACK_CACHE_ENABLED,
+    FEEDBACK_CACHE_MAX_ENTRIES,
+    FEEDBACK_CACHE_MEMORY_ENTRIES,
+    FEEDBACK_CACHE_PATH,
+    FEEDBACK_CACHE_TTL,
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Significant digits metric values keep in the cache key
+SIGNIFICANT_DIGITS = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback_cache (
+    key TEXT PRIMARY KEY,
+    feedback TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feedback_cache_accessed ON feedback_cache (accessed);
+"""
+
+_cache = None
+
+
+def quantize(value: Any) -> Any:
+    """Round every number in a JSON-like value to SIGNIFICANT_DIGITS significant digits."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value) or value == 0:
+            return value
+        return float(f"{value:.{SIGNIFICANT_DIGITS}g}")
+    if isinstance(value, dict):
+        return {str(key): quantize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [quantize(item) for item in value]
+    return str(value)
+
+
+def feedback_key(
+    prompt_version: str,
+    model: str,
+    transcript: str,
+    text_analysis: Dict[str, Any],
+    acoustic_features: Dict[str, Any],
+) -> str:
+    """
+    Cache key of a feedback request.
+
+    Args:
+        prompt_version: Version of the prompt template
+        model: LLM model name
+        transcript: Transcript text; whitespace differences are ignored
+        text_analysis: Text analysis metrics sent to the LLM
+        acoustic_features: Acoustic features sent to the LLM
+
+    Returns:
+        Hex digest identifying the request
+    """
+    transcript_hash = hashlib.sha256(" ".join(transcript.split()).encode("utf-8")).hexdigest()
+    metrics = json.dumps(
+        {"text": quantize(text_analysis), "acoustic": quantize(acoustic_features)},
+        sort_keys=True, separators=(",", ":"),
+    )
+    material = "\0".join([prompt_version, model, transcript_hash, metrics])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class FeedbackCache:
+    """Feedback by request key, in SQLite with an in-memory LRU front."""
+
+    def __init__(
+        self,
+        path: Union[str, Path] = FEEDBACK_CACHE_PATH,
+        ttl: float = FEEDBACK_CACHE_TTL,
+        max_entries: int = FEEDBACK_CACHE_MAX_ENTRIES,
+        memory_entries: int = FEEDBACK_CACHE_MEMORY_ENTRIES,
+        clock=time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file, or ":memory:"
+            ttl: Seconds an entry stays valid
+            max_entries: Most entries kept on disk
+            memory_entries: Most entries kept in memory
+            clock: Source of the current time in seconds
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.lock = threading.Lock()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.clock = clock
+        # key -> (created, feedback)
+        self.memory: "OrderedDict[str, tuple]" = OrderedDict()
+        # key -> time of memory hits not yet written to disk
+        self.touched: Dict[str, float] = {}
+        self.counters = {"hits": 0, "memory_hits": 0, "misses": 0, "evictions": 0}
+        with self.lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached feedback for a key.
+
+        Returns:
+            A copy of the feedback, or None if absent or expired
+        """
+        now = self.clock()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.memory.move_to_end(key)
+                self.touched[key] = now
+                self.counters["hits"] += 1
+                self.counters["memory_hits"] += 1
+                return json.loads(entry[1])
+
+            row = self.connection.execute(
+                "SELECT feedback, created FROM feedback_cache WHERE key = ? AND created > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                self.memory.pop(key, None)
+                self.counters["misses"] += 1
+                return None
+            with self.connection:
+                self.connection.execute("UPDATE feedback_cache SET accessed = ? WHERE key = ?", (now, key))
+            self._remember(key, row[1], row[0])
+            self.counters["hits"] += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, feedback: Dict[str, Any]) -> None:
+        """Store feedback, evicting expired and least recently used entries beyond the size bound."""
+        now = self.clock()
+        payload = json.dumps(feedback)
+        with self.lock:
+            with self.connection:
+                self._flush_touched()
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO feedback_cache (key, feedback, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, payload, now, now),
+                )
+                evicted = self.connection.execute(
+                    "DELETE FROM feedback_cache WHERE created <= ?", (now - self.ttl,)
+                ).rowcount
+                evicted += self.connection.execute(
+                    "DELETE FROM feedback_cache WHERE key IN ("
+                    "SELECT key FROM feedback_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            self.counters["evictions"] += evicted
+            self._remember(key, now, payload)
+
+    def _flush_touched(self) -> None:
+        """Write the access times of memory hits, so eviction sees them."""
+        if self.touched:
+            self.connection.executemany(
+                "UPDATE feedback_cache SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self.touched.items()],
+            )
+            self.touched.clear()
+
+    def _remember(self, key: str, created: float, payload: str) -> None:
+        self.memory[key] = (created, payload)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters, and the number of entries on disk."""
+        with self.lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM feedback_cache").fetchone()[0]
+            return {**self.counters, "entries": entries}
+
+    def close(self) -> None:
+        with self.lock:
+            with self.connection:
+                self._flush_touched()
+            self.connection.close()
+
+
+def get_feedback_cache() -> Optional[FeedbackCache]:
+    """
+    Get the shared feedback cache, opening it on first use.
+
+    Returns:
+        FeedbackCache, or None if caching is disabled or the database cannot be opened
+    """
+    global _cache
+    if _cache is None and FEEDBACK_CACHE_ENABLED:
+        try:
+            _cache = FeedbackCache()
+        except Exception as e:
+            logger.error(f"Error opening feedback cache at {FEEDBACK_CACHE_PATH}: {str(e)}")
+    return _cache
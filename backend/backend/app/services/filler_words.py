@@ -0,0 +1,157 @@
+"""
+Single-pass filler word matching.
+
+A lexicon is compiled once into one alternation regex with word-boundary
+guards and scanned over the transcript in a single pass. Compiled matchers
+for custom (e.g. per-user) lexicons are kept in an LRU cache.
+
+Words such as "like" or "so" are fillers only in some uses ("it was, like,
+huge" but not "I like it"). When a tagged spaCy Doc of the text is at hand,
+content uses are recognized from its token arrays and left out of the counts.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Any, Container, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import FILLER_LEXICON_CACHE_SIZE
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Common filler words to detect
+FILLER_WORDS = [
+    "um", "uh", "ah", "er", "like", "you know", "so", "actually",
+    "basically", "literally", "honestly", "right", "okay", "well",
+]
+
+# Fillers that are also ordinary content words
+AMBIGUOUS_FILLERS = {"like", "so", "right", "well", "okay"}
+
+# Tags of discourse uses
+FILLER_TAGS = {"UH"}
+FILLER_POS = {"INTJ"}
+
+# A "like" that is not a verb is a hedge before an adjective or adverb ("it was like huge")
+HEDGE_FILLERS = {"like"}
+HEDGED_POS = {"ADJ", "ADV"}
+
+# Punctuation that sets a word off as a parenthetical ("so, ...", ", right?")
+OPENING_PUNCT = {","}
+CLOSING_PUNCT = {",", "?"}
+
+
+def normalize_lexicon(lexicon: Iterable[str]) -> Tuple[str, ...]:
+    """Lowercase, collapse whitespace and deduplicate lexicon entries."""
+    entries = {" ".join(entry.lower().split()) for entry in lexicon}
+    return tuple(sorted(entry for entry in entries if entry))
+
+
+@lru_cache(maxsize=FILLER_LEXICON_CACHE_SIZE)
+def compile_lexicon(lexicon: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile a normalized lexicon into one case-insensitive pattern.
+
+    Longer entries come first so "you know" wins over a shorter overlapping
+    entry, and words inside a phrase may be separated by any whitespace.
+
+    Args:
+        lexicon: Entries as returned by normalize_lexicon
+
+    Returns:
+        Compiled pattern matching any entry as whole words
+    """
+    logger.debug(f"Compiling filler lexicon of {len(lexicon)} entries")
+    alternatives = [
+        r"\s+".join(re.escape(word) for word in entry.split())
+        for entry in sorted(lexicon, key=len, reverse=True)
+    ]
+    return re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)", re.IGNORECASE)
+
+
+def content_uses(doc) -> Set[int]:
+    """
+    Character offsets of ambiguous fillers that a tagged Doc shows are content words.
+
+    A word counts as a filler when it is tagged as an interjection, set off
+    on both sides (by the sentence start or a comma before it and a comma or
+    question mark after it), or is a "like" that is not a verb and directly
+    precedes an adjective or adverb, as in "it was like huge". Any other use,
+    such as the verb in "I like it", is content. Only tags are used, since
+    the pipeline excludes the parser; everything is computed on the Doc's
+    token arrays in one pass.
+
+    Args:
+        doc: spaCy Doc of the text the fillers are matched in
+
+    Returns:
+        Start offsets of content uses; empty if the Doc has no tags, since
+        nothing can then be told apart
+    """
+    from spacy.attrs import IDX, LOWER, POS, SENT_START, TAG
+    from spacy.parts_of_speech import IDS as POS_IDS
+
+    if len(doc) == 0 or not (doc.has_annotation("TAG") or doc.has_annotation("POS")):
+        return set()
+    strings = doc.vocab.strings
+    arrays = doc.to_array([LOWER, TAG, POS, SENT_START, IDX])
+    lower, tag, pos, sent_start, idx = arrays.T
+
+    def ids(values):
+        return np.array([strings.add(value) for value in values], dtype=arrays.dtype)
+
+    ambiguous = np.isin(lower, ids(AMBIGUOUS_FILLERS))
+    if not ambiguous.any():
+        return set()
+    filler = np.isin(tag, ids(FILLER_TAGS)) | np.isin(pos, [POS_IDS[p] for p in FILLER_POS])
+
+    # Hedging "like" directly before an adjective or adverb
+    hedged = np.zeros(len(doc), dtype=bool)
+    hedged[:-1] = np.isin(pos[1:], [POS_IDS[p] for p in HEDGED_POS])
+    filler |= np.isin(lower, ids(HEDGE_FILLERS)) & (pos != POS_IDS["VERB"]) & hedged
+
+    # Set off by punctuation, or the sentence start, on both sides
+    opened = np.ones(len(doc), dtype=bool)
+    opened[1:] = np.isin(lower[:-1], ids(OPENING_PUNCT))
+    opened |= sent_start == 1
+    closed = np.zeros(len(doc), dtype=bool)
+    closed[:-1] = np.isin(lower[1:], ids(CLOSING_PUNCT))
+    filler |= opened & closed
+
+    return set(idx[ambiguous & ~filler].tolist())
+
+
+def find_fillers(
+    text: str,
+    lexicon: Optional[Iterable[str]] = None,
+    skip: Optional[Container[int]] = None,
+) -> Dict[str, Any]:
+    """
+    Find filler words in a transcript in one scan.
+
+    Args:
+        text: Transcript text
+        lexicon: Custom filler entries; defaults to FILLER_WORDS
+        skip: Start offsets of ambiguous fillers used as content words,
+            as returned by content_uses
+
+    Returns:
+        Dictionary with "counts" (occurrences per entry that was found) and
+        "offsets" (filler, start and end character offsets in text order)
+    """
+    entries = normalize_lexicon(FILLER_WORDS if lexicon is None else lexicon)
+    if not entries:
+        return {"counts": {}, "offsets": []}
+
+    counts: Dict[str, int] = {}
+    offsets: List[Dict[str, Any]] = []
+    for match in compile_lexicon(entries).finditer(text):
+        filler = " ".join(match.group().lower().split())
+        if skip and filler in AMBIGUOUS_FILLERS and match.start() in skip:
+            continue
+        counts[filler] = counts.get(filler, 0) + 1
+        offsets.append({"filler": filler, "start": match.start(), "end": match.end()})
+    return {"counts": counts, "offsets": offsets}
@@ -0,0 +1,279 @@
+"""
+Incremental text analysis over streaming transcript segments.
+
+Segments from streaming or chunked ASR are analysed one at a time, in time
+proportional to each segment, instead of re-running analyze_text on the
+growing transcript. Counts are additive across segments; the only state
+carried between them is what can cross a segment boundary: whether the
+sentence in progress has ended, and the last words of the text, where a
+multi-word filler may still be completed by the next segment.
+"""
+
+import logging
+import re
+from collections import deque
+from typing import Dict, Any, Callable, Iterable, List, Optional
+
+from app.config import TEXT_RATE_WINDOW
+from app.services.filler_words import AMBIGUOUS_FILLERS, FILLER_WORDS, compile_lexicon, content_uses, normalize_lexicon
+from app.services.readability import POLYSYLLABLE_MIN, WORD_PATTERN, ReadabilityCounts, count_syllables
+from app.services.repeated_phrases import RepeatedPhraseDetector
+from app.services.sentence_metrics import summarize_sentences
+from app.services.text_analysis import get_nlp
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Sentence terminators of the fallback analysis
+TERMINATORS = re.compile(r"[.!?]+")
+
+# Whitespace-delimited words, the units filler phrases are made of
+WORD_SPAN = re.compile(r"\S+")
+
+LETTER = re.compile(r"[A-Za-z]")
+
+# Separator placed between segments in the final transcript
+SEGMENT_SEPARATOR = " "
+
+
+class _PieceCounter:
+    """Counts pieces between terminator runs that satisfy a predicate, as re.split would."""
+
+    def __init__(self, has_content: Callable[[str], bool]):
+        self.has_content = has_content
+        self.closed = 0
+        self.open_has_content = False
+
+    def feed(self, text: str) -> None:
+        parts = TERMINATORS.split(text)
+        for part in parts[:-1]:
+            if self.open_has_content or self.has_content(part):
+                self.closed += 1
+            self.open_has_content = False
+        self.open_has_content = self.open_has_content or self.has_content(parts[-1])
+
+    @property
+    def count(self) -> int:
+        return self.closed + int(self.open_has_content)
+
+
+class IncrementalTextAnalyzer:
+    """
+    Text analysis that is updated one transcript segment at a time.
+
+    result() equals analyze_text on the segments joined with single spaces,
+    after stripping each segment and dropping empty ones. With a tagging
+    model, the tags that tell filler from content uses come from each
+    segment on its own and may differ from those of the whole transcript.
+    """
+
+    def __init__(self, filler_lexicon: Optional[Iterable[str]] = None, rate_window: float = TEXT_RATE_WINDOW):
+        """
+        Args:
+            filler_lexicon: Custom filler words; defaults to FILLER_WORDS
+            rate_window: Seconds of recent speech the windowed rates cover
+        """
+        self.nlp = get_nlp()
+        self.rate_window = rate_window
+        self.length = 0
+        self.word_count = 0
+        self.readability = ReadabilityCounts()
+
+        # Sentences: the sentencizer's state with spaCy, terminator runs without
+        if self.nlp is not None:
+            self.punct_chars = self.nlp.get_pipe("sentencizer").punct_chars
+            self.sentences = 0
+            self.alpha_sentences = 0
+            self.seen_period = False
+            self.sentence_has_alpha = False
+            self.sentence_totals: List[List[int]] = []  # Words, alpha words, syllables, polysyllables
+        else:
+            self.fallback_sentences = _PieceCounter(lambda piece: bool(piece.strip()))
+            self.letter_sentences = _PieceCounter(lambda piece: bool(LETTER.search(piece)))
+
+        # Fillers: matches are committed once no later text can change them
+        lexicon = normalize_lexicon(FILLER_WORDS if filler_lexicon is None else filler_lexicon)
+        self.filler_pattern = compile_lexicon(lexicon) if lexicon else None
+        self.open_words = max((len(entry.split()) for entry in lexicon), default=1) - 1
+        self.filler_counts: Dict[str, int] = {}
+        self.filler_offsets: List[Dict[str, Any]] = []
+        self.tail = ""          # Text from tail_offset on, still to be scanned
+        self.tail_offset = 0
+        self.scan_from = 0
+        self.content_offsets = set()  # Ambiguous fillers used as content words
+        self.phrases = RepeatedPhraseDetector()
+
+        # Windowed rates: (start, end, words, fillers) of recent segments
+        self.recent: deque = deque()
+        self.first_start: Optional[float] = None
+        self.recent_words = 0
+        self.recent_fillers = 0
+
+    def add_segment(self, text: str, start: Optional[float] = None, end: Optional[float] = None) -> None:
+        """
+        Ingest the next transcript segment.
+
+        Args:
+            text: Segment text
+            start: Segment start time in seconds, for windowed rates
+            end: Segment end time in seconds, for windowed rates
+        """
+        text = text.strip()
+        if not text:
+            return
+        appended = text if self.length == 0 else SEGMENT_SEPARATOR + text
+        words_before = self.word_count
+        fillers_before = len(self.filler_offsets)
+
+        if self.nlp is not None:
+            self._add_doc(self.nlp(text), self.length + len(appended) - len(text))
+        else:
+            self.word_count += len(text.split())
+            self.readability += ReadabilityCounts.from_words(WORD_PATTERN.findall(text), 0)
+            for counter in (self.fallback_sentences, self.letter_sentences):
+                counter.feed(appended)
+
+        self.phrases.feed(appended, self.length)
+        self.length += len(appended)
+        self._scan_fillers(appended)
+
+        if start is not None and end is not None:
+            self._add_rates(start, end, self.word_count - words_before, len(self.filler_offsets) - fillers_before)
+
+    def _add_doc(self, doc, offset: int) -> None:
+        """Update counts from a segment's tokens, continuing the sentencizer's state."""
+        self.content_offsets.update(start + offset for start in content_uses(doc))
+        for token in doc:
+            in_punct_chars = token.text in self.punct_chars
+            starts_sentence = self.sentences == 0
+            if self.seen_period and not token.is_punct and not in_punct_chars:
+                starts_sentence = True
+                self.seen_period = False
+            elif in_punct_chars:
+                self.seen_period = True
+            if starts_sentence:
+                self.alpha_sentences += int(self.sentence_has_alpha)
+                self.sentences += 1
+                self.sentence_has_alpha = False
+                self.sentence_totals.append([0, 0, 0, 0])
+            totals = self.sentence_totals[-1]
+            self.sentence_has_alpha = self.sentence_has_alpha or token.is_alpha
+            if not token.is_punct and not token.is_space:
+                self.word_count += 1
+                totals[0] += 1
+            if token.is_alpha:
+                syllables = count_syllables(token.lower_)
+                totals[1] += 1
+                totals[2] += syllables
+                totals[3] += int(syllables >= POLYSYLLABLE_MIN)
+        self.readability += ReadabilityCounts.from_words([token.text for token in doc if token.is_alpha], 0)
+
+    def _scan_fillers(self, appended: str) -> None:
+        """Commit filler matches that later segments can no longer extend."""
+        self.tail += appended
+        if self.filler_pattern is None:
+            return
+        # The last open_words words may still begin a longer phrase
+        if self.open_words == 0:
+            provisional = self.length
+        else:
+            words = [match.start() for match in WORD_SPAN.finditer(self.tail, self.scan_from - self.tail_offset)]
+            provisional = self.tail_offset + words[-self.open_words] if len(words) >= self.open_words else self.scan_from
+
+        scan_from = max(provisional, self.scan_from)
+        for match in self.filler_pattern.finditer(self.tail, self.scan_from - self.tail_offset):
+            if match.start() + self.tail_offset >= provisional:
+                break
+            self._commit_filler(match)
+            scan_from = max(scan_from, match.end() + self.tail_offset)
+        self.scan_from = scan_from
+        self.content_offsets = {start for start in self.content_offsets if start >= self.scan_from}
+
+        # Keep one character before the scan position for the word-boundary guard
+        keep = max(self.scan_from - 1, self.tail_offset)
+        self.tail = self.tail[keep - self.tail_offset:]
+        self.tail_offset = keep
+
+    def _commit_filler(self, match, counts: Optional[Dict[str, int]] = None, offsets: Optional[list] = None) -> None:
+        counts = self.filler_counts if counts is None else counts
+        offsets = self.filler_offsets if offsets is None else offsets
+        filler = " ".join(match.group().lower().split())
+        if filler in AMBIGUOUS_FILLERS and match.start() + self.tail_offset in self.content_offsets:
+            return
+        counts[filler] = counts.get(filler, 0) + 1
+        offsets.append({"filler": filler, "start": match.start() + self.tail_offset, "end": match.end() + self.tail_offset})
+
+    def _add_rates(self, start: float, end: float, words: int, fillers: int) -> None:
+        if self.first_start is None:
+            self.first_start = start
+        self.recent.append((start, end, words, fillers))
+        self.recent_words += words
+        self.recent_fillers += fillers
+        while self.recent and self.recent[0][1] <= end - self.rate_window:
+            _, _, old_words, old_fillers = self.recent.popleft()
+            self.recent_words -= old_words
+            self.recent_fillers -= old_fillers
+
+    def rates(self) -> Dict[str, float]:
+        """
+        Words and fillers per minute over the last rate_window seconds.
+
+        Pauses between segments count towards the window, so the rates
+        reflect the speaker's pace rather than that of the speech alone.
+
+        Returns:
+            Dictionary with words_per_minute, fillers_per_minute and the
+            seconds the rates cover
+        """
+        if not self.recent:
+            return {"words_per_minute": 0.0, "fillers_per_minute": 0.0, "window": 0.0}
+        latest = self.recent[-1][1]
+        covered = latest - max(latest - self.rate_window, self.first_start)
+        minutes = covered / 60 if covered > 0 else float("inf")
+        return {
+            "words_per_minute": self.recent_words / minutes,
+            "fillers_per_minute": self.recent_fillers / minutes,
+            "window": covered,
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Analysis of everything ingested so far, equal to analyze_text on the joined text.
+
+        Returns:
+            Dictionary with the same fields as analyze_text
+        """
+        # Fillers still open at the end of the text are final for now
+        counts = dict(self.filler_counts)
+        offsets = list(self.filler_offsets)
+        if self.filler_pattern is not None:
+            for match in self.filler_pattern.finditer(self.tail, self.scan_from - self.tail_offset):
+                self._commit_filler(match, counts, offsets)
+
+        if self.nlp is not None:
+            sentence_count = self.sentences
+            alpha_sentences = self.alpha_sentences + int(self.sentence_has_alpha)
+        else:
+            sentence_count = self.fallback_sentences.count
+            alpha_sentences = self.letter_sentences.count
+        readability = ReadabilityCounts(
+            sentences=alpha_sentences,
+            words=self.readability.words,
+            syllables=self.readability.syllables,
+            polysyllables=self.readability.polysyllables,
+        )
+
+        result = {
+            "word_count": self.word_count,
+            "sentence_count": sentence_count,
+            "filler_words": counts,
+            "filler_offsets": offsets,
+            "repeated_phrases": self.phrases.phrases(),
+            "readability_scores": readability.scores(),
+            "average_words_per_sentence": self.word_count / max(1, sentence_count),
+            "speaking_rate": 150.0,
+        }
+        if self.nlp is not None:
+            columns = list(zip(*self.sentence_totals)) or [[], [], [], []]
+            result["sentence_metrics"] = summarize_sentences(*columns)
+        return result
@@ -0,0 +1,146 @@
+"""
+Live loudness and pitch meter for rehearsals.
+
+PCM frames streamed by the client are written into a fixed-size ring buffer.
+Every update interval only the newest audio is framed and analysed with the
+vectorized RMS and YIN code of the NumPy engine, so the cost per update is
+constant no matter how long the rehearsal runs.
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from app.config import LIVE_HISTORY_SECONDS, LIVE_SAMPLE_RATE, LIVE_UPDATE_INTERVAL
+from app.services.numpy_acoustics import FRAME_LENGTH, FRAME_STEP, SILENCE_RMS, frame_signal, yin_pitch
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Pitch spread below this many semitones over the history sounds monotone
+MONOTONE_SEMITONES = 2.0
+
+# Voiced frames needed in the history before judging monotony
+MIN_VOICED_FRAMES = 50
+
+
+class RingBuffer:
+    """Fixed-capacity float32 buffer keeping the most recent values."""
+
+    def __init__(self, capacity: int):
+        self.data = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self.end = 0       # Next write position
+        self.size = 0      # Number of valid values
+
+    def extend(self, values: np.ndarray) -> None:
+        """Append values, overwriting the oldest ones when full."""
+        values = np.asarray(values, dtype=np.float32)[-self.capacity:]
+        first = min(len(values), self.capacity - self.end)
+        self.data[self.end:self.end + first] = values[:first]
+        self.data[:len(values) - first] = values[first:]
+        self.end = (self.end + len(values)) % self.capacity
+        self.size = min(self.size + len(values), self.capacity)
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """The newest n values (all values by default), oldest first."""
+        n = self.size if n is None else min(n, self.size)
+        start = (self.end - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.data[start:start + n].copy()
+        return np.concatenate((self.data[start:], self.data[:self.end]))
+
+
+class LiveMeter:
+    """Incremental RMS and pitch of one PCM16 mono stream."""
+
+    def __init__(
+        self,
+        sr: int = LIVE_SAMPLE_RATE,
+        update_interval: float = LIVE_UPDATE_INTERVAL,
+        history_seconds: float = LIVE_HISTORY_SECONDS,
+    ):
+        """
+        Args:
+            sr: Sample rate of the incoming PCM in Hz
+            update_interval: Seconds of audio between updates
+            history_seconds: Pitch history used for the monotony estimate
+        """
+        self.sr = sr
+        self.frame_length = int(round(FRAME_LENGTH * sr))
+        self.hop = int(round(FRAME_STEP * sr))
+        self.update_samples = max(self.hop, int(round(update_interval * sr)))
+        self.frames_per_update = self.update_samples // self.hop
+        # Just enough audio for the frames of one update
+        self.audio = RingBuffer(self.frame_length + (self.frames_per_update - 1) * self.hop)
+        self.pitch_history = RingBuffer(max(1, int(round(history_seconds / FRAME_STEP))))
+        self.samples_seen = 0
+        self.pending = 0
+        self._odd_byte = b""
+
+    def push(self, data: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Add little-endian PCM16 bytes and return an update when one is due.
+
+        Audio that arrived faster than the update interval is skipped rather
+        than queued, so the meter never falls behind the speaker.
+
+        Args:
+            data: Raw PCM16 mono bytes, any length
+
+        Returns:
+            Update dictionary, or None if less than an interval arrived
+        """
+        return self.update() if self.feed(data) else None
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Add little-endian PCM16 bytes without analysing them.
+
+        Args:
+            data: Raw PCM16 mono bytes, any length
+
+        Returns:
+            Whether at least an interval of audio arrived since the last update
+        """
+        data = self._odd_byte + data
+        usable = len(data) - len(data) % 2
+        self._odd_byte = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+
+        self.audio.extend(samples)
+        self.samples_seen += len(samples)
+        self.pending += len(samples)
+        return self.pending >= self.update_samples
+
+    def update(self) -> Dict[str, Any]:
+        """Measure the newest interval of audio, skipping any older backlog."""
+        self.pending %= self.update_samples
+        return self._update()
+
+    def _update(self) -> Dict[str, Any]:
+        """Measure the newest interval of audio."""
+        window = self.audio.latest()
+        frames = frame_signal(window, self.frame_length, self.hop, center=False)[-self.frames_per_update:]
+        energy = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+        f0 = yin_pitch(frames, self.sr)
+        voiced = (f0 > 0) & (energy >= SILENCE_RMS)
+        self.pitch_history.extend(np.where(voiced, f0, 0.0))
+
+        history = self.pitch_history.latest()
+        history = history[history > 0]
+        spread = 0.0
+        if history.size:
+            semitones = 12 * np.log2(history / np.median(history))
+            spread = float(np.std(semitones))
+        rms = float(np.sqrt(np.mean(np.square(window[-self.update_samples:], dtype=np.float64))))
+
+        return {
+            "t": round(self.samples_seen / self.sr, 2),
+            "rms_db": round(20 * np.log10(max(rms, 1e-10)), 1),
+            "pitch": round(float(np.median(f0[voiced])), 1) if voiced.any() else 0.0,
+            "voiced": round(float(voiced.mean()), 2),
+            "pitch_spread": round(spread, 2),
+            "monotone": bool(history.size >= MIN_VOICED_FRAMES and spread < MONOTONE_SEMITONES),
+        }
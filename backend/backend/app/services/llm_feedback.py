@@ -1,10 +1,27 @@
+import asyncio
 import os
 import json
 import logging
-from typing import Dict, Any
-from groq import Groq
+import threading
+from typing import Dict, Any, Optional
+
+import httpx
+from groq import AsyncGroq
 from dotenv import load_dotenv
 
+from app.config import (
+    GROQ_CONNECT_TIMEOUT,
+    GROQ_KEEPALIVE_EXPIRY,
+    GROQ_MAX_CONNECTIONS,
+    GROQ_MAX_KEEPALIVE_CONNECTIONS,
+    GROQ_MODEL,
+    GROQ_READ_TIMEOUT,
+    LLM_MAX_TOKENS,
+)
+from app.services.feedback_cache import feedback_key, get_feedback_cache
+from app.services.llm_scheduler import get_llm_scheduler, reset_llm_scheduler
+from app.services.prompt_builder import PROMPT_VERSION, build_prompt
+
 # Load environment variables from the correct path (Windows compatible)
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), '.env')
 load_dotenv(env_path)
@@ -12,7 +29,56 @@ load_dotenv(env_path)
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-def generate_llm_feedback(
+# Shared client; its connection pool keeps TLS connections to Groq alive between requests
+_client: Optional[AsyncGroq] = None
+_client_lock = threading.Lock()
+
+
+def init_llm_client() -> Optional[AsyncGroq]:
+    """
+    Create the shared Groq client, called once at startup.
+
+    Returns:
+        The client, or None if GROQ_API_KEY is not set
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            groq_api_key = os.getenv('GROQ_API_KEY')
+            if not groq_api_key:
+                logger.error("GROQ_API_KEY not found in environment variables")
+                return None
+            http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(GROQ_READ_TIMEOUT, connect=GROQ_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=GROQ_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=GROQ_KEEPALIVE_EXPIRY,
+                ),
+            )
+            # Retries are left to the scheduler, which paces them against the rate limits
+            _client = AsyncGroq(api_key=groq_api_key, http_client=http_client, max_retries=0)
+            logger.info(f"Groq client ready with up to {GROQ_MAX_CONNECTIONS} pooled connections")
+        return _client
+
+
+def get_llm_client() -> Optional[AsyncGroq]:
+    """Get the shared Groq client, creating it if startup has not."""
+    return _client if _client is not None else init_llm_client()
+
+
+async def close_llm_client() -> None:
+    """Close the shared client and its connections, called at shutdown."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        await client.close()
+        logger.info("Groq client closed")
+    reset_llm_scheduler()
+
+
+async def generate_llm_feedback(
     transcript: str,
     text_analysis: Dict[str, Any],
     acoustic_features: Dict[str, Any]
@@ -34,70 +100,36 @@ def generate_llm_feedback(
             - recommendations: List of actionable recommendations
     """
     try:
-        groq_api_key = os.getenv('GROQ_API_KEY')
-        if not groq_api_key:
-            logger.error("GROQ_API_KEY not found in environment variables")
+        # Re-analysis, retries and duplicate uploads reuse earlier feedback
+        cache = get_feedback_cache()
+        cache_key = feedback_key(PROMPT_VERSION, GROQ_MODEL, transcript, text_analysis, acoustic_features)
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                logger.info("Using cached LLM feedback")
+                return cached
+
+        client = get_llm_client()
+        if client is None:
             raise ValueError("GROQ_API_KEY not found in environment variables")
 
-        # logger.info(f"API Key found: {groq_api_key[:8]}...")
-        # logger.info("Initializing Groq client...")
-        client = Groq(api_key=groq_api_key)
-
-        # Prepare the prompt
-        system_prompt = (
-            "You are an expert speech analysis AI that provides detailed feedback on presentations. "
-            "Generate structured feedback in JSON format with these fields: "
-            "summary_feedback (overall analysis), text_suggestions (content improvements), "
-            "voice_suggestions (delivery improvements), overall_score (0-100), and "
-            "recommendations (actionable steps). Focus on both content and delivery aspects."
-        )
-
-        user_prompt = f"""
-        Please analyze this speech data and provide detailed feedback:
-
-        Transcript:
-        {transcript}
-
-        Text Analysis Metrics:
-        {json.dumps(text_analysis, indent=2)}
-
-        Acoustic Features:
-        {json.dumps(acoustic_features, indent=2)}
-
-        Provide feedback in this exact JSON format:
-        {{
-            "summary_feedback": "A detailed paragraph analyzing overall speech quality, addressing both content and delivery",
-            "text_suggestions": [
-                "Specific suggestions about word count and content structure",
-                "Analysis of filler word usage and its impact",
-                "Recommendations for content organization and clarity"
-            ],
-            "voice_suggestions": [
-                "Analysis of speaking rate and its effectiveness",
-                "Feedback on pitch variation and expressiveness",
-                "Comments on energy/volume control and consistency"
-            ],
-            "overall_score": 75,
-            "recommendations": [
-                "Specific exercises to reduce filler words",
-                "Techniques for improving vocal variety",
-                "Methods for enhancing content structure",
-                "Practical steps for maintaining good pace",
-                "Strategies for increasing audience engagement"
-            ]
-        }}
-"""
+        # Prepare the prompt: compact metrics, and transcript excerpts if it is over budget
+        system_prompt, user_prompt, prompt_tokens = build_prompt(transcript, text_analysis, acoustic_features)
 
         # logger.info("Sending request to Groq API...")
+        # The scheduler queues the request until it fits the concurrency and rate budgets
         try:
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+            response = await get_llm_scheduler().submit(
+                lambda: client.chat.completions.create(
+                    model=GROQ_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=LLM_MAX_TOKENS
+                ),
+                tokens=prompt_tokens + LLM_MAX_TOKENS,
             )
         except Exception as api_exc:
             logger.error(f"Groq API call failed: {api_exc}")
@@ -134,6 +166,8 @@ def generate_llm_feedback(
                 raise ValueError(f"Missing required field: {field}")
 
         # logger.info("Successfully generated feedback")
+        if cache is not None:
+            await asyncio.to_thread(cache.put, cache_key, feedback)
         return feedback
 
     except Exception as e:
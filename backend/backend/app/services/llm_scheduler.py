@@ -0,0 +1,172 @@
+"""
+Concurrency and rate-limit aware scheduling of LLM requests.
+
+Requests wait for a slot under the in-flight cap, then for both the
+requests-per-minute and tokens-per-minute budgets of the provider, which
+are tracked as token buckets. Bursts are therefore queued and paced rather
+than rejected with 429s. If a 429 still comes back, every bucket is drained
+so all queued requests pause, and the request is retried after the
+provider's Retry-After delay or an exponential backoff. Connection errors
+and 5xx responses are retried with the backoff alone. The scheduler is the
+only layer that retries; the client is built with max_retries=0.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from groq import APIConnectionError, InternalServerError, RateLimitError
+
+from app.config import (
+    GROQ_REQUESTS_PER_MINUTE,
+    GROQ_TOKENS_PER_MINUTE,
+    LLM_BACKOFF_SECONDS,
+    LLM_MAX_CONCURRENCY,
+    LLM_RATE_LIMIT_RETRIES,
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_scheduler = None
+
+
+class TokenBucket:
+    """Budget that refills continuously up to its capacity."""
+
+    def __init__(self, capacity: float, per_second: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.per_second = per_second
+        self.clock = clock
+        self.level = capacity
+        self.updated = clock()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.per_second)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until amount is available and take it; waiters are served in order."""
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            self._refill()
+            while self.level < amount:
+                await asyncio.sleep((amount - self.level) / self.per_second)
+                self._refill()
+            self.level -= amount
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Correct a reservation once the actual usage is known."""
+        self._refill()
+        self.level = min(self.capacity, self.level + estimated - actual)
+
+    def drain(self) -> None:
+        """Empty the bucket, pausing every waiter until it refills."""
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    """Seconds the provider asked us to wait, if it said."""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """Caps in-flight LLM requests and paces them to the provider's budgets."""
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        requests_per_minute: float = GROQ_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = GROQ_TOKENS_PER_MINUTE,
+        retries: int = LLM_RATE_LIMIT_RETRIES,
+        backoff: float = LLM_BACKOFF_SECONDS,
+    ):
+        """
+        Args:
+            max_concurrency: Most requests in flight at once
+            requests_per_minute: Provider request budget
+            tokens_per_minute: Provider token budget (prompt plus completion)
+            retries: Retries of a request rejected with a 429 or failing transiently
+            backoff: First backoff in seconds when no Retry-After is given
+        """
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.retries = retries
+        self.backoff = backoff
+        self.waiting = 0
+
+    async def submit(self, call: Callable[[], Awaitable[T]], tokens: int) -> T:
+        """
+        Run an LLM request once there is capacity and budget for it.
+
+        Args:
+            call: Function starting the request, called once per attempt
+            tokens: Estimated tokens of the request, prompt plus completion
+
+        Returns:
+            The response of the request
+
+        Raises:
+            RateLimitError: If the provider still rejects it after all retries
+            APIConnectionError, InternalServerError: If it still fails after all retries
+        """
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            for attempt in range(self.retries + 1):
+                await self.requests.acquire(1)
+                await self.tokens.acquire(tokens)
+                try:
+                    response = await call()
+                except RateLimitError as e:
+                    if attempt == self.retries:
+                        raise
+                    delay = _retry_after(e) or self.backoff * 2 ** attempt
+                    logger.warning(f"LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    self.requests.drain()
+                    self.tokens.drain()
+                    await asyncio.sleep(delay)
+                    continue
+                except (APIConnectionError, InternalServerError) as e:
+                    if attempt == self.retries:
+                        raise
+                    delay = self.backoff * 2 ** attempt
+                    logger.warning(f"LLM request failed ({str(e)}), retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    await asyncio.sleep(delay)
+                    continue
+                self._settle(response, tokens)
+                return response
+        finally:
+            self.semaphore.release()
+
+    def _settle(self, response: Any, estimated: int) -> None:
+        usage = getattr(getattr(response, "usage", None), "total_tokens", None)
+        if usage is not None:
+            self.tokens.settle(estimated, usage)
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the shared scheduler, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def reset_llm_scheduler() -> None:
+    """Forget the shared scheduler, e.g. when the client is closed."""
+    global _scheduler
+    _scheduler = None
@@ -0,0 +1,282 @@
+"""
+Pure-NumPy acoustic feature engine.
+
+Computes the AudioFeatures fields from framed views of a mono float signal
+without any native dependency. Pitch uses YIN with FFT-based correlation,
+evaluated for a whole block of frames at once.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services.pause_detection import detect_pauses
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Analysis frames: 40 ms covers two periods of the lowest pitch searched
+FRAME_LENGTH = 0.04
+FRAME_STEP = 0.01
+
+# Pitch search range for speech, in Hz
+PITCH_FMIN = 60.0
+PITCH_FMAX = 400.0
+
+# YIN aperiodicity threshold on the cumulative mean normalized difference
+YIN_THRESHOLD = 0.15
+
+# Frames quieter than this RMS (about -50 dBFS) are never voiced
+SILENCE_RMS = 10 ** (-50 / 20)
+
+# Frames per FFT block, which bounds memory on long recordings
+BLOCK_FRAMES = 2048
+
+
+@dataclass
+class FrameFeatures:
+    """Per-frame low-level descriptors from one extraction pass."""
+    f0: np.ndarray        # Pitch in Hz, 0 for unvoiced frames
+    energy: np.ndarray    # RMS energy
+    peak: np.ndarray      # Peak absolute amplitude, used for shimmer
+    voiced: np.ndarray    # Boolean voicing decision
+    frame_step: float     # Seconds between frame centres
+
+
+def frame_signal(y: np.ndarray, frame_length: int, hop_length: int, center: bool = True) -> np.ndarray:
+    """
+    Split a signal into overlapping frames without copying.
+
+    Args:
+        y: Mono signal
+        frame_length: Samples per frame
+        hop_length: Samples between frame starts
+        center: Zero-pad so frame i is centred on sample i * hop_length
+
+    Returns:
+        Read-only (n_frames, frame_length) view of the (padded) signal
+    """
+    if center:
+        y = np.pad(y, frame_length // 2)
+    if len(y) < frame_length:
+        y = np.pad(y, (0, frame_length - len(y)))
+    return sliding_window_view(y, frame_length)[::hop_length]
+
+
+def yin_pitch(
+    frames: np.ndarray,
+    sr: int,
+    fmin: float = PITCH_FMIN,
+    fmax: float = PITCH_FMAX,
+    threshold: float = YIN_THRESHOLD,
+) -> np.ndarray:
+    """
+    Estimate the pitch of every frame with YIN.
+
+    The difference function is computed from an FFT cross-correlation and
+    cumulative sums of squares, so all frames and lags are evaluated with
+    array operations.
+
+    Args:
+        frames: (n_frames, frame_length) array of samples
+        sr: Sample rate in Hz
+        fmin: Lowest pitch searched in Hz
+        fmax: Highest pitch searched in Hz
+        threshold: Aperiodicity threshold for accepting a period
+
+    Returns:
+        Pitch per frame in Hz, 0 where no period was found
+    """
+    n_frames, frame_length = frames.shape
+    tau_min = max(2, int(sr / fmax))
+    tau_max = min(frame_length // 2, int(np.ceil(sr / fmin)))
+    window = frame_length - tau_max
+    if n_frames == 0 or tau_max <= tau_min + 1:
+        return np.zeros(n_frames)
+
+    x = frames.astype(np.float64)
+    n_fft = 1 << int(np.ceil(np.log2(frame_length)))
+    head = np.fft.rfft(x[:, :window], n_fft, axis=1)
+    full = np.fft.rfft(x, n_fft, axis=1)
+    # r[tau] = sum_{j < window} x[j] * x[j + tau]
+    corr = np.fft.irfft(np.conj(head) * full, n_fft, axis=1)[:, :tau_max + 1]
+
+    squares = np.zeros((n_frames, frame_length + 1))
+    np.cumsum(x * x, axis=1, out=squares[:, 1:])
+    taus = np.arange(tau_max + 1)
+    diff = squares[:, [window]] + squares[:, taus + window] - squares[:, taus] - 2 * corr
+    diff[:, 0] = 0.0
+
+    # Cumulative mean normalized difference
+    cmnd = np.ones_like(diff)
+    running = np.cumsum(diff[:, 1:], axis=1)
+    cmnd[:, 1:] = diff[:, 1:] * taus[1:] / np.maximum(running, np.finfo(float).tiny)
+
+    # First local minimum under the threshold inside the search range
+    region = cmnd[:, tau_min:tau_max + 1]
+    candidates = region[:, :-1] < threshold
+    candidates &= region[:, :-1] <= region[:, 1:]
+    found = candidates.any(axis=1)
+    tau = np.argmax(candidates, axis=1) + tau_min
+
+    # Parabolic interpolation around the chosen lag
+    rows = np.arange(n_frames)
+    tau = np.clip(tau, 1, tau_max - 1)
+    left, mid, right = cmnd[rows, tau - 1], cmnd[rows, tau], cmnd[rows, tau + 1]
+    curvature = left - 2 * mid + right
+    shift = np.divide(
+        0.5 * (left - right), curvature,
+        out=np.zeros(n_frames), where=np.abs(curvature) > 1e-12,
+    )
+    period = tau + np.clip(shift, -1.0, 1.0)
+    return np.where(found, sr / period, 0.0)
+
+
+def compute_frame_features(
+    y: np.ndarray,
+    sr: int,
+    frame_length: float = FRAME_LENGTH,
+    frame_step: float = FRAME_STEP,
+    center: bool = True,
+) -> FrameFeatures:
+    """
+    Compute per-frame pitch, energy and voicing for a signal.
+
+    Args:
+        y: Mono float signal in [-1, 1]
+        sr: Sample rate in Hz
+        frame_length: Frame length in seconds
+        frame_step: Frame step in seconds
+        center: Pad the signal so frames are centred on multiples of the
+            step; pass False for slices of an already padded signal
+
+    Returns:
+        FrameFeatures with one entry per frame
+    """
+    length = int(round(frame_length * sr))
+    hop = int(round(frame_step * sr))
+    frames = frame_signal(np.asarray(y, dtype=np.float32), length, hop, center=center)
+
+    energy = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    peak = np.max(np.abs(frames), axis=1).astype(np.float64)
+    f0 = np.concatenate([
+        yin_pitch(frames[start:start + BLOCK_FRAMES], sr)
+        for start in range(0, len(frames), BLOCK_FRAMES)
+    ]) if len(frames) else np.zeros(0)
+    voiced = (f0 > 0) & (energy >= SILENCE_RMS)
+    f0 = np.where(voiced, f0, 0.0)
+
+    return FrameFeatures(f0=f0, energy=energy, peak=peak, voiced=voiced, frame_step=hop / sr)
+
+
+def _relative_local_perturbation(values: np.ndarray, voiced: np.ndarray) -> float:
+    """Mean absolute difference of consecutive voiced values over their mean."""
+    pairs = voiced[1:] & voiced[:-1]
+    if not pairs.any():
+        return 0.0
+    deltas = np.abs(np.diff(values))[pairs]
+    return float(deltas.mean() / max(values[voiced].mean(), np.finfo(float).tiny))
+
+
+def summarize_frames(frames: FrameFeatures, duration: float) -> Dict[str, Any]:
+    """
+    Reduce per-frame descriptors to the AudioFeatures functionals.
+
+    Jitter and shimmer are frame-level approximations of the cycle-level
+    measures: the relative change in period and peak amplitude between
+    consecutive voiced frames. Pause statistics and articulation rate count
+    voiced segments as speech units.
+
+    Args:
+        frames: Per-frame descriptors
+        duration: Recording duration in seconds
+
+    Returns:
+        Dictionary containing the acoustic features
+    """
+    voiced = frames.voiced
+    pitch = frames.f0[voiced]
+    periods = np.divide(1.0, frames.f0, out=np.zeros_like(frames.f0), where=voiced)
+    # Voiced segment onsets per second, as in eGeMAPS VoicedSegmentsPerSec
+    onsets = np.count_nonzero(np.diff(voiced.astype(np.int8), prepend=0) == 1)
+
+    features = {
+        "pitch_mean": float(pitch.mean()) if pitch.size else 0.0,
+        "pitch_std": float(pitch.std()) if pitch.size else 0.0,
+        "energy_mean": float(frames.energy.mean()) if frames.energy.size else 0.0,
+        "energy_std": float(frames.energy.std()) if frames.energy.size else 0.0,
+        "jitter": _relative_local_perturbation(periods, voiced),
+        "shimmer": _relative_local_perturbation(frames.peak, voiced),
+        "speaking_duration": duration,
+        "speech_rate": float(onsets / duration) if duration > 0 else 0.0,
+    }
+    features.update(detect_pauses(frames.energy, voiced, frames.frame_step, onsets))
+    return features
+
+
+def downsample_frames(frames: FrameFeatures, window: float) -> Dict[str, np.ndarray]:
+    """
+    Reduce per-frame descriptors to fixed windows for charting.
+
+    Frames are padded to a whole number of windows and reduced with a single
+    reshape per series; the last window averages only the frames it holds.
+
+    Args:
+        frames: Per-frame descriptors
+        window: Window length in seconds
+
+    Returns:
+        float32 arrays "pitch" (mean voiced Hz, 0 if none), "energy" and
+        "voicing" (fraction of voiced frames), one value per window
+    """
+    per_window = max(1, int(round(window / frames.frame_step)))
+    n_frames = len(frames.energy)
+    n_windows = -(-n_frames // per_window)
+    pad = n_windows * per_window - n_frames
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        return np.pad(values.astype(np.float64), (0, pad)).reshape(n_windows, per_window).sum(axis=1)
+
+    frame_counts = window_sums(np.ones(n_frames))
+    voiced_counts = window_sums(frames.voiced)
+    pitch = np.divide(window_sums(frames.f0), voiced_counts,
+                      out=np.zeros(n_windows), where=voiced_counts > 0)
+    return {
+        "pitch": pitch.astype(np.float32),
+        "energy": (window_sums(frames.energy) / np.maximum(frame_counts, 1)).astype(np.float32),
+        "voicing": (voiced_counts / np.maximum(frame_counts, 1)).astype(np.float32),
+    }
+
+
+def timeseries_to_json(series: Dict[str, np.ndarray], window: float) -> Dict[str, Any]:
+    """Convert downsampled series to JSON-serializable lists."""
+    result: Dict[str, Any] = {"window": window}
+    for name, values in series.items():
+        result[name] = np.round(values.astype(np.float64), 4).tolist()
+    return result
+
+
+def extract_features_numpy(y: np.ndarray, sr: int, timeseries_window: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Extract acoustic features from a decoded signal with NumPy only.
+
+    Args:
+        y: Mono float signal in [-1, 1]
+        sr: Sample rate in Hz
+        timeseries_window: If given, also return pitch, energy and voicing
+            series downsampled to windows of this many seconds
+
+    Returns:
+        Dictionary with the same fields as the openSMILE engine
+    """
+    logger.info(f"Extracting acoustic features with NumPy ({len(y) / sr:.1f}s at {sr} Hz)")
+    frames = compute_frame_features(y, sr)
+    features = summarize_frames(frames, len(y) / sr)
+    if timeseries_window:
+        features["timeseries"] = timeseries_to_json(
+            downsample_frames(frames, timeseries_window), timeseries_window
+        )
+    return features
@@ -0,0 +1,117 @@
+"""
+Pause detection and articulation rate from frame-level descriptors.
+
+Works on the energy and voicing arrays produced by either acoustic engine,
+using run-length encoding over a boolean speech mask. Everything is
+vectorized so it is cheap enough to also drive live feedback.
+"""
+
+import logging
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Silences shorter than this are part of normal articulation, in seconds
+MIN_PAUSE = 0.25
+
+# Energy threshold as a fraction of the way from the noise floor (10th
+# percentile) to loud speech (90th percentile)
+ENERGY_THRESHOLD_RATIO = 0.1
+
+# Lower edges of the pause-duration histogram bins above min_pause, in seconds;
+# the last bin is open-ended
+PAUSE_HISTOGRAM_EDGES = [0.5, 1.0, 2.0, 4.0]
+
+
+def run_lengths(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run-length encode a boolean array.
+
+    Args:
+        mask: 1-D boolean array
+
+    Returns:
+        Tuple of (run start indices, run lengths, run values)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    if mask.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=bool)
+    starts = np.flatnonzero(np.concatenate(([True], mask[1:] != mask[:-1])))
+    lengths = np.diff(np.append(starts, mask.size))
+    return starts, lengths, mask[starts]
+
+
+def pause_histogram(pauses: np.ndarray, min_pause: float = MIN_PAUSE) -> Dict[str, Any]:
+    """
+    Bucket pause durations on the shared PAUSE_HISTOGRAM_EDGES.
+
+    Args:
+        pauses: Pause durations in seconds, all at least min_pause
+        min_pause: Shortest pause, the lower edge of the first bucket
+
+    Returns:
+        Dictionary with the bucket lower edges and the counts per bucket
+    """
+    edges = [min_pause] + [edge for edge in PAUSE_HISTOGRAM_EDGES if edge > min_pause]
+    counts = np.bincount(np.searchsorted(edges, pauses, side="right") - 1, minlength=len(edges))
+    return {"edges": edges, "counts": counts.tolist()}
+
+
+def speech_mask(energy: np.ndarray, voiced: np.ndarray) -> np.ndarray:
+    """Frames that are voiced or clearly above the recording's noise floor."""
+    if energy.size == 0:
+        return np.zeros(0, dtype=bool)
+    floor, loud = np.percentile(energy, [10, 90])
+    return voiced | (energy > floor + ENERGY_THRESHOLD_RATIO * (loud - floor))
+
+
+def detect_pauses(
+    energy: np.ndarray,
+    voiced: np.ndarray,
+    frame_step: float,
+    speech_units: int,
+    min_pause: float = MIN_PAUSE,
+) -> Dict[str, Any]:
+    """
+    Find pauses between stretches of speech and derive articulation rate.
+
+    Leading and trailing silence is not counted as pausing.
+
+    Args:
+        energy: Per-frame energy
+        voiced: Per-frame boolean voicing decision
+        frame_step: Seconds between frames
+        speech_units: Number of speech units (e.g. voiced segments or
+            syllables) used as the articulation rate numerator
+        min_pause: Shortest silence counted as a pause, in seconds
+
+    Returns:
+        Dictionary with pause_count, longest_pause, total_pause_time,
+        phonation_time, pause_histogram and articulation_rate
+    """
+    speech = speech_mask(np.asarray(energy), np.asarray(voiced, dtype=bool))
+    starts, lengths, values = run_lengths(speech)
+
+    # Silent runs strictly between the first and last speech frames
+    inner = ~values
+    if values.size:
+        inner[0] = inner[-1] = False
+    durations = lengths[inner] * frame_step
+    pauses = durations[durations >= min_pause]
+
+    spoken = np.flatnonzero(speech)
+    span = (spoken[-1] - spoken[0] + 1) * frame_step if spoken.size else 0.0
+    phonation_time = max(float(span) - float(pauses.sum()), 0.0)
+
+    return {
+        "pause_count": int(pauses.size),
+        "longest_pause": float(pauses.max()) if pauses.size else 0.0,
+        "total_pause_time": float(pauses.sum()),
+        "phonation_time": phonation_time,
+        "pause_histogram": pause_histogram(pauses, min_pause),
+        "articulation_rate": speech_units / phonation_time if phonation_time > 0 else 0.0,
+    }
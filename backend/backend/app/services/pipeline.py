@@ -10,52 +10,116 @@ if backend_root not in sys.path:
 """
 Robust pipeline for PitchPerfect: from audio file to LLM feedback.
 """
-from app.services.transcription import transcribe_audio, get_audio_duration
+import asyncio
+import logging
+from app.services.transcription import transcribe_audio_with_segments, get_audio_duration
 from app.services.text_analysis import analyze_text
-from app.services.acoustic_features import extract_features
+from app.services.analytics import compute_analytics
+from app.services.acoustic_features import extract_feature_groups, load_audio
+from app.services.feature_groups import SUMMARY_GROUPS
 from app.services.llm_feedback import generate_llm_feedback
+from app.services.spectral_cache import SpectralCache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+# Configure logger
+logger = logging.getLogger(__name__)
 
 # Use Dict[str, Any] for result to allow any value type
 
 
-def process_audio_pipeline(audio_path: str) -> Dict[str, Any]:
+def _analyze_audio(
+    audio_path: str, fields: Optional[List[str]], result: Dict[str, Any]
+) -> Optional[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
     """
-    Complete pipeline: audio file -> transcript -> text analysis -> acoustic features -> LLM feedback.
-    Returns a dictionary with all intermediate and final results.
+    The CPU-bound stages of the pipeline.
+
+    Runs transcription, text analysis, acoustic features and analytics.
+    Fills result and returns the transcript, text analysis and acoustic
+    summary for the LLM, or None if transcription failed.
     """
-    result: Dict[str, Any] = {"success": False}
+    # Decode once; transcription and acoustic analysis share the samples
     try:
-        # Step 1: Transcribe audio
-        transcript = transcribe_audio(audio_path)
-        if not transcript or transcript.strip() == "":
-            result["error"] = "Transcription failed: Empty or None result"
-            return result
-        result["transcript"] = transcript
+        cache = SpectralCache(load_audio(Path(audio_path)))
+    except Exception as e:
+        logger.warning(f"Could not decode audio up front, stages will decode it themselves: {str(e)}")
+        cache = None
 
-        # Step 2: Text analysis
-        try:
-            text_analysis = analyze_text(transcript)
-            result["text_analysis"] = text_analysis
-        except Exception as e:
-            result["text_analysis_error"] = str(e)
-            text_analysis = {}
+    # Step 1: Transcribe audio
+    transcription = transcribe_audio_with_segments(audio_path, cache=cache)
+    transcript = transcription["text"]
+    if not transcript or transcript.strip() == "":
+        result["error"] = "Transcription failed: Empty or None result"
+        return None
+    result["transcript"] = transcript
+    result["segments"] = transcription["segments"]
 
-        # Step 3: Acoustic features (openSMILE, robust, WAV conversion)
-        try:
-            audio_features = extract_features(Path(audio_path))
-            result["acoustic_features"] = audio_features
-            # Always set audio_duration from acoustic features (handles mp3/wav)
-            result["audio_duration"] = audio_features.get("speaking_duration", 0.0)
-        except Exception as e:
-            result["acoustic_features_error"] = str(e)
-            audio_features = {}
-            result["audio_duration"] = 0.0
+    # Step 2: Text analysis
+    try:
+        text_analysis = analyze_text(transcript, segments=transcription["segments"])
+        result["text_analysis"] = text_analysis
+    except Exception as e:
+        result["text_analysis_error"] = str(e)
+        text_analysis = {}
+
+    # Step 3: Acoustic features, computed group by group as they are read
+    try:
+        feature_groups = extract_feature_groups(Path(audio_path), cache=cache)
+        # The projection only shapes the response; the LLM and the stored
+        # analysis always get the full scalar summary, without time series
+        result["acoustic_features"] = feature_groups.select(fields)
+        audio_features = feature_groups.select(SUMMARY_GROUPS)
+        result["acoustic_summary"] = audio_features
+        # Always set audio_duration from acoustic features (handles mp3/wav)
+        result["audio_duration"] = feature_groups.get("speaking_duration", 0.0)
+    except Exception as e:
+        result["acoustic_features_error"] = str(e)
+        audio_features = {}
+        result["audio_duration"] = 0.0
+
+    # Replace the default speaking rate estimate with measured words per minute
+    if text_analysis.get("word_count") and result["audio_duration"] > 0:
+        text_analysis["speaking_rate"] = text_analysis["word_count"] / result["audio_duration"] * 60
+
+    # Time series for the dashboard charts
+    try:
+        result["analytics"] = compute_analytics(
+            transcript,
+            transcription["segments"],
+            filler_offsets=text_analysis.get("filler_offsets"),
+            duration=result["audio_duration"],
+            acoustic_pauses=audio_features.get("pause_histogram"),
+        )
+    except Exception as e:
+        logger.warning(f"Analytics failed: {str(e)}")
+        result["analytics_error"] = str(e)
+
+    return transcript, text_analysis, audio_features
+
+
+async def process_audio_pipeline(audio_path: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Complete pipeline: audio file -> transcript -> text analysis ->
+    acoustic features -> LLM feedback. Returns a dictionary with all
+    intermediate and final results.
+
+    fields projects the returned acoustic features onto the given field and
+    group names. The LLM feedback and the stored analysis always use the
+    full acoustic summary (SUMMARY_GROUPS), so only groups outside it, such
+    as the time series, are skipped when not requested. The analysis stages
+    run in a worker thread and the LLM request is awaited, so the event loop
+    stays free for other requests.
+    """
+    result: Dict[str, Any] = {"success": False}
+    try:
+        analysis = await asyncio.to_thread(_analyze_audio, audio_path, fields, result)
+        if analysis is None:
+            return result
+        transcript, text_analysis, audio_features = analysis
 
         # Step 4: LLM feedback (main output)
         try:
-            llm_feedback = generate_llm_feedback(
+            llm_feedback = await generate_llm_feedback(
                 transcript=transcript,
                 text_analysis=text_analysis,
                 acoustic_features=audio_features
@@ -79,7 +143,7 @@ def main():
     parser.add_argument("audio_path", type=str, help="Path to the audio file (wav)")
     args = parser.parse_args()
 
-    result = process_audio_pipeline(args.audio_path)
+    result = asyncio.run(process_audio_pipeline(args.audio_path))
     print(json.dumps(result, indent=2, ensure_ascii=False))
     if not result.get("success", False):
         sys.exit(1)
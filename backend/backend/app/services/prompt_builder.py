@@ -0,0 +1,273 @@
+"""
+Token-budgeted prompts for LLM feedback.
+
+Metrics are serialized as compact JSON without zero, empty or placeholder
+fields and without per-occurrence detail (character offsets, per-sentence
+arrays) that the model cannot use. Transcripts that do not fit the token
+budget are replaced by representative excerpts: the opening, the closing
+and the passages densest in filler words, cut at words where a sentence
+alone is too long for its share. Tokens are counted with tiktoken
+when installed, otherwise estimated from the character count.
+"""
+
+import bisect
+import importlib.util
+import json
+import logging
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.config import LLM_PROMPT_TOKEN_BUDGET, PROMPT_TOKENIZER_ENCODING
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Check if tiktoken is available
+tiktoken_available = importlib.util.find_spec("tiktoken") is not None
+if tiktoken_available:
+    try:
+        import tiktoken
+        _encoding = tiktoken.get_encoding(PROMPT_TOKENIZER_ENCODING)
+    except Exception as e:
+        tiktoken_available = False
+        logger.warning(f"tiktoken could not be loaded, estimating token counts: {str(e)}")
+
+# Version of the prompt template; bump it whenever the prompt changes so
+# cached feedback is not reused
+PROMPT_VERSION = "2"
+
+# Characters per token of English text, for estimates without tiktoken
+CHARS_PER_TOKEN = 4
+
+# Detail the model cannot use, and placeholder values that carry no information
+OMITTED_FIELDS = {"filler_offsets", "offsets"}
+PLACEHOLDER_VALUES = {"speaking_rate": 150.0}
+
+# Share of the transcript budget given to the opening and to the closing
+OPENING_SHARE = 0.3
+CLOSING_SHARE = 0.2
+
+# Marks passages left out of an excerpted transcript
+OMISSION_MARK = "[...]"
+
+TRANSCRIPT_LABEL = "Transcript"
+EXCERPT_LABEL = "Transcript excerpts (opening, closing and filler-heavy passages)"
+
+SENTENCE_SPAN = re.compile(r"[^.!?]+[.!?]*")
+WORD_SPAN = re.compile(r"\S+")
+
+SYSTEM_PROMPT = (
+    "You are an expert speech analysis AI that provides detailed feedback on presentations. "
+    "Generate structured feedback in JSON format with these fields: "
+    "summary_feedback (overall analysis), text_suggestions (content improvements), "
+    "voice_suggestions (delivery improvements), overall_score (0-100), and "
+    "recommendations (actionable steps). Focus on both content and delivery aspects."
+)
+
+USER_PROMPT = """Please analyze this speech data and provide detailed feedback:
+
+{transcript_label}:
+{transcript}
+
+Text Analysis Metrics:
+{text_analysis}
+
+Acoustic Features:
+{acoustic_features}
+
+Provide feedback in this exact JSON format:
+{{"summary_feedback": "A detailed paragraph analyzing overall speech quality, addressing both content and delivery",
+"text_suggestions": ["Specific suggestions about word count and content structure", "Analysis of filler word usage and its impact", "Comments on repeated phrases or verbal tics listed under repeated_phrases, if any", "Recommendations for content organization and clarity"],
+"voice_suggestions": ["Analysis of speaking rate and its effectiveness", "Feedback on pitch variation and expressiveness", "Comments on energy/volume control and consistency"],
+"overall_score": 75,
+"recommendations": ["Specific exercises to reduce filler words", "Techniques for improving vocal variety", "Methods for enhancing content structure", "Practical steps for maintaining good pace", "Strategies for increasing audience engagement"]}}
+"""
+
+
+def count_tokens(text: str) -> int:
+    """
+    Number of tokens of a text.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Exact count with tiktoken, otherwise an estimate of about four
+        characters per token
+    """
+    if tiktoken_available:
+        return len(_encoding.encode(text))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact_metrics(value: Any, key: Optional[str] = None) -> Any:
+    """
+    Metrics without zero, empty, placeholder or per-occurrence fields.
+
+    Floats are rounded to three significant digits. Only dictionary fields
+    are dropped: list elements keep their positions, zeros included, so
+    per-bin arrays stay aligned. Per-sentence arrays are reduced to the
+    number of long sentences and the longest sentence's word count, and
+    repeated phrases to "phrase (count)".
+
+    Args:
+        value: Metrics dictionary, or a value inside one
+        key: Name of value in its parent dictionary
+
+    Returns:
+        Compacted value, or None if it should be dropped
+    """
+    if key in OMITTED_FIELDS or value is None or value is False:
+        return None
+    if key in PLACEHOLDER_VALUES and value == PLACEHOLDER_VALUES[key]:
+        return None
+    if key == "sentence_metrics" and isinstance(value, dict):
+        value = {
+            "long_sentences": len(value.get("long_sentences", [])),
+            "max_words": max(value.get("word_counts", []), default=0),
+        }
+    if key == "repeated_phrases" and isinstance(value, list):
+        value = [f"{item['phrase']} ({item['count']})" for item in value if "phrase" in item]
+    if isinstance(value, bool) or isinstance(value, str):
+        return value or None
+    if isinstance(value, (int, float)):
+        if value == 0:
+            return None
+        return value if isinstance(value, int) else float(f"{value:.3g}")
+    if isinstance(value, dict):
+        compacted = {k: compact_metrics(v, k) for k, v in value.items()}
+        return {k: v for k, v in compacted.items() if v is not None} or None
+    if isinstance(value, (list, tuple)):
+        compacted = [
+            item if item == 0 and isinstance(item, (int, float)) and not isinstance(item, bool)
+            else compact_metrics(item)
+            for item in value
+        ]
+        return compacted or None
+    return str(value)
+
+
+def _dumps(metrics: Dict[str, Any]) -> str:
+    return json.dumps(compact_metrics(metrics) or {}, separators=(",", ":"))
+
+
+def select_excerpts(
+    transcript: str,
+    budget: int,
+    filler_offsets: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """
+    Representative excerpts of a transcript within a token budget.
+
+    Whole sentences are taken from the opening and the closing, and the
+    rest of the budget goes to the sentences with the most filler words
+    per character. Sentences longer than the closing share of the budget,
+    e.g. an unpunctuated transcript, are first cut into runs of words that
+    fit it. Excerpts keep their order and gaps are marked with
+    OMISSION_MARK.
+
+    Args:
+        transcript: Transcript text
+        budget: Tokens the excerpts may use
+        filler_offsets: Filler occurrences as returned by analyze_text
+
+    Returns:
+        The transcript if it fits, otherwise the joined excerpts
+    """
+    if count_tokens(transcript) <= budget:
+        return transcript
+    spans = []
+    piece_limit = max(1.0, budget * CLOSING_SHARE)
+    for m in SENTENCE_SPAN.finditer(transcript):
+        if not m.group().strip():
+            continue
+        tokens = count_tokens(m.group()) + count_tokens(OMISSION_MARK) + 1
+        if tokens <= piece_limit:
+            spans.append((m.start(), m.end()))
+            continue
+        # Too long to fit its share: cut into word runs of about piece_limit tokens
+        words = [(w.start(), w.end()) for w in WORD_SPAN.finditer(transcript, m.start(), m.end())]
+        per_piece = max(1, int(len(words) * piece_limit / tokens))
+        spans += [(words[i][0], words[min(i + per_piece, len(words)) - 1][1]) for i in range(0, len(words), per_piece)]
+    # Each sentence may be followed by an omission mark
+    costs = [count_tokens(transcript[start:end]) + count_tokens(OMISSION_MARK) + 1 for start, end in spans]
+    chosen = set()
+    used = 0
+
+    def take(index: int, limit: float) -> bool:
+        nonlocal used
+        if index in chosen or used + costs[index] > limit:
+            return False
+        chosen.add(index)
+        used += costs[index]
+        return True
+
+    # Opening and closing sentences, each within its share of the budget
+    for i in range(len(spans)):
+        if not take(i, budget * OPENING_SHARE):
+            break
+    closing_limit = used + budget * CLOSING_SHARE
+    for i in reversed(range(len(spans))):
+        if not take(i, closing_limit):
+            break
+
+    # Then the passages densest in fillers
+    starts = sorted(offset["start"] for offset in filler_offsets or [])
+    density = [
+        (bisect.bisect_left(starts, end) - bisect.bisect_left(starts, start)) / max(1, end - start)
+        for start, end in spans
+    ]
+    for i in sorted(range(len(spans)), key=lambda i: (-density[i], i)):
+        if density[i] == 0:
+            break
+        take(i, budget)
+
+    excerpts, previous = [], None
+    for i in sorted(chosen):
+        text = transcript[spans[i][0]:spans[i][1]].strip()
+        if previous is not None and i != previous + 1:
+            excerpts.append(OMISSION_MARK)
+        excerpts.append(text)
+        previous = i
+    if previous is not None and previous != len(spans) - 1:
+        excerpts.append(OMISSION_MARK)
+    return " ".join(excerpts)
+
+
+def build_prompt(
+    transcript: str,
+    text_analysis: Dict[str, Any],
+    acoustic_features: Dict[str, Any],
+    budget: int = LLM_PROMPT_TOKEN_BUDGET,
+) -> Tuple[str, str, int]:
+    """
+    System and user prompts for feedback on a speech, within a token budget.
+
+    The metrics are always included, compacted; the transcript gets the
+    tokens that remain and is excerpted if it does not fit.
+
+    Args:
+        transcript: Transcript text
+        text_analysis: Text analysis metrics
+        acoustic_features: Acoustic feature summary
+        budget: Tokens the system and user prompts may use together
+
+    Returns:
+        Tuple of system prompt, user prompt and their token count
+    """
+    text_metrics = _dumps(text_analysis)
+    acoustic_metrics = _dumps(acoustic_features)
+    fixed = count_tokens(SYSTEM_PROMPT) + count_tokens(USER_PROMPT.format(
+        transcript_label=EXCERPT_LABEL, transcript="", text_analysis=text_metrics, acoustic_features=acoustic_metrics,
+    ))
+    transcript_budget = max(0, budget - fixed)
+
+    excerpt = select_excerpts(transcript, transcript_budget, text_analysis.get("filler_offsets"))
+    label = TRANSCRIPT_LABEL if excerpt == transcript else EXCERPT_LABEL
+    user_prompt = USER_PROMPT.format(
+        transcript_label=label, transcript=excerpt, text_analysis=text_metrics, acoustic_features=acoustic_metrics,
+    )
+    tokens = count_tokens(SYSTEM_PROMPT) + count_tokens(user_prompt)
+    if excerpt != transcript:
+        logger.info(f"Transcript of {count_tokens(transcript)} tokens excerpted to fit a {budget} token prompt")
+    return SYSTEM_PROMPT, user_prompt, tokens
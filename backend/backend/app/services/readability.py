@@ -0,0 +1,132 @@
+"""
+Single-pass readability scoring.
+
+The text is tokenized once, or spaCy's tokens are reused, and reduced to
+additive counts (sentences, words, syllables, polysyllables). All four
+readability formulas are derived from those counts. Syllables are counted
+once per distinct word through an LRU-cached lookup: Pyphen's hyphenation
+dictionary when installed, otherwise a vowel-group heuristic.
+"""
+
+import importlib.util
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, Iterable
+
+from app.config import READABILITY_SYLLABLE_CACHE_SIZE
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Check if Pyphen is available
+pyphen_available = importlib.util.find_spec("pyphen") is not None
+if pyphen_available:
+    try:
+        import pyphen
+        _hyphenator = pyphen.Pyphen(lang="en_US")
+    except Exception as e:
+        pyphen_available = False
+        logger.warning(f"Pyphen could not be loaded, using heuristic syllable counts: {str(e)}")
+
+# Words and sentence ends for text that has not been through spaCy
+WORD_PATTERN = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+SENTENCE_PATTERN = re.compile(r"[^.!?]*[A-Za-z][^.!?]*(?:[.!?]+|$)")
+
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+# Words with at least this many syllables count as polysyllabic (SMOG) and
+# complex (Gunning fog)
+POLYSYLLABLE_MIN = 3
+
+# SMOG is only defined for texts of at least this many sentences
+SMOG_MIN_SENTENCES = 3
+
+
+@lru_cache(maxsize=READABILITY_SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """
+    Number of syllables in a lowercase word.
+
+    Args:
+        word: Lowercase word without surrounding punctuation
+
+    Returns:
+        Syllable count, at least 1
+    """
+    if pyphen_available:
+        return len(_hyphenator.positions(word)) + 1
+    groups = len(VOWEL_GROUPS.findall(word))
+    # A final silent "e" ("make") does not add a syllable, but "-le" ("simple") does
+    if word.endswith("e") and not word.endswith(("le", "ee")) and groups > 1:
+        groups -= 1
+    return max(1, groups)
+
+
+@dataclass
+class ReadabilityCounts:
+    """Additive counts that every readability formula is derived from."""
+    sentences: int = 0
+    words: int = 0
+    syllables: int = 0
+    polysyllables: int = 0
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], sentences: int) -> "ReadabilityCounts":
+        """Counts of a tokenized text; syllables are looked up once per distinct word."""
+        counts = cls(sentences=sentences)
+        for word, occurrences in Counter(word.lower() for word in words).items():
+            syllables = count_syllables(word)
+            counts.words += occurrences
+            counts.syllables += syllables * occurrences
+            if syllables >= POLYSYLLABLE_MIN:
+                counts.polysyllables += occurrences
+        return counts
+
+    @classmethod
+    def from_text(cls, text: str) -> "ReadabilityCounts":
+        """Counts of raw text, tokenized with regular expressions."""
+        return cls.from_words(WORD_PATTERN.findall(text), len(SENTENCE_PATTERN.findall(text)))
+
+    @classmethod
+    def from_doc(cls, doc) -> "ReadabilityCounts":
+        """Counts of a spaCy Doc, reusing its tokens and sentence boundaries."""
+        words = [token.text for token in doc if token.is_alpha]
+        sentences = sum(1 for sentence in doc.sents if any(token.is_alpha for token in sentence))
+        return cls.from_words(words, sentences)
+
+    def __add__(self, other: "ReadabilityCounts") -> "ReadabilityCounts":
+        return ReadabilityCounts(
+            sentences=self.sentences + other.sentences,
+            words=self.words + other.words,
+            syllables=self.syllables + other.syllables,
+            polysyllables=self.polysyllables + other.polysyllables,
+        )
+
+    def scores(self) -> Dict[str, float]:
+        """
+        The readability scores reported by analyze_text.
+
+        Returns:
+            Dictionary with flesch_reading_ease, flesch_kincaid_grade,
+            gunning_fog and smog_index, rounded to two decimals
+        """
+        if self.words == 0:
+            return {"flesch_reading_ease": 0.0, "flesch_kincaid_grade": 0.0, "gunning_fog": 0.0, "smog_index": 0.0}
+        words_per_sentence = self.words / max(1, self.sentences)
+        syllables_per_word = self.syllables / self.words
+        smog = 0.0
+        if self.sentences >= SMOG_MIN_SENTENCES:
+            smog = 1.043 * (self.polysyllables * 30 / self.sentences) ** 0.5 + 3.1291
+        return {
+            "flesch_reading_ease": round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2),
+            "flesch_kincaid_grade": round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 2),
+            "gunning_fog": round(0.4 * (words_per_sentence + 100 * self.polysyllables / self.words), 2),
+            "smog_index": round(smog, 2),
+        }
+
+    def to_dict(self) -> Dict[str, int]:
+        """JSON-serializable form, for combining with later text."""
+        return asdict(self)
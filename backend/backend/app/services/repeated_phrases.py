@@ -0,0 +1,227 @@
+"""
+Repeated-phrase (verbal tic) detection with rolling hashes.
+
+Words are streamed through a window of the last PHRASE_MAX_N words. For
+every word, Rabin-Karp hashes of the n-grams ending at it are extended from
+the hashes of the (n-1)-grams ending at the previous word, so the scan is
+linear in the number of words. Occurrences are tallied in a counter of at
+most PHRASE_TRACKED_MAX entries: when it fills up, the rarest phrases are
+evicted, so memory stays bounded however long the transcript is. Phrases
+do not run across sentence ends, and a phrase only counted as part of a
+longer repeated phrase is not reported on its own. Runs longer than
+PHRASE_MAX_N words are reported as one phrase, joined from the overlapping
+n-grams they are counted as.
+"""
+
+import logging
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.config import (
+    PHRASE_MAX_N,
+    PHRASE_MAX_OFFSETS,
+    PHRASE_MIN_N,
+    PHRASE_MIN_REPEATS,
+    PHRASE_REPORT_LIMIT,
+    PHRASE_TRACKED_MAX,
+)
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Words, and the sentence ends that phrases may not cross
+TOKEN_PATTERN = re.compile(r"([A-Za-z]+(?:'[A-Za-z]+)*)|[.!?]+")
+
+# Rabin-Karp hashing modulo a Mersenne prime
+HASH_MODULUS = (1 << 61) - 1
+HASH_BASE = 1_000_003
+
+# Phrases made only of these words ("of the", "and it is") are not tics
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "if", "of", "to", "in", "on", "at", "by", "for", "with",
+    "from", "as", "into", "about", "is", "are", "was", "were", "be", "been", "am", "do", "does",
+    "did", "have", "has", "had", "it", "its", "it's", "this", "that", "these", "those", "there",
+    "i", "i'm", "you", "he", "she", "we", "they", "me", "him", "her", "us", "them", "my", "your",
+    "our", "their", "not", "no", "so", "then", "than", "can", "will", "would", "could", "should",
+}
+
+
+class RepeatedPhraseDetector:
+    """
+    Streaming counter of repeated n-grams.
+
+    Text is fed in order, in one piece or as consecutive chunks with their
+    offsets, and phrases() reports the repeated phrases found so far.
+    """
+
+    def __init__(
+        self,
+        min_n: int = PHRASE_MIN_N,
+        max_n: int = PHRASE_MAX_N,
+        min_repeats: int = PHRASE_MIN_REPEATS,
+        capacity: int = PHRASE_TRACKED_MAX,
+    ):
+        """
+        Args:
+            min_n: Fewest words in a phrase
+            max_n: Most words in a phrase
+            min_repeats: Occurrences needed for a phrase to be reported
+            capacity: Most phrases tracked at once
+        """
+        self.min_n = min_n
+        self.max_n = max_n
+        self.min_repeats = min_repeats
+        self.capacity = capacity
+        self.vocabulary: Dict[str, int] = {}
+        # Last words of the current sentence: (word, start, end), and the
+        # hashes of the n-grams ending at the last word, by n
+        self.window: List[Tuple[str, int, int]] = []
+        self.hashes: List[int] = []
+        # (n, hash) -> [count, phrase, offsets, end of the last counted occurrence]
+        self.counts: Dict[Tuple[int, int], list] = {}
+        self.evicted_below = 0
+
+    def feed(self, text: str, offset: int = 0) -> None:
+        """
+        Scan the next piece of the transcript.
+
+        Args:
+            text: Transcript text following what was fed before
+            offset: Character offset of text in the whole transcript
+        """
+        for match in TOKEN_PATTERN.finditer(text):
+            if match.group(1) is None:
+                self.window.clear()
+                self.hashes = []
+                continue
+            word = match.group(1).lower()
+            word_id = self.vocabulary.setdefault(word, len(self.vocabulary) + 1)
+            self.window.append((word, match.start() + offset, match.end() + offset))
+            if len(self.window) > self.max_n:
+                self.window.pop(0)
+            # hashes[n - 1] is the hash of the n-gram ending at this word, rolled
+            # forward from the (n-1)-gram ending at the previous word
+            self.hashes = [word_id] + [
+                (h * HASH_BASE + word_id) % HASH_MODULUS for h in self.hashes[:self.max_n - 1]
+            ]
+            for n in range(self.min_n, len(self.window) + 1):
+                self._count(n, self.hashes[n - 1])
+
+    def _count(self, n: int, key_hash: int) -> None:
+        key = (n, key_hash)
+        start = self.window[-n][1]
+        end = self.window[-1][2]
+        entry = self.counts.get(key)
+        if entry is None:
+            if len(self.counts) >= self.capacity:
+                self._evict()
+            phrase = " ".join(word for word, _, _ in self.window[-n:])
+            self.counts[key] = [1, phrase, [(start, end)], end]
+            return
+        # Overlapping occurrences ("no no no") count once
+        if start < entry[3]:
+            return
+        entry[0] += 1
+        entry[3] = end
+        if len(entry[2]) < PHRASE_MAX_OFFSETS:
+            entry[2].append((start, end))
+
+    def _evict(self) -> None:
+        """Drop the rarest phrases until the counter is at most half full."""
+        while len(self.counts) > self.capacity // 2:
+            self.evicted_below += 1
+            self.counts = {key: entry for key, entry in self.counts.items() if entry[0] > self.evicted_below}
+        logger.debug(f"Evicted phrases seen at most {self.evicted_below} times")
+
+    def phrases(self, limit: Optional[int] = PHRASE_REPORT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Repeated phrases found so far, most repeated words first.
+
+        Args:
+            limit: Most phrases to return, or None for all
+
+        Returns:
+            List of dictionaries with phrase, count and offsets (start and
+            end character offsets of up to PHRASE_MAX_OFFSETS occurrences)
+        """
+        repeated = {
+            entry[1]: entry for entry in self.counts.values()
+            if entry[0] >= self.min_repeats and not set(entry[1].split()) <= STOPWORDS
+        }
+        # A phrase repeated only inside a longer repeated phrase is not reported
+        subsumed = set()
+        for phrase, entry in repeated.items():
+            words = phrase.split()
+            for sub in (" ".join(words[1:]), " ".join(words[:-1])):
+                if sub in repeated and repeated[sub][0] <= entry[0]:
+                    subsumed.add(sub)
+
+        report = self._join_runs([
+            {"phrase": phrase, "count": entry[0], "offsets": [{"start": s, "end": e} for s, e in entry[2]]}
+            for phrase, entry in repeated.items() if phrase not in subsumed
+        ])
+        report.sort(key=lambda item: (-item["count"] * len(item["phrase"].split()), item["offsets"][0]["start"]))
+        return report if limit is None else report[:limit]
+
+    def _join_runs(self, report: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Join max_n-word phrases that are parts of one longer repeated run.
+
+        A phrase continues another when its words are the other's shifted by
+        one word, it has the same count and each of its occurrences starts
+        inside the other's matching occurrence and ends after it.
+        """
+        longest = [item for item in report if len(item["phrase"].split()) == self.max_n]
+        by_prefix: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for item in longest:
+            by_prefix.setdefault(tuple(item["phrase"].split()[:-1]), []).append(item)
+
+        def continues(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+            return (
+                second is not first
+                and second["count"] == first["count"]
+                and len(second["offsets"]) == len(first["offsets"])
+                and all(a["start"] < b["start"] < a["end"] < b["end"]
+                        for a, b in zip(first["offsets"], second["offsets"]))
+            )
+
+        successors: Dict[int, Dict[str, Any]] = {}
+        for item in longest:
+            for candidate in by_prefix.get(tuple(item["phrase"].split()[1:]), []):
+                if continues(item, candidate):
+                    successors[id(item)] = candidate
+                    break
+        continued = {id(item) for item in successors.values()}
+
+        joined = []
+        for item in report:
+            if id(item) in continued:
+                continue
+            last, words = item, item["phrase"].split()
+            while id(last) in successors:
+                last = successors[id(last)]
+                words.append(last["phrase"].rsplit(" ", 1)[-1])
+            if last is not item:
+                item = {
+                    "phrase": " ".join(words),
+                    "count": item["count"],
+                    "offsets": [{"start": a["start"], "end": b["end"]} for a, b in zip(item["offsets"], last["offsets"])],
+                }
+            joined.append(item)
+        return joined
+
+
+def find_repeated_phrases(text: str, limit: Optional[int] = PHRASE_REPORT_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Repeated phrases of a transcript in one linear scan.
+
+    Args:
+        text: Transcript text
+        limit: Most phrases to return, or None for all
+
+    Returns:
+        List as returned by RepeatedPhraseDetector.phrases
+    """
+    detector = RepeatedPhraseDetector()
+    detector.feed(text)
+    return detector.phrases(limit)
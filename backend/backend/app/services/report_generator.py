@@ -19,7 +19,8 @@ def generate_report(
     acoustic_features: Dict[str, Any],
     llm_feedback: Optional[Dict[str, Any]] = None,
     user_id: Optional[str] = None,
-    session_id: Optional[str] = None
+    session_id: Optional[str] = None,
+    analytics: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Generate a structured report from all analysis modules.
@@ -36,6 +37,8 @@ def generate_report(
         report["user_id"] = user_id
     if session_id:
         report["session_id"] = session_id
+    if analytics:
+        report["analytics"] = analytics
     try:
         # Ensure serializability
         json.dumps(report)
@@ -0,0 +1,77 @@
+"""
+Mergeable running statistics.
+
+Count, mean and sum of squared deviations (M2) kept with Welford's update
+and combined with Chan et al.'s parallel merge, so statistics from separate
+windows, processes or recordings add up to the single-pass result.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable
+
+import numpy as np
+
+
+@dataclass
+class RunningStats:
+    """Count, mean and M2 of a stream of values."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "RunningStats":
+        """Statistics of an array of values."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(count=int(values.size), mean=mean, m2=float(np.sum((values - mean) ** 2)))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "RunningStats":
+        """Rebuild statistics stored with to_dict."""
+        return cls(count=int(data["count"]), mean=float(data["mean"]), m2=float(data["m2"]))
+
+    @classmethod
+    def merge_all(cls, parts: Iterable["RunningStats"]) -> "RunningStats":
+        """Merge any number of partial statistics."""
+        total = cls()
+        for part in parts:
+            total = total.merge(part)
+        return total
+
+    def update(self, value: float) -> None:
+        """Add one value (Welford's update)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine with statistics of a disjoint set of values (Chan et al.)."""
+        if other.count == 0:
+            return RunningStats(self.count, self.mean, self.m2)
+        if self.count == 0:
+            return RunningStats(other.count, other.mean, other.m2)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return RunningStats(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+        )
+
+    @property
+    def variance(self) -> float:
+        """Population variance, matching numpy's default ddof=0."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self) -> Dict[str, float]:
+        """JSON-serializable form, for storing and merging later."""
+        return asdict(self)
@@ -0,0 +1,209 @@
+"""
+Sampling-based acoustic estimation for very long recordings.
+
+Instead of analysing every frame, a stratified random sample of windows is
+analysed and the functionals are estimated with bootstrap confidence
+intervals. The sample is doubled until the intervals are narrower than the
+target, so the analysis cost depends on the precision needed rather than on
+duration. The recording is still decoded once in full; in the pipeline that
+decode is shared with transcription. Only the NumPy engine samples: with
+openSMILE every window of a long recording is extracted.
+"""
+
+import logging
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from app.config import (
+    ACOUSTIC_SAMPLE_WINDOW_SECONDS,
+    ACOUSTIC_SAMPLING_CI_WIDTH,
+    ACOUSTIC_SAMPLING_INITIAL_WINDOWS,
+)
+from app.services.pause_detection import detect_pauses
+from app.services.speech_rate import estimate_speech_rate
+from app.services.windowed_acoustics import STATISTICS, _analyse_window, analyse_windows, window_tasks
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Confidence level of the reported intervals
+CONFIDENCE_LEVEL = 0.95
+
+# Bootstrap replicates used for the intervals
+BOOTSTRAP_REPLICATES = 400
+
+# Additive per-window totals scaled up to the whole recording
+TOTALS = ["seconds", "syllables", "pause_count", "phonation_time"]
+
+# Functionals reported with confidence intervals
+ESTIMATED_FIELDS = ["pitch_mean", "pitch_std", "energy_mean", "energy_std", "jitter", "shimmer", "speech_rate"]
+
+# Functionals whose interval width drives the sampling density, each with the
+# estimate its width is measured against. Standard deviations are compared
+# with their mean, since a near-zero spread would never converge relatively.
+# Jitter and shimmer are small ratios of noisy quantities and only reported.
+CONVERGENCE_FIELDS = {
+    "pitch_mean": "pitch_mean",
+    "pitch_std": "pitch_mean",
+    "energy_mean": "energy_mean",
+    "energy_std": "energy_mean",
+    "speech_rate": "speech_rate",
+}
+
+
+def _analyse_sampled_window(args: Tuple[np.ndarray, int, bool]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Process-pool worker: summary of one sampled window.
+
+    Returns:
+        Tuple of a (len(STATISTICS), 3) array of count/mean/M2 rows and an
+        array of the TOTALS
+    """
+    chunk, sr, has_previous = args
+    stats, _, frames = _analyse_window(args)
+    pauses = detect_pauses(frames.energy, frames.voiced, frames.frame_step, speech_units=0)
+    syllables = estimate_speech_rate(chunk, sr, center=False)["syllable_count"]
+    moments = np.array([[stats[name].count, stats[name].mean, stats[name].m2] for name in STATISTICS])
+    totals = np.array([
+        len(frames.energy) * frames.frame_step,
+        syllables,
+        pauses["pause_count"],
+        pauses["phonation_time"],
+    ], dtype=np.float64)
+    return moments, totals
+
+
+def _estimate(weights: np.ndarray, moments: np.ndarray, totals: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Weighted estimates of the functionals for one or more weightings.
+
+    Args:
+        weights: (replicates, windows) expansion weights of the sampled windows
+        moments: (windows, len(STATISTICS), 3) count/mean/M2 per window
+        totals: (windows, len(TOTALS)) additive totals per window
+
+    Returns:
+        Estimated functionals and totals, one value per replicate
+    """
+    counts, means, m2s = moments[..., 0], moments[..., 1], moments[..., 2]
+    count = weights @ counts
+    mean = np.divide(weights @ (counts * means), count, out=np.zeros_like(count), where=count > 0)
+    square_sum = weights @ (m2s + counts * means ** 2)
+    variance = np.divide(square_sum, count, out=np.zeros_like(count), where=count > 0) - mean ** 2
+    std = np.sqrt(np.maximum(variance, 0.0))
+    tiny = np.finfo(float).tiny
+
+    index = {name: i for i, name in enumerate(STATISTICS)}
+    scaled = weights @ totals
+    estimates = {
+        "pitch_mean": mean[:, index["pitch"]],
+        "pitch_std": std[:, index["pitch"]],
+        "energy_mean": mean[:, index["energy"]],
+        "energy_std": std[:, index["energy"]],
+        "jitter": mean[:, index["period_delta"]] / np.maximum(mean[:, index["period"]], tiny),
+        "shimmer": mean[:, index["peak_delta"]] / np.maximum(mean[:, index["peak"]], tiny),
+        "speech_rate": scaled[:, 1] / np.maximum(scaled[:, 0], tiny),
+    }
+    estimates.update({name: scaled[:, i] for i, name in enumerate(TOTALS)})
+    return estimates
+
+
+def extract_features_sampled(
+    y: np.ndarray,
+    sr: int,
+    window_seconds: float = ACOUSTIC_SAMPLE_WINDOW_SECONDS,
+    target_width: float = ACOUSTIC_SAMPLING_CI_WIDTH,
+    initial_windows: int = ACOUSTIC_SAMPLING_INITIAL_WINDOWS,
+    parallel: bool = True,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Estimate acoustic features from a stratified sample of windows.
+
+    The recording is split into windows grouped into contiguous strata of
+    equal size. Two windows per stratum are drawn at first; the number per
+    stratum doubles until the width of every CONVERGENCE_FIELDS interval
+    relative to its scale is at most target_width, or all windows have been
+    analysed.
+
+    Args:
+        y: Mono float signal in [-1, 1]
+        sr: Sample rate in Hz
+        window_seconds: Length of the sampled windows in seconds
+        target_width: Largest accepted interval width relative to the estimate
+        initial_windows: Windows sampled in the first round, two per stratum
+        parallel: Analyse windows on the shared process pool
+        seed: Seed for window selection and bootstrap
+
+    Returns:
+        Dictionary with the AudioFeatures functionals, pause_count and
+        articulation_rate, plus "estimation" with the sampled fraction and
+        CONFIDENCE_LEVEL intervals
+    """
+    rng = np.random.default_rng(seed)
+    tasks = window_tasks(y, sr, window_seconds)
+    n_windows = len(tasks)
+    n_strata = max(1, min(n_windows // 2, initial_windows // 2))
+    strata = np.array_split(np.arange(n_windows), n_strata)
+    # A fixed random order per stratum makes each round's sample extend the last
+    orders = [rng.permutation(stratum) for stratum in strata]
+
+    summaries: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    per_stratum = 2
+    while True:
+        chosen: List[np.ndarray] = [order[:per_stratum] for order in orders]
+        pending = [int(i) for picks in chosen for i in picks if int(i) not in summaries]
+        for index, summary in zip(pending, analyse_windows(_analyse_sampled_window, [tasks[i] for i in pending], parallel)):
+            summaries[index] = summary
+
+        sampled = np.concatenate(chosen)
+        moments = np.stack([summaries[int(i)][0] for i in sampled])
+        totals = np.stack([summaries[int(i)][1] for i in sampled])
+        # Each sampled window stands for N_h / n_h windows of its stratum
+        expansion = np.concatenate([np.full(len(picks), len(stratum) / len(picks)) for picks, stratum in zip(chosen, strata)])
+        point = {name: float(values[0]) for name, values in _estimate(expansion[None, :], moments, totals).items()}
+
+        # Stratified bootstrap: resample windows with replacement within each stratum
+        replicate_weights = np.zeros((BOOTSTRAP_REPLICATES, len(sampled)))
+        offset = 0
+        for picks in chosen:
+            draws = rng.integers(0, len(picks), size=(BOOTSTRAP_REPLICATES, len(picks))) + offset
+            np.add.at(replicate_weights, (np.arange(BOOTSTRAP_REPLICATES)[:, None], draws), 1.0)
+            offset += len(picks)
+        replicates = _estimate(replicate_weights * expansion, moments, totals)
+        # Finite population correction: the spread vanishes once every window is analysed
+        correction = np.sqrt(1.0 - len(sampled) / n_windows)
+        tail = (1 - CONFIDENCE_LEVEL) / 2 * 100
+        intervals = {
+            field: [
+                float(point[field] + correction * (v - point[field]))
+                for v in np.percentile(replicates[field], [tail, 100 - tail])
+            ]
+            for field in ESTIMATED_FIELDS
+        }
+        widths = [
+            (intervals[field][1] - intervals[field][0]) / max(abs(point[scale]), np.finfo(float).tiny)
+            for field, scale in CONVERGENCE_FIELDS.items()
+        ]
+        complete = len(sampled) == n_windows
+        if complete or max(widths) <= target_width:
+            break
+        per_stratum *= 2
+
+    logger.info(f"Estimated acoustic features from {len(sampled)} of {n_windows} windows")
+    duration = len(y) / sr
+    features = {field: point[field] for field in ESTIMATED_FIELDS}
+    features["speaking_duration"] = duration
+    features["syllable_count"] = int(round(point["syllables"]))
+    features["pause_count"] = int(round(point["pause_count"]))
+    features["phonation_time"] = point["phonation_time"]
+    features["articulation_rate"] = point["syllables"] / point["phonation_time"] if point["phonation_time"] > 0 else 0.0
+    features["estimation"] = {
+        "sampled_windows": int(len(sampled)),
+        "total_windows": n_windows,
+        "sampled_fraction": len(sampled) / n_windows,
+        "confidence_level": CONFIDENCE_LEVEL,
+        "intervals": intervals,
+    }
+    return features
@@ -0,0 +1,93 @@
+"""
+Per-sentence metrics computed on a spaCy Doc's token arrays.
+
+Token attributes are exported once with doc.to_array, sentence ids come
+from a cumulative sum over sentence starts, and every per-sentence total is
+a bincount over those ids. Syllables are looked up once per distinct word
+and gathered back to the tokens, so no Python loop runs over tokens.
+"""
+
+import logging
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+from app.config import LONG_SENTENCE_WORDS
+from app.services.readability import POLYSYLLABLE_MIN, count_syllables
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def summarize_sentences(
+    words: Sequence[int],
+    alpha_words: Sequence[int],
+    syllables: Sequence[int],
+    polysyllables: Sequence[int],
+    long_sentence_words: int = LONG_SENTENCE_WORDS,
+) -> Dict[str, Any]:
+    """
+    Compact per-sentence metrics from per-sentence totals.
+
+    Args:
+        words: Words (non-punctuation, non-space tokens) per sentence
+        alpha_words: Alphabetic words per sentence, the base for syllable rates
+        syllables: Syllables of the alphabetic words per sentence
+        polysyllables: Words of three or more syllables per sentence
+        long_sentence_words: Word count above which a sentence is flagged as long
+
+    Returns:
+        Dictionary with word_counts, syllables_per_word and complex_word_ratio
+        (one entry per sentence) and long_sentences (indices of long sentences)
+    """
+    words = np.asarray(words, dtype=np.int64)
+    alpha_words = np.asarray(alpha_words, dtype=np.float64)
+    safe_alpha = np.maximum(alpha_words, 1)
+    return {
+        "word_counts": words.tolist(),
+        "syllables_per_word": np.round(np.asarray(syllables) / safe_alpha, 2).tolist(),
+        "complex_word_ratio": np.round(np.asarray(polysyllables) / safe_alpha, 2).tolist(),
+        "long_sentences": np.flatnonzero(words > long_sentence_words).tolist(),
+    }
+
+
+def sentence_metrics(doc, long_sentence_words: int = LONG_SENTENCE_WORDS) -> Dict[str, Any]:
+    """
+    Length and complexity of every sentence of a Doc, without per-token Python loops.
+
+    Args:
+        doc: spaCy Doc with sentence boundaries
+        long_sentence_words: Word count above which a sentence is flagged as long
+
+    Returns:
+        Dictionary as returned by summarize_sentences
+    """
+    from spacy.attrs import IS_ALPHA, IS_PUNCT, IS_SPACE, LOWER, SENT_START
+
+    if len(doc) == 0:
+        return summarize_sentences([], [], [], [], long_sentence_words)
+    arrays = doc.to_array([SENT_START, IS_PUNCT, IS_SPACE, IS_ALPHA, LOWER])
+    starts = arrays[:, 0] == 1
+    starts[0] = True
+    sentence_ids = np.cumsum(starts) - 1
+    n_sentences = int(sentence_ids[-1]) + 1
+
+    is_word = (arrays[:, 1] == 0) & (arrays[:, 2] == 0)
+    is_alpha = arrays[:, 3] == 1
+    alpha_ids = sentence_ids[is_alpha]
+
+    # Syllables once per distinct lowercase word, gathered back to the tokens
+    distinct, inverse = np.unique(arrays[is_alpha, 4], return_inverse=True)
+    table = np.array([count_syllables(doc.vocab.strings[int(key)]) for key in distinct], dtype=np.int64)
+    token_syllables = table[inverse]
+
+    def per_sentence(ids, weights=None):
+        return np.bincount(ids, weights=weights, minlength=n_sentences).astype(np.int64)
+
+    return summarize_sentences(
+        per_sentence(sentence_ids[is_word]),
+        per_sentence(alpha_ids),
+        per_sentence(alpha_ids, token_syllables),
+        per_sentence(alpha_ids, (token_syllables >= POLYSYLLABLE_MIN).astype(np.int64)),
+        long_sentence_words,
+    )
@@ -0,0 +1,90 @@
+"""
+Per-request cache of one decoded recording.
+
+Transcription and acoustic analysis share the decoded samples, so the file
+is decoded once. The short-time power spectrum (25 ms Hann window, 10 ms hop)
+is computed lazily, once, and served as memoized band power for syllable
+detection. Whisper builds its own log-mel spectrogram inside transcribe, and
+YIN pitch, frame energy and voice activity keep their own framing in
+numpy_acoustics, so none of those read the cached spectrum.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config import ANALYSIS_SAMPLE_RATE
+from app.services.numpy_acoustics import frame_signal
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# STFT framing in seconds: 400 samples and a 160-sample hop at 16 kHz
+FRAME_LENGTH = 0.025
+FRAME_STEP = 0.01
+
+# Frames per FFT block, which bounds temporary memory on long recordings
+BLOCK_FRAMES = 8192
+
+
+class SpectralCache:
+    """Lazily computed spectral views of one decoded recording."""
+
+    def __init__(self, y: np.ndarray, sr: int = ANALYSIS_SAMPLE_RATE, center: bool = True):
+        """
+        Args:
+            y: Mono float signal in [-1, 1]
+            sr: Sample rate in Hz
+            center: Reflect-pad so frame i is centred on sample i * hop;
+                pass False for excerpts
+        """
+        self.y = np.asarray(y, dtype=np.float32)
+        self.sr = sr
+        self.center = center
+        self.n_fft = int(round(FRAME_LENGTH * sr))
+        self.hop_length = int(round(FRAME_STEP * sr))
+        self.frame_step = self.hop_length / sr
+        self._power: Optional[np.ndarray] = None
+        self._band_power: Dict[Tuple[float, float], np.ndarray] = {}
+
+    @property
+    def duration(self) -> float:
+        """Recording duration in seconds."""
+        return len(self.y) / self.sr
+
+    @property
+    def power(self) -> np.ndarray:
+        """(frames, n_fft // 2 + 1) float32 power spectrum, computed once."""
+        if self._power is None:
+            y = self.y
+            if self.center:
+                pad = self.n_fft // 2
+                y = np.pad(y, pad, mode="reflect" if len(y) > pad else "constant")
+            frames = frame_signal(y, self.n_fft, self.hop_length, center=False)
+            # Periodic Hann window
+            window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.n_fft) / self.n_fft)).astype(np.float32)
+            power = np.empty((len(frames), self.n_fft // 2 + 1), dtype=np.float32)
+            for start in range(0, len(frames), BLOCK_FRAMES):
+                spectrum = np.fft.rfft(frames[start:start + BLOCK_FRAMES] * window, axis=1)
+                power[start:start + len(spectrum)] = spectrum.real ** 2 + spectrum.imag ** 2
+            self._power = power
+            logger.debug(f"Computed power spectrum of {len(power)} frames")
+        return self._power
+
+    def band_power(self, band: Tuple[float, float]) -> np.ndarray:
+        """
+        Per-frame power summed over a frequency band.
+
+        Args:
+            band: (low, high) band edges in Hz, inclusive
+
+        Returns:
+            float64 band power per frame
+        """
+        band = (float(band[0]), float(band[1]))
+        if band not in self._band_power:
+            freqs = np.fft.rfftfreq(self.n_fft, 1.0 / self.sr)
+            in_band = (freqs >= band[0]) & (freqs <= band[1])
+            self._band_power[band] = self.power[:, in_band].sum(axis=1, dtype=np.float64)
+        return self._band_power[band]
@@ -0,0 +1,181 @@
+"""
+Syllable-nuclei speech rate estimation from audio alone.
+
+Syllable nuclei are found by peak-picking the smoothed intensity of the
+vowel band, following de Jong & Wempe (2009). Needs no transcript, so it
+can run while ASR is skipped or still in progress. Unlike de Jong & Wempe,
+nuclei are not required to be voiced, so the rate needs no pitch tracking.
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from app.services.spectral_cache import FRAME_STEP, SpectralCache
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Band holding most vowel energy, in Hz
+VOWEL_BAND = (300.0, 3000.0)
+
+# Moving-average smoothing of the intensity contour, in seconds
+SMOOTHING = 0.05
+
+# Peaks must be within this many dB of the loudest frame ...
+DYNAMIC_RANGE_DB = 25.0
+# ... and rise this many dB above the dip since the previous peak
+MIN_DIP_DB = 2.0
+
+# Length of the sliding window used for the rate curve, in seconds
+RATE_WINDOW = 5.0
+
+
+def moving_sum(values: np.ndarray, width: int) -> np.ndarray:
+    """
+    Centred moving sum with one value per input value.
+
+    Matches np.convolve(values, np.ones(width), mode="same"), which returns
+    width values instead when values is shorter than the window.
+    """
+    start = (width - 1) // 2
+    return np.convolve(values, np.ones(width), mode="full")[start:start + len(values)]
+
+
+def band_intensity(
+    y: np.ndarray,
+    sr: int,
+    band=VOWEL_BAND,
+    center: bool = True,
+    cache: Optional[SpectralCache] = None,
+) -> np.ndarray:
+    """
+    Per-frame intensity in dB of the given frequency band.
+
+    Args:
+        y: Mono float signal
+        sr: Sample rate in Hz
+        band: (low, high) band edges in Hz
+        center: Pad so frames are centred on multiples of the step; pass
+            False for excerpts, whose padded edges would look like onsets
+        cache: Spectral cache of the same signal, reused instead of
+            computing a new STFT
+
+    Returns:
+        Intensity per frame in dB, one frame per 10 ms
+    """
+    if cache is None:
+        cache = SpectralCache(y, sr, center=center)
+    return 10 * np.log10(cache.band_power(band) + 1e-12)
+
+
+def find_syllable_nuclei(intensity: np.ndarray, frame_step: float) -> np.ndarray:
+    """
+    Pick syllable nuclei from a band intensity contour.
+
+    Args:
+        intensity: Per-frame intensity in dB
+        frame_step: Seconds between frames
+
+    Returns:
+        Frame indices of the detected nuclei
+    """
+    if intensity.size < 3:
+        return np.zeros(0, dtype=np.int64)
+    width = max(1, int(round(SMOOTHING / frame_step)))
+    smooth = moving_sum(intensity, width) / width
+
+    peaks = np.flatnonzero((smooth[1:-1] > smooth[:-2]) & (smooth[1:-1] >= smooth[2:])) + 1
+    peaks = peaks[smooth[peaks] >= smooth.max() - DYNAMIC_RANGE_DB]
+    if peaks.size == 0:
+        return peaks
+
+    # Dip between each peak and the one before it (the first uses the contour
+    # start); the contour is cut at the last peak so its span ends there too
+    dips = np.minimum.reduceat(smooth[:peaks[-1] + 1], np.concatenate(([0], peaks[:-1])))
+    return peaks[smooth[peaks] - dips >= MIN_DIP_DB]
+
+
+def estimate_speech_rate(
+    y: np.ndarray,
+    sr: int,
+    curve_step: float = 1.0,
+    center: bool = True,
+    cache: Optional[SpectralCache] = None,
+    n_bins: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Estimate syllables per second and a windowed rate curve.
+
+    Args:
+        y: Mono float signal in [-1, 1]
+        sr: Sample rate in Hz
+        curve_step: Seconds between points of the rate curve
+        center: Centre the intensity frames; pass False for excerpts
+        cache: Spectral cache of the same signal, if one is available
+        n_bins: Points of the rate curve; defaults to one per curve_step of
+            10 ms frames, the grid downsample_frames uses for the other
+            time series
+
+    Returns:
+        Dictionary with syllable_count, speech_rate (syllables per second)
+        and rate_curve (syllables per second over a sliding RATE_WINDOW,
+        one float32 value per curve_step)
+    """
+    duration = len(y) / sr
+    intensity = band_intensity(y, sr, center=center, cache=cache)
+    nuclei = find_syllable_nuclei(intensity, FRAME_STEP)
+
+    per_bin = max(1, int(round(curve_step / FRAME_STEP)))
+    if n_bins is None:
+        n_bins = -(-len(intensity) // per_bin)
+    n_bins = max(1, n_bins)
+    counts = np.bincount(np.minimum(nuclei // per_bin, n_bins - 1), minlength=n_bins).astype(np.float64)
+    width = max(1, int(round(RATE_WINDOW / curve_step)))
+    coverage = moving_sum(np.ones(n_bins), width) * curve_step
+    rate_curve = moving_sum(counts, width) / coverage
+
+    return {
+        "syllable_count": int(nuclei.size),
+        "speech_rate": nuclei.size / duration if duration > 0 else 0.0,
+        "rate_curve": rate_curve.astype(np.float32),
+    }
+
+
+def apply_speech_rate(
+    features: Dict[str, Any],
+    y: np.ndarray,
+    sr: int,
+    cache: Optional[SpectralCache] = None,
+) -> Dict[str, Any]:
+    """
+    Fill the rate fields of an acoustic feature dictionary from syllable nuclei.
+
+    Sets speech_rate and syllable_count, recomputes articulation_rate over
+    the phonation time when pause statistics are present and adds the rate
+    curve to the time series when one is present, with as many points as
+    the time series' other curves.
+
+    Args:
+        features: Acoustic features from either engine, updated in place
+        y: Mono float signal the features were extracted from
+        sr: Sample rate in Hz
+        cache: Spectral cache of the same signal, if one is available
+
+    Returns:
+        The updated features dictionary
+    """
+    timeseries = features.get("timeseries")
+    curve_step = timeseries["window"] if timeseries else 1.0
+    n_bins = len(timeseries["pitch"]) if timeseries and "pitch" in timeseries else None
+    rate = estimate_speech_rate(y, sr, curve_step=curve_step, cache=cache, n_bins=n_bins)
+
+    features["speech_rate"] = rate["speech_rate"]
+    features["syllable_count"] = rate["syllable_count"]
+    phonation_time = features.get("phonation_time")
+    if phonation_time:
+        features["articulation_rate"] = rate["syllable_count"] / phonation_time
+    if timeseries:
+        timeseries["speech_rate"] = np.round(rate["rate_curve"].astype(np.float64), 4).tolist()
+    return features
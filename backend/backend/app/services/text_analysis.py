@@ -1,50 +1,155 @@
 import logging
 import re
 import importlib.util
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set
+
+from app.config import SPACY_MODEL, TEXT_BATCH_SIZE, TEXT_N_PROCESS
+from app.services.filler_words import FILLER_WORDS, content_uses, find_fillers
+from app.services.readability import ReadabilityCounts
+from app.services.repeated_phrases import find_repeated_phrases
+from app.services.sentence_metrics import sentence_metrics
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-# Check if spaCy is available
+# Check if spaCy is available; the model itself is loaded on first use
 spacy_available = importlib.util.find_spec("spacy") is not None
-if spacy_available:
-    try:
-        import spacy
-        # Try to load spaCy model
+
+# Components analyze_text never reads
+SPACY_EXCLUDE = ["parser", "ner", "lemmatizer"]
+
+_nlp = None
+
+
+def get_nlp():
+    """
+    Get the shared spaCy pipeline, loading it on first use.
+    
+    The parser, NER and lemmatizer are excluded and sentence boundaries
+    come from the rule-based sentencizer, which keeps loading time, memory
+    and per-transcript latency low.
+    
+    Returns:
+        spaCy Language object, or None if spaCy or the model is unavailable
+    """
+    global _nlp, spacy_available
+    if _nlp is None and spacy_available:
         try:
-            nlp = spacy.load("en_core_web_sm")
-            logger.info("Successfully loaded spaCy model")
+            import spacy
+            _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            _nlp.add_pipe("sentencizer")
+            logger.info(f"Loaded spaCy model {SPACY_MODEL} with components: {', '.join(_nlp.pipe_names)}")
         except Exception as e:
             logger.error(f"Error loading spaCy model: {str(e)}")
             spacy_available = False
-    except ImportError:
-        spacy_available = False
-        logger.warning("spaCy import failed despite module being found")
+    return _nlp
 
-# Check if textstat is available
-textstat_available = importlib.util.find_spec("textstat") is not None
-if textstat_available:
-    try:
-        import textstat
-        logger.info("Successfully imported textstat")
-    except ImportError:
-        textstat_available = False
-        logger.warning("textstat import failed despite module being found")
+def segment_starts(text: str, segments: List[Dict[str, Any]]) -> List[int]:
+    """
+    Character offsets in text where each Whisper segment begins.
+    
+    Segments are located in order; ones whose text cannot be found are skipped.
+    """
+    starts = []
+    cursor = 0
+    for segment in segments:
+        segment_text = segment.get("text", "").strip()
+        if not segment_text:
+            continue
+        start = text.find(segment_text, cursor)
+        if start >= 0:
+            starts.append(start)
+            cursor = start + len(segment_text)
+    return starts
 
-# Common filler words to detect
-FILLER_WORDS = [
-    "um", "uh", "ah", "er", "like", "you know", "so", "actually", 
-    "basically", "literally", "honestly", "right", "okay", "well",
-]
+def _sentence_starts(text: str) -> Set[int]:
+    """Offsets of the first character of each punctuation-delimited sentence."""
+    return {
+        match.start() + len(match.group()) - len(match.group().lstrip())
+        for match in re.finditer(r'[^.!?]+', text) if match.group().strip()
+    }
 
-def analyze_text(text: str) -> Dict[str, Any]:
+def _parse(nlp, text: str, segments: Optional[List[Dict[str, Any]]]):
+    """Run the pipeline, adding segment starts to the sentencizer's boundaries."""
+    doc = nlp(text)
+    boundaries = set(segment_starts(text, segments)) if segments else set()
+    for token in doc:
+        if token.idx in boundaries:
+            token.is_sent_start = True
+    return doc
+
+def _default_analysis(text: str, error: Exception) -> Dict[str, Any]:
+    """Default analysis returned when analysis of a text fails."""
+    return {
+        "word_count": len(text.split()),
+        "sentence_count": len(re.split(r'[.!?]+', text)),
+        "filler_words": {},
+        "readability_scores": {
+            "flesch_reading_ease": 70.0,
+            "flesch_kincaid_grade": 8.0,
+            "gunning_fog": 10.0,
+            "smog_index": 9.0,
+        },
+        "average_words_per_sentence": 20.0,
+        "speaking_rate": 150.0,
+        "error": str(error)
+    }
+
+def _analyze_doc(doc, filler_lexicon: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Text analysis metrics of a processed spaCy Doc."""
+    text = doc.text
+    
+    # Count words and sentences
+    word_count = len([token for token in doc if not token.is_punct and not token.is_space])
+    sentence_count = len(list(doc.sents))
+    
+    # Detect filler words in one pass, with offsets for highlighting; the
+    # Doc's tags rule out content uses such as "I like it"
+    fillers = find_fillers(text, filler_lexicon, skip=content_uses(doc))
+    
+    # Detect repeated phrases ("at the end of the day") in one rolling-hash scan
+    repeated_phrases = find_repeated_phrases(text)
+    
+    # Calculate readability scores from the same tokens and sentences
+    readability_scores = ReadabilityCounts.from_doc(doc).scores()
+    
+    # Calculate words per sentence, overall and for each sentence
+    avg_words_per_sentence = word_count / max(1, sentence_count)
+    sentences = sentence_metrics(doc)
+    
+    # Estimate speaking rate (words per minute)
+    # Assuming average speaking rate, this would be refined with actual audio duration
+    speaking_rate = 150.0  # Default estimate
+    
+    result = {
+        "word_count": word_count,
+        "sentence_count": sentence_count,
+        "filler_words": fillers["counts"],
+        "filler_offsets": fillers["offsets"],
+        "repeated_phrases": repeated_phrases,
+        "readability_scores": readability_scores,
+        "average_words_per_sentence": avg_words_per_sentence,
+        "sentence_metrics": sentences,
+        "speaking_rate": speaking_rate,
+    }
+    
+    return result
+
+def analyze_text(
+    text: str,
+    filler_lexicon: Optional[Iterable[str]] = None,
+    segments: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
     """
     Analyze text for clarity, fluency, filler words, and readability metrics.
-    Uses spaCy and textstat if available, or a fallback method for testing.
+    Uses spaCy if available, or a fallback method for testing.
     
     Args:
         text: The transcript text to analyze
+        filler_lexicon: Custom filler words, e.g. a user's own list;
+            defaults to FILLER_WORDS
+        segments: Whisper segments of the transcript; when given, each one
+            also starts a sentence, besides the sentencizer's boundaries
         
     Returns:
         Dictionary containing various text analysis metrics
@@ -52,83 +157,40 @@ def analyze_text(text: str) -> Dict[str, Any]:
     logger.info(f"Analyzing text ({len(text)} characters)")
     
     try:
-        # If spaCy and textstat are available, use them
-        if spacy_available and textstat_available:
-            logger.info("Using spaCy and textstat for text analysis")
+        # If spaCy is available, use it
+        nlp = get_nlp()
+        if nlp is not None:
+            logger.info("Using spaCy for text analysis")
             
             # Process text with spaCy
-            doc = nlp(text)
-            
-            # Count words and sentences
-            word_count = len([token for token in doc if not token.is_punct and not token.is_space])
-            sentence_count = len(list(doc.sents))
-            
-            # Detect filler words
-            filler_counts = {}
-            text_lower = text.lower()
-            for filler in FILLER_WORDS:
-                # Use word boundaries for more accurate matching
-                pattern = r'\\b' + re.escape(filler) + r'\\b'
-                count = len(re.findall(pattern, text_lower))
-                if count > 0:
-                    filler_counts[filler] = count
-            
-            # Calculate readability scores
-            readability_scores = {
-                "flesch_reading_ease": textstat.flesch_reading_ease(text),
-                "flesch_kincaid_grade": textstat.flesch_kincaid_grade(text),
-                "gunning_fog": textstat.gunning_fog(text),
-                "smog_index": textstat.smog_index(text),
-            }
-            
-            # Calculate words per sentence
-            avg_words_per_sentence = word_count / max(1, sentence_count)
-            
-            # Estimate speaking rate (words per minute)
-            # Assuming average speaking rate, this would be refined with actual audio duration
-            speaking_rate = 150.0  # Default estimate
-            
-            result = {
-                "word_count": word_count,
-                "sentence_count": sentence_count,
-                "filler_words": filler_counts,
-                "readability_scores": readability_scores,
-                "average_words_per_sentence": avg_words_per_sentence,
-                "speaking_rate": speaking_rate,
-            }
-            
-            logger.info("Text analysis completed successfully using spaCy and textstat")
+            doc = _parse(nlp, text, segments)
+
+            result = _analyze_doc(doc, filler_lexicon)
+            logger.info("Text analysis completed successfully using spaCy")
             return result
             
         else:
-            # Fallback for testing when spaCy or textstat are not available
-            logger.warning("spaCy or textstat not available, using fallback text analysis")
+            # Fallback for testing when spaCy or its model is not available
+            logger.warning("spaCy not available, using fallback text analysis")
             
             # Simple word and sentence counting
             words = text.split()
             word_count = len(words)
             
-            # Very simple sentence counting by punctuation
-            sentences = re.split(r'[.!?]+', text)
-            sentences = [s for s in sentences if s.strip()]
-            sentence_count = len(sentences)
+            # Sentences end at punctuation and at Whisper segment boundaries
+            boundaries = _sentence_starts(text)
+            if segments:
+                boundaries.update(segment_starts(text, segments))
+            sentence_count = len(boundaries)
             
-            # Simple filler word detection
-            filler_counts = {}
-            text_lower = text.lower()
-            for filler in FILLER_WORDS:
-                # Simple string search
-                count = text_lower.count(" " + filler + " ")
-                if count > 0:
-                    filler_counts[filler] = count
+            # Detect filler words in one pass, with offsets for highlighting
+            fillers = find_fillers(text, filler_lexicon)
             
-            # Default readability scores
-            readability_scores = {
-                "flesch_reading_ease": 70.0,
-                "flesch_kincaid_grade": 8.0,
-                "gunning_fog": 10.0,
-                "smog_index": 9.0,
-            }
+            # Detect repeated phrases
+            repeated_phrases = find_repeated_phrases(text)
+            
+            # Calculate readability scores
+            readability_scores = ReadabilityCounts.from_text(text).scores()
             
             # Calculate words per sentence
             avg_words_per_sentence = word_count / max(1, sentence_count)
@@ -139,7 +201,9 @@ def analyze_text(text: str) -> Dict[str, Any]:
             result = {
                 "word_count": word_count,
                 "sentence_count": sentence_count,
-                "filler_words": filler_counts,
+                "filler_words": fillers["counts"],
+                "filler_offsets": fillers["offsets"],
+                "repeated_phrases": repeated_phrases,
                 "readability_scores": readability_scores,
                 "average_words_per_sentence": avg_words_per_sentence,
                 "speaking_rate": speaking_rate,
@@ -150,18 +214,43 @@ def analyze_text(text: str) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Error analyzing text: {str(e)}")
-        # Return default analysis in case of error
-        return {
-            "word_count": len(text.split()),
-            "sentence_count": len(re.split(r'[.!?]+', text)),
-            "filler_words": {},
-            "readability_scores": {
-                "flesch_reading_ease": 70.0,
-                "flesch_kincaid_grade": 8.0,
-                "gunning_fog": 10.0,
-                "smog_index": 9.0,
-            },
-            "average_words_per_sentence": 20.0,
-            "speaking_rate": 150.0,
-            "error": str(e)
-        }
+        return _default_analysis(text, e)
+
+def analyze_texts(
+    texts: Iterable[str],
+    batch_size: int = TEXT_BATCH_SIZE,
+    n_process: int = TEXT_N_PROCESS,
+    filler_lexicon: Optional[Iterable[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze many transcripts, streaming them through spaCy in batches.
+    
+    Meant for bulk jobs such as re-scoring stored transcripts. Texts are
+    consumed lazily and results are yielded in input order; a text that
+    fails gets the default analysis with an "error" entry, as in
+    analyze_text.
+    
+    Args:
+        texts: Transcript texts
+        batch_size: Texts per nlp.pipe batch
+        n_process: spaCy worker processes; -1 uses every core
+        filler_lexicon: Custom filler words applied to every text
+        
+    Returns:
+        Iterator of analysis dictionaries, one per text
+    """
+    nlp = get_nlp()
+    if nlp is None:
+        for text in texts:
+            yield analyze_text(text, filler_lexicon)
+        return
+    
+    count = 0
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        count += 1
+        try:
+            yield _analyze_doc(doc, filler_lexicon)
+        except Exception as e:
+            logger.error(f"Error analyzing text {count}: {str(e)}")
+            yield _default_analysis(doc.text, e)
+    logger.info(f"Analyzed {count} texts in batches of {batch_size} with {n_process} process(es)")
@@ -4,6 +4,9 @@ from pathlib import Path
 import importlib.util
 import wave
 import datetime
+from typing import Dict, Any, List, Optional
+
+from app.services.spectral_cache import SpectralCache
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -43,17 +46,51 @@ def get_audio_duration(audio_path) -> float:
         logger.error(f"Error getting audio duration: {str(e)}")
         return 0.0
 
-def transcribe_audio(audio_path) -> str:
+def _segments(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Keep the start, end and text of each Whisper segment, and its word timestamps if any."""
+    segments = []
+    for segment in result.get("segments", []):
+        kept = {"start": float(segment["start"]), "end": float(segment["end"]), "text": segment["text"].strip()}
+        if segment.get("words"):
+            kept["words"] = [
+                {"start": float(word["start"]), "end": float(word["end"]), "word": word["word"].strip()}
+                for word in segment["words"]
+            ]
+        segments.append(kept)
+    return segments
+
+def transcribe_audio(audio_path, cache: Optional[SpectralCache] = None) -> str:
     """
     Transcribe speech in audio file to text using OpenAI Whisper if available,
     or a fallback method for testing.
     
     Args:
         audio_path: Path to the audio file to transcribe (str or Path)
+        cache: Spectral cache of the decoded 16 kHz recording, shared with
+            acoustic analysis so the file is decoded only once
         
     Returns:
         Transcribed text as a string
     """
+    return transcribe_audio_with_segments(audio_path, cache)["text"]
+
+def transcribe_audio_with_segments(audio_path, cache: Optional[SpectralCache] = None) -> Dict[str, Any]:
+    """
+    Transcribe speech in an audio file, keeping Whisper's segments.
+    
+    Segments carry sentence-like boundaries and timestamps that later
+    stages use instead of re-segmenting the text, and word timestamps for
+    the pause histogram. The fallback transcript has no segments.
+    
+    Args:
+        audio_path: Path to the audio file to transcribe (str or Path)
+        cache: Spectral cache of the decoded 16 kHz recording, shared with
+            acoustic analysis so the file is decoded only once
+        
+    Returns:
+        Dictionary with "text" and "segments" (start, end in seconds, text
+        and "words" with their own start and end)
+    """
     # Convert to Path object if it's a string
     if isinstance(audio_path, str):
         audio_path = Path(audio_path)
@@ -71,7 +108,7 @@ def transcribe_audio(audio_path) -> str:
     logger.info(f"Audio file size: {file_size_mb:.2f} MB")
     
     # Get audio duration
-    duration = get_audio_duration(audio_path)
+    duration = get_audio_duration(audio_path) if cache is None else cache.duration
     logger.info(f"Audio duration: {datetime.timedelta(seconds=duration)}")
     
     try:
@@ -82,14 +119,16 @@ def transcribe_audio(audio_path) -> str:
                 model = whisper.load_model(WHISPER_MODEL)
                 logger.info(f"Model loaded successfully")
                 logger.info(f"About to transcribe: {str(audio_path)}")
-                result = model.transcribe(str(audio_path))
+                # Whisper accepts the already decoded 16 kHz samples in place of the file
+                audio = cache.y if cache is not None else str(audio_path)
+                result = model.transcribe(audio, word_timestamps=True)
                 transcript = result["text"]
                 # Ensure we return a string
                 if isinstance(transcript, list):
                     transcript = " ".join(str(item) for item in transcript)
                 transcript = str(transcript).strip()
                 logger.info(f"Successfully transcribed audio with Whisper ({len(transcript)} characters)")
-                return transcript
+                return {"text": transcript, "segments": _segments(result)}
             except Exception as e:
                 logger.error(f"Whisper transcription failed: {str(e)}")
                 logger.warning("Falling back to fallback transcription method")
@@ -110,7 +149,7 @@ def transcribe_audio(audio_path) -> str:
         )
         
         logger.info(f"Generated fallback transcript ({len(transcript)} characters)")
-        return transcript
+        return {"text": transcript, "segments": []}
         
     except Exception as e:
         logger.error(f"Error transcribing audio: {str(e)}")
@@ -0,0 +1,240 @@
+"""
+Windowed acoustic extraction for long recordings.
+
+The recording is cut into fixed windows of whole frames that are analysed
+in parallel on a process pool. Each window returns mergeable statistics,
+which are combined so the functionals equal a single pass over the audio.
+Only one window of frames per worker is held at a time.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import ACOUSTIC_MAX_WORKERS, ACOUSTIC_WINDOW_SECONDS
+from app.services.numpy_acoustics import (
+    FRAME_LENGTH,
+    FRAME_STEP,
+    FrameFeatures,
+    compute_frame_features,
+    downsample_frames,
+    timeseries_to_json,
+)
+from app.services.pause_detection import detect_pauses
+from app.services.running_stats import RunningStats
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Statistics kept per window; jitter and shimmer are ratios of these means
+STATISTICS = ["pitch", "energy", "period", "period_delta", "peak", "peak_delta"]
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=ACOUSTIC_MAX_WORKERS)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared process pool if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def frame_statistics(frames: FrameFeatures, has_previous: bool) -> Tuple[Dict[str, RunningStats], int]:
+    """
+    Mergeable statistics of a window of frames.
+
+    Args:
+        frames: Frames of the window, preceded by the last frame of the
+            previous window when has_previous is set
+        has_previous: Whether the first frame belongs to the previous window
+            and only serves to pair with this window's first frame
+
+    Returns:
+        Tuple of (statistics by name, voiced segment onsets in the window)
+    """
+    voiced = frames.voiced
+    periods = np.divide(1.0, frames.f0, out=np.zeros_like(frames.f0), where=voiced)
+    pairs = voiced[1:] & voiced[:-1]
+    rising = voiced[1:] & ~voiced[:-1]
+    own = slice(1, None) if has_previous else slice(None)
+    own_voiced = voiced[own]
+    onsets = int(np.count_nonzero(rising)) + int(not has_previous and voiced.size > 0 and voiced[0])
+
+    stats = {
+        "pitch": RunningStats.from_values(frames.f0[own][own_voiced]),
+        "energy": RunningStats.from_values(frames.energy[own]),
+        "period": RunningStats.from_values(periods[own][own_voiced]),
+        "period_delta": RunningStats.from_values(np.abs(np.diff(periods))[pairs]),
+        "peak": RunningStats.from_values(frames.peak[own][own_voiced]),
+        "peak_delta": RunningStats.from_values(np.abs(np.diff(frames.peak))[pairs]),
+    }
+    return stats, onsets
+
+
+def window_tasks(y: np.ndarray, sr: int, window_seconds: float) -> List[Tuple[np.ndarray, int, bool]]:
+    """
+    Cut a signal into windows of whole frames for _analyse_window.
+
+    Frames follow the centred framing of the single-pass engine. Every window
+    after the first also carries the previous window's last frame.
+
+    Args:
+        y: Mono float signal
+        sr: Sample rate in Hz
+        window_seconds: Window length in seconds
+
+    Returns:
+        List of (samples, sample rate, has_previous) tasks in time order
+    """
+    length = int(round(FRAME_LENGTH * sr))
+    hop = int(round(FRAME_STEP * sr))
+    y = np.asarray(y, dtype=np.float32)
+    # Positions are in the zero-padded signal of centred framing, but only
+    # the windows at either end are padded, so no copy of y is made
+    pad = length // 2
+    n_frames = 1 + (max(len(y) + 2 * pad, length) - length) // hop
+    per_window = max(1, int(round(window_seconds / FRAME_STEP)))
+
+    tasks = []
+    for first in range(0, n_frames, per_window):
+        last = min(first + per_window, n_frames)
+        start = max(first - 1, 0) * hop - pad
+        end = (last - 1) * hop + length - pad
+        chunk = y[max(start, 0):min(end, len(y))]
+        if start < 0 or end > len(y):
+            chunk = np.pad(chunk, (max(-start, 0), max(end - len(y), 0)))
+        tasks.append((chunk, sr, first > 0))
+    return tasks
+
+
+def analyse_windows(worker: Callable, tasks: List[Any], parallel: bool = True) -> List[Any]:
+    """Run a worker over window tasks, on the shared process pool if parallel."""
+    if parallel and len(tasks) > 1:
+        return list(get_executor().map(worker, tasks))
+    return [worker(task) for task in tasks]
+
+
+def _analyse_window(args: Tuple[np.ndarray, int, bool]) -> Tuple[Dict[str, RunningStats], int, FrameFeatures]:
+    """Process-pool worker: statistics and compact frames of one window."""
+    chunk, sr, has_previous = args
+    frames = compute_frame_features(chunk, sr, center=False)
+    stats, onsets = frame_statistics(frames, has_previous)
+    own = slice(1, None) if has_previous else slice(None)
+    compact = FrameFeatures(
+        f0=frames.f0[own].astype(np.float32),
+        energy=frames.energy[own].astype(np.float32),
+        peak=frames.peak[own].astype(np.float32),
+        voiced=frames.voiced[own],
+        frame_step=frames.frame_step,
+    )
+    return stats, onsets, compact
+
+
+def summarize_statistics(stats: Dict[str, RunningStats], onsets: int, duration: float) -> Dict[str, Any]:
+    """
+    Turn merged statistics into the AudioFeatures functionals.
+
+    Args:
+        stats: Statistics by name, as returned by frame_statistics
+        onsets: Voiced segment onsets
+        duration: Recording duration in seconds
+
+    Returns:
+        Dictionary containing the acoustic features
+    """
+    tiny = np.finfo(float).tiny
+    return {
+        "pitch_mean": stats["pitch"].mean,
+        "pitch_std": stats["pitch"].std,
+        "energy_mean": stats["energy"].mean,
+        "energy_std": stats["energy"].std,
+        "jitter": stats["period_delta"].mean / max(stats["period"].mean, tiny) if stats["period_delta"].count else 0.0,
+        "shimmer": stats["peak_delta"].mean / max(stats["peak"].mean, tiny) if stats["peak_delta"].count else 0.0,
+        "speaking_duration": duration,
+        "speech_rate": onsets / duration if duration > 0 else 0.0,
+    }
+
+
+def windowed_frames(
+    y: np.ndarray,
+    sr: int,
+    window_seconds: float = ACOUSTIC_WINDOW_SECONDS,
+    parallel: bool = True,
+) -> Tuple[Dict[str, RunningStats], int, FrameFeatures]:
+    """
+    Analyse a signal window by window and merge the per-window results.
+
+    Args:
+        y: Mono float signal in [-1, 1]
+        sr: Sample rate in Hz
+        window_seconds: Window length in seconds
+        parallel: Analyse windows on the shared process pool
+
+    Returns:
+        Tuple of (merged statistics by name, voiced segment onsets, compact
+        frames of the whole signal)
+    """
+    tasks = window_tasks(y, sr, window_seconds)
+    logger.info(f"Extracting acoustic features over {len(tasks)} windows of {window_seconds:.0f}s")
+    results = analyse_windows(_analyse_window, tasks, parallel)
+
+    merged = {
+        name: RunningStats.merge_all(stats[name] for stats, _, _ in results)
+        for name in STATISTICS
+    }
+    onsets = sum(window_onsets for _, window_onsets, _ in results)
+    frames = FrameFeatures(
+        f0=np.concatenate([part.f0 for _, _, part in results]),
+        energy=np.concatenate([part.energy for _, _, part in results]),
+        peak=np.concatenate([part.peak for _, _, part in results]),
+        voiced=np.concatenate([part.voiced for _, _, part in results]),
+        frame_step=FRAME_STEP,
+    )
+    return merged, onsets, frames
+
+
+def extract_features_windowed(
+    y: np.ndarray,
+    sr: int,
+    window_seconds: float = ACOUSTIC_WINDOW_SECONDS,
+    timeseries_window: Optional[float] = None,
+    parallel: bool = True,
+) -> Dict[str, Any]:
+    """
+    Extract acoustic features window by window and merge the results.
+
+    Windows hold whole frames of the centred framing used by the single-pass
+    engine, plus the previous window's last frame so frame-to-frame measures
+    cross window edges. The merged functionals therefore equal
+    extract_features_numpy up to floating-point rounding.
+
+    Args:
+        y: Mono float signal in [-1, 1]
+        sr: Sample rate in Hz
+        window_seconds: Window length in seconds
+        timeseries_window: If given, also return downsampled time series
+        parallel: Analyse windows on the shared process pool
+
+    Returns:
+        Dictionary with the same fields as extract_features_numpy plus the
+        merged "statistics" for combining with other recordings later
+    """
+    merged, onsets, frames = windowed_frames(y, sr, window_seconds, parallel)
+    duration = len(y) / sr
+    features = summarize_statistics(merged, onsets, duration)
+    features.update(detect_pauses(frames.energy, frames.voiced, frames.frame_step, onsets))
+    features["statistics"] = {name: merged[name].to_dict() for name in STATISTICS}
+    if timeseries_window:
+        features["timeseries"] = timeseries_to_json(downsample_frames(frames, timeseries_window), timeseries_window)
+    return features
@@ -1,8 +1,19 @@
+import asyncio
 import unittest
+from unittest import mock
+
+from app.services import llm_feedback
+from app.services.feedback_cache import FeedbackCache
 from app.services.llm_feedback import generate_llm_feedback
 
 class TestLLMFeedback(unittest.TestCase):
     def setUp(self):
+        # Keep the test off the shared cache in data/feedback_cache.db
+        self.cache = FeedbackCache(":memory:")
+        self.addCleanup(self.cache.close)
+        patcher = mock.patch.object(llm_feedback, "get_feedback_cache", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.transcript = "Hello, this is a test speech. Um, you know, it has some filler words."
         self.text_metrics = {
             "word_count": 15,
@@ -24,7 +35,7 @@ class TestLLMFeedback(unittest.TestCase):
         }
 
     def test_generate_llm_feedback_keys(self):
-        result = generate_llm_feedback(self.transcript, self.text_metrics, self.acoustic_features)
+        result = asyncio.run(generate_llm_feedback(self.transcript, self.text_metrics, self.acoustic_features))
         expected_keys = {"summary_feedback", "text_suggestions", "voice_suggestions", "overall_score", "recommendations"}
         self.assertTrue(set(result.keys()) == expected_keys)
 
@@ -7,23 +7,56 @@ class TextAnalysis(BaseModel):
     word_count: int = Field(..., description="Total number of words in the transcript")
     sentence_count: int = Field(..., description="Number of sentences in the transcript")
     filler_words: Dict[str, int] = Field(..., description="Count of filler words (e.g., 'um', 'uh')")
+    filler_offsets: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Each filler occurrence with its start and end character offsets in the transcript"
+    )
+    repeated_phrases: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Phrases of two to six words said repeatedly, with counts and character offsets"
+    )
+    keywords: Optional[List[Dict[str, Any]]] = Field(
+        None, description="TF-IDF keywords of the session against the user's earlier sessions"
+    )
+    overused_words: Optional[List[Dict[str, Any]]] = Field(
+        None, description="Words used far more often than in the user's earlier sessions"
+    )
     readability_scores: Dict[str, float] = Field(..., description="Various readability metrics")
     average_words_per_sentence: float = Field(..., description="Average words per sentence")
+    sentence_metrics: Optional[Dict[str, List[Any]]] = Field(
+        None, description="Per-sentence word counts, syllables per word and complex word ratios, and indices of long sentences"
+    )
     speaking_rate: float = Field(..., description="Words per minute")
 
 
 class AudioFeatures(BaseModel):
-    """Model for acoustic features extracted from audio."""
-    pitch_mean: float = Field(..., description="Mean pitch value")
-    pitch_std: float = Field(..., description="Standard deviation of pitch")
-    energy_mean: float = Field(..., description="Mean energy value")
-    energy_std: float = Field(..., description="Standard deviation of energy")
-    jitter: float = Field(..., description="Jitter measurement")
-    shimmer: float = Field(..., description="Shimmer measurement")
-    speaking_duration: float = Field(..., description="Total speaking duration in seconds")
-    speech_rate: float = Field(..., description="Rate of speech")
-    articulation_rate: Optional[float] = Field(None, description="Rate of articulation")
+    """Model for acoustic features extracted from audio; fields outside a ?fields= projection are None."""
+    pitch_mean: Optional[float] = Field(None, description="Mean pitch value")
+    pitch_std: Optional[float] = Field(None, description="Standard deviation of pitch")
+    energy_mean: Optional[float] = Field(
+        None, description="Mean energy: loudness in sone with openSMILE eGeMAPS, RMS amplitude otherwise"
+    )
+    energy_std: Optional[float] = Field(None, description="Standard deviation of energy, in the units of energy_mean")
+    jitter: Optional[float] = Field(None, description="Jitter measurement, relative period perturbation")
+    shimmer: Optional[float] = Field(None, description="Shimmer measurement, relative amplitude perturbation (ratio)")
+    speaking_duration: Optional[float] = Field(None, description="Total speaking duration in seconds")
+    speech_rate: Optional[float] = Field(None, description="Syllables per second over the whole recording")
+    articulation_rate: Optional[float] = Field(None, description="Syllables per second excluding pauses")
+    syllable_count: Optional[int] = Field(None, description="Number of detected syllable nuclei")
     pause_count: Optional[int] = Field(None, description="Number of pauses")
+    longest_pause: Optional[float] = Field(None, description="Longest pause in seconds")
+    total_pause_time: Optional[float] = Field(None, description="Total time spent in pauses in seconds")
+    phonation_time: Optional[float] = Field(None, description="Speaking time excluding pauses in seconds")
+    pause_histogram: Optional[Dict[str, List[float]]] = Field(
+        None, description="Pause counts per duration bin with the bins' lower edges in seconds"
+    )
+    statistics: Optional[Dict[str, Dict[str, float]]] = Field(
+        None, description="Mergeable count/mean/M2 statistics from windowed extraction"
+    )
+    estimation: Optional[Dict[str, Any]] = Field(
+        None, description="Sampling details and confidence intervals when features were estimated from a sample"
+    )
+    timeseries: Optional[Dict[str, Any]] = Field(
+        None, description="Per-window pitch, energy, voicing and speech rate series with their window length in seconds"
+    )
 
 
 class LLMFeedback(BaseModel):
@@ -35,9 +68,18 @@ class LLMFeedback(BaseModel):
     overall_score: Optional[float] = Field(None, description="Overall score if applicable")
 
 
+class Analytics(BaseModel):
+    """Model for time-series analytics behind the dashboard charts."""
+    bin_seconds: float = Field(..., description="Width of each time bin in seconds")
+    words_per_minute: List[float] = Field(..., description="Windowed speaking pace per time bin")
+    fillers: Dict[str, Any] = Field(..., description="Filler counts per time bin, in total and for each filler")
+    pauses: Dict[str, List[float]] = Field(..., description="Pause length histogram: bucket lower edges in seconds and counts")
+
+
 class UploadAudioResponse(BaseModel):
     """Complete response model for audio upload endpoint."""
     transcript: str = Field(..., description="Full transcript of the speech")
     text_analysis: TextAnalysis = Field(..., description="Text analysis results")
     audio_features: AudioFeatures = Field(..., description="Acoustic features extracted from audio")
     llm_feedback: LLMFeedback = Field(..., description="LLM-generated feedback")
+    analytics: Optional[Analytics] = Field(None, description="Pace curve, filler density and pause histogram")
@@ -0,0 +1,74 @@
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.analytics import compute_analytics
+from app.services.filler_words import find_fillers
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "text": "Um so this is the plan"},
+    {"start": 4.5, "end": 9.0, "text": "we start with the basics"},
+    {"start": 11.0, "end": 14.0, "text": "um and then we grow"},
+]
+TRANSCRIPT = " ".join(segment["text"] for segment in SEGMENTS)
+
+
+def test_bins_words_and_fillers_in_time():
+    fillers = find_fillers(TRANSCRIPT)["offsets"]
+    analytics = compute_analytics(TRANSCRIPT, SEGMENTS, fillers, duration=15.0, bin_seconds=5.0, pace_window=5.0)
+
+    # Words are spread evenly over their segment: "we" starts at 4.5 s, "start" after 5 s
+    assert analytics["words_per_minute"] == [7 * 12, 4 * 12, 5 * 12]
+    assert analytics["fillers"]["total"] == [2, 0, 1]
+    assert analytics["fillers"]["by_filler"] == {"um": [1, 0, 1], "so": [1, 0, 0]}
+    # Gaps of 0.5 s and 2 s between segments
+    assert analytics["pauses"]["edges"] == [0.25, 0.5, 1.0, 2.0, 4.0]
+    assert analytics["pauses"]["counts"] == [0, 1, 0, 1, 0]
+
+
+def test_word_timestamps_take_precedence():
+    segments = [{
+        "start": 0.0, "end": 3.0, "text": "one two three",
+        "words": [{"start": 0.0, "end": 0.4, "word": "one"}, {"start": 0.5, "end": 0.9, "word": "two"},
+                  {"start": 2.4, "end": 3.0, "word": "three"}],
+    }]
+    analytics = compute_analytics("one two three", segments, bin_seconds=1.0, pace_window=1.0)
+    assert analytics["words_per_minute"] == [120.0, 0.0, 60.0]
+    assert analytics["pauses"]["counts"] == [0, 0, 1, 0, 0]
+
+
+def test_hour_long_talk_is_fast():
+    segments = [{"start": i * 3.0, "end": i * 3.0 + 2.5, "text": "so we ship the product today"} for i in range(1200)]
+    transcript = " ".join(segment["text"] for segment in segments)
+    fillers = find_fillers(transcript)["offsets"]
+    started = time.perf_counter()
+    analytics = compute_analytics(transcript, segments, fillers)
+    elapsed = time.perf_counter() - started
+    assert len(analytics["words_per_minute"]) == 720
+    assert sum(analytics["fillers"]["total"]) == 1200
+    assert elapsed < 0.5
+
+
+def test_transcript_without_segments_spans_the_duration():
+    analytics = compute_analytics("aaa bbb ccc ddd", [], duration=10.0, bin_seconds=5.0, pace_window=5.0)
+    assert analytics["words_per_minute"] == [24.0, 24.0]
+    assert analytics["pauses"]["counts"] == [0, 0, 0, 0, 0]
+
+
+def test_untimed_transcript_uses_acoustic_pauses():
+    acoustic = {"edges": [0.25, 0.5, 1.0, 2.0, 4.0], "counts": [3, 1, 0, 1, 0]}
+    analytics = compute_analytics("aaa bbb", [], duration=10.0, acoustic_pauses=acoustic)
+    assert analytics["pauses"] == acoustic
+    # Timed gaps take precedence and land in the same buckets
+    timed = compute_analytics(TRANSCRIPT, SEGMENTS, duration=15.0, acoustic_pauses=acoustic)
+    assert timed["pauses"]["edges"] == acoustic["edges"]
+    assert timed["pauses"]["counts"] == [0, 1, 0, 1, 0]
+
+
+def test_series_have_one_point_per_bin_when_shorter_than_the_pace_window():
+    analytics = compute_analytics(TRANSCRIPT, SEGMENTS, find_fillers(TRANSCRIPT)["offsets"], duration=15.0,
+                                  bin_seconds=5.0, pace_window=30.0)
+    assert len(analytics["words_per_minute"]) == len(analytics["fillers"]["total"]) == 3
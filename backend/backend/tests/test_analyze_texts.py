@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import text_analysis
+from app.services.text_analysis import analyze_text, analyze_texts
+
+spacy = pytest.importorskip("spacy")
+
+TEXTS = [
+    "Um, this is the first one. It has two sentences.",
+    "Second transcript, you know, with a filler.",
+    "",
+    "Okay. Third. Short sentences here!",
+]
+
+
+@pytest.fixture
+def blank_pipeline(monkeypatch):
+    """Stand in the tokenizer and sentencizer for the trimmed model."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    monkeypatch.setattr(text_analysis, "_nlp", nlp)
+    return nlp
+
+
+def test_batches_match_single_analysis(blank_pipeline):
+    """Batched results equal per-text results, in input order."""
+    batched = list(analyze_texts(iter(TEXTS), batch_size=2))
+    assert batched == [analyze_text(text) for text in TEXTS]
+    assert [result["sentence_count"] for result in batched] == [2, 1, 0, 3]
+
+
+def test_fallback_without_model(monkeypatch):
+    """Without a spaCy model every text still gets an analysis."""
+    monkeypatch.setattr(text_analysis, "_nlp", None)
+    monkeypatch.setattr(text_analysis, "spacy_available", False)
+    results = list(analyze_texts(TEXTS))
+    assert [result["word_count"] for result in results] == [len(text.split()) for text in TEXTS]
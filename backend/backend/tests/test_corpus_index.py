@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.corpus_index import CorpusIndex, term_counts
+
+HISTORY = [
+    "Our roadmap covers pricing, onboarding and the mobile launch.",
+    "The mobile launch slipped, but onboarding numbers improved.",
+]
+SESSION = "Basically the pricing change is basically done, basically ready for customers."
+
+
+def test_term_counts_skip_stopwords():
+    assert term_counts("The launch is the launch, it's a launch.") == {"launch": 3}
+
+
+def test_documents_are_added_once(tmp_path):
+    index = CorpusIndex(tmp_path / "corpus.db")
+    assert index.add_document("alice", "s1", HISTORY[0])
+    assert not index.add_document("alice", "s1", HISTORY[0])
+    documents, words, stats = index._history("alice", ["launch", "pricing", "missing"])
+    assert (documents, words) == (1, 6)
+    assert stats == {"launch": (1, 1), "pricing": (1, 1)}
+    index.close()
+
+
+def test_session_insights_against_history():
+    """Terms new to the user rank above familiar ones, and repeated habits are overused."""
+    index = CorpusIndex(":memory:")
+    for i, text in enumerate(HISTORY):
+        index.add_document("alice", f"s{i}", text)
+    index.add_document("bob", "b0", SESSION * 5)
+
+    insights = index.session_insights("alice", SESSION)
+    terms = [keyword["term"] for keyword in insights["keywords"]]
+    assert terms[0] == "basically"
+    assert terms.index("customers") < terms.index("pricing")
+    assert insights["overused_words"] == [{"term": "basically", "count": 3, "ratio": 6.75}]
+
+
+def test_no_history_has_no_overused_words():
+    index = CorpusIndex(":memory:")
+    insights = index.session_insights("carol", SESSION)
+    assert insights["overused_words"] == []
+    assert insights["keywords"][0]["term"] == "basically"
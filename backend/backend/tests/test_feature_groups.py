@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.feature_groups import AcousticFeatureGroups, parse_fields
+from app.services.numpy_acoustics import extract_features_numpy
+from app.services.speech_rate import apply_speech_rate
+
+SAMPLE_RATE = 16000
+
+
+def speech_like(seconds: float) -> np.ndarray:
+    """Gliding harmonic tone in 3 Hz syllable-like bursts."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(150 + 30 * np.sin(2 * np.pi * 0.5 * t)) / SAMPLE_RATE
+    envelope = np.maximum(0.0, np.sin(2 * np.pi * 3.0 * t)) ** 2
+    return (0.3 * (np.sin(phase) + 0.5 * np.sin(3 * phase)) * envelope).astype(np.float32)
+
+
+def test_groups_are_computed_on_demand():
+    """Cheap fields never trigger pitch tracking, and groups are memoized."""
+    groups = AcousticFeatureGroups(speech_like(3.0), SAMPLE_RATE)
+    selected = groups.select(["speaking_duration", "speech_rate"])
+    assert set(selected) == {"speaking_duration", "speech_rate"}
+    assert "frames" not in groups._groups
+
+    pauses = groups.group("pauses")
+    assert {"frames", "rate", "pauses"} <= set(groups._groups)
+    assert "timeseries" not in groups._groups
+    assert groups.group("pauses") is pauses
+
+
+def test_groups_match_eager_extraction():
+    """Selecting every group gives the same values as the eager engine."""
+    y = speech_like(4.0)
+    eager = apply_speech_rate(extract_features_numpy(y, SAMPLE_RATE, timeseries_window=1.0), y, SAMPLE_RATE)
+    lazy = AcousticFeatureGroups(y, SAMPLE_RATE, timeseries_window=1.0).select()
+    for field, value in eager.items():
+        if isinstance(value, float):
+            assert lazy[field] == pytest.approx(value, rel=1e-6, abs=1e-9), field
+        else:
+            assert lazy[field] == value, field
+    assert set(lazy["statistics"]) >= {"pitch", "energy"}
+
+
+def test_precomputed_features_project():
+    """One-pass results are projected without recomputation."""
+    groups = AcousticFeatureGroups.from_features({"pitch_mean": 120.0, "speech_rate": 3.5})
+    assert groups.select(["prosody", "speech_rate"]) == {"pitch_mean": 120.0, "speech_rate": 3.5}
+
+
+def test_parse_fields():
+    """Projections accept field and group names and reject anything else."""
+    assert parse_fields(None) is None
+    assert parse_fields(" speech_rate, prosody ") == ["speech_rate", "prosody"]
+    with pytest.raises(ValueError, match="frames"):
+        parse_fields("frames")
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import llm_feedback
+from app.services.feedback_cache import FeedbackCache, feedback_key, quantize
+
+FEEDBACK = {
+    "summary_feedback": "Clear and well paced.",
+    "text_suggestions": [], "voice_suggestions": [], "overall_score": 82, "recommendations": [],
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_small_metric_differences():
+    text = {"word_count": 152, "readability_scores": {"flesch_reading_ease": 71.34}}
+    acoustic = {"pitch_mean": 118.26, "jitter": 0.0213}
+    key = feedback_key("1", "model", "Hello  there.", text, acoustic)
+    nearby = {"word_count": 153, "readability_scores": {"flesch_reading_ease": 70.9}}
+    assert feedback_key("1", "model", "Hello there.", nearby, {"pitch_mean": 118.9, "jitter": 0.0211}) == key
+    assert feedback_key("2", "model", "Hello there.", text, acoustic) != key
+    assert feedback_key("1", "other", "Hello there.", text, acoustic) != key
+    assert feedback_key("1", "model", "Hello here.", text, acoustic) != key
+    assert quantize({"a": [0.012345, 98765], "b": True, "c": "x"}) == {"a": [0.012, 99000.0], "b": True, "c": "x"}
+
+
+def test_hits_misses_and_ttl(tmp_path):
+    clock = Clock()
+    cache = FeedbackCache(tmp_path / "cache.db", ttl=60, clock=clock)
+    assert cache.get("k") is None
+    cache.put("k", FEEDBACK)
+    assert cache.get("k") == FEEDBACK
+
+    # A new instance reads the entry back from disk
+    reopened = FeedbackCache(tmp_path / "cache.db", ttl=60, clock=clock)
+    assert reopened.get("k") == FEEDBACK
+    assert reopened.stats() == {"hits": 1, "memory_hits": 0, "misses": 0, "evictions": 0, "entries": 1}
+    assert reopened.get("k") == FEEDBACK
+    assert reopened.stats()["memory_hits"] == 1
+
+    clock.now += 61
+    assert reopened.get("k") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    clock = Clock()
+    cache = FeedbackCache(":memory:", max_entries=2, memory_entries=1, clock=clock)
+    for key in ("a", "b"):
+        clock.now += 1
+        cache.put(key, FEEDBACK)
+    clock.now += 1
+    assert cache.get("a") == FEEDBACK
+    clock.now += 1
+    cache.put("c", FEEDBACK)
+    assert cache.get("b") is None
+    assert cache.get("a") == FEEDBACK
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_memory_hits_keep_entries_from_eviction():
+    """Entries served from memory count as recently used on disk."""
+    clock = Clock()
+    cache = FeedbackCache(":memory:", max_entries=2, memory_entries=2, clock=clock)
+    for key in ("a", "b"):
+        clock.now += 1
+        cache.put(key, FEEDBACK)
+    clock.now += 1
+    assert cache.get("a") == FEEDBACK
+    assert cache.stats()["memory_hits"] == 1
+    clock.now += 1
+    cache.put("c", FEEDBACK)
+    cache.memory.clear()
+    assert cache.get("a") == FEEDBACK
+    assert cache.get("b") is None
+
+
+def test_cached_feedback_skips_the_llm(monkeypatch):
+    """A hit is returned without a client or an API call."""
+    cache = FeedbackCache(":memory:")
+    monkeypatch.setattr(llm_feedback, "get_feedback_cache", lambda: cache)
+    monkeypatch.setattr(llm_feedback, "get_llm_client", lambda: None)
+    text, acoustic = {"word_count": 3}, {"pitch_mean": 120.0}
+    key = feedback_key(llm_feedback.PROMPT_VERSION, llm_feedback.GROQ_MODEL, "Hi there all.", text, acoustic)
+    cache.put(key, FEEDBACK)
+    assert asyncio.run(llm_feedback.generate_llm_feedback("Hi there all.", text, acoustic)) == FEEDBACK
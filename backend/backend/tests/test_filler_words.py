@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.filler_words import compile_lexicon, content_uses, find_fillers, normalize_lexicon
+
+
+def test_fillers_next_to_punctuation():
+    """Fillers are found at the start, before commas and at the end of the text."""
+    text = "Um, so I think, you know, it works. Basically."
+    result = find_fillers(text)
+    assert result["counts"] == {"um": 1, "so": 1, "you know": 1, "basically": 1}
+    assert [text[o["start"]:o["end"]] for o in result["offsets"]] == ["Um", "so", "you know", "Basically"]
+
+
+def test_fillers_are_whole_words():
+    """Fillers inside other words are not counted."""
+    assert find_fillers("Summer umbrellas are really unlike soup.")["counts"] == {}
+
+
+def test_phrases_span_whitespace():
+    """Multi-word fillers match across line breaks and repeated spaces."""
+    assert find_fillers("you\n  know what")["counts"] == {"you know": 1}
+
+
+def test_custom_lexicons_are_cached():
+    """Equal custom lexicons share one compiled matcher."""
+    compile_lexicon.cache_clear()
+    assert find_fillers("Kind of, sort of.", ["sort of", "Kind  of"])["counts"] == {"kind of": 1, "sort of": 1}
+    find_fillers("sort of", ["kind of", "sort of"])
+    assert compile_lexicon.cache_info().hits == 1
+    assert normalize_lexicon([" Kind  of ", "kind of", ""]) == ("kind of",)
+
+
+def _tagged_doc(tagged):
+    """A Doc from (word, tag, pos, space after) tuples, as a tagger would produce."""
+    spacy = pytest.importorskip("spacy")
+    from spacy.tokens import Doc
+    words, tags, pos, spaces = zip(*tagged)
+    return Doc(spacy.blank("en").vocab, words=list(words), tags=list(tags), pos=list(pos), spaces=list(spaces))
+
+
+def test_content_uses_are_not_fillers():
+    """Tags and surrounding punctuation separate filler uses from content uses."""
+    doc = _tagged_doc([
+        ("So", "RB", "ADV", False), (",", ",", "PUNCT", True),
+        ("I", "PRP", "PRON", True), ("like", "VBP", "VERB", True), ("it", "PRP", "PRON", True),
+        ("so", "RB", "ADV", True), ("much", "RB", "ADV", False), (",", ",", "PUNCT", True),
+        ("like", "UH", "INTJ", True), ("really", "RB", "ADV", False), (",", ",", "PUNCT", True),
+        ("right", "JJ", "ADJ", False), ("?", ".", "PUNCT", False),
+    ])
+    result = find_fillers(doc.text, skip=content_uses(doc))
+    assert result["counts"] == {"so": 1, "like": 1, "right": 1}
+    assert [o["start"] for o in result["offsets"]] == [0, 23, 36]
+
+
+def test_hedging_like_is_a_filler():
+    """A bare "like" before an adjective or adverb is a filler; the verb is not."""
+    doc = _tagged_doc([
+        ("It", "PRP", "PRON", True), ("was", "VBD", "AUX", True), ("like", "IN", "ADP", True),
+        ("huge", "JJ", "ADJ", False), (".", ".", "PUNCT", True),
+        ("I", "PRP", "PRON", True), ("like", "VBP", "VERB", True), ("really", "RB", "ADV", True),
+        ("old", "JJ", "ADJ", True), ("films", "NNS", "NOUN", True),
+        ("like", "IN", "ADP", True), ("this", "DT", "DET", False), (".", ".", "PUNCT", False),
+    ])
+    result = find_fillers(doc.text, skip=content_uses(doc))
+    assert result["counts"] == {"like": 1}
+    assert result["offsets"][0]["start"] == 7
+
+
+def test_untagged_docs_keep_every_match():
+    """Without tags nothing can be told apart, so all matches count."""
+    spacy = pytest.importorskip("spacy")
+    doc = spacy.blank("en")("I like it so much")
+    assert content_uses(doc) == set()
+    assert find_fillers(doc.text, skip=content_uses(doc))["counts"] == {"like": 1, "so": 1}
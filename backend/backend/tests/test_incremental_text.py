@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import text_analysis
+from app.services.incremental_text import IncrementalTextAnalyzer
+from app.services.text_analysis import analyze_text
+
+SEGMENTS = [
+    "Um, so today I want to talk",
+    "about our results. You",
+    "know, the numbers are",
+    "basically good... Really good!",
+    "",
+    "?? okay",
+    "And that's it",
+]
+
+
+@pytest.fixture(params=["fallback", "spacy"])
+def nlp_mode(request, monkeypatch):
+    """Run a test without spaCy and with a blank spaCy pipeline."""
+    if request.param == "fallback":
+        monkeypatch.setattr(text_analysis, "_nlp", None)
+        monkeypatch.setattr(text_analysis, "spacy_available", False)
+    else:
+        spacy = pytest.importorskip("spacy")
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        monkeypatch.setattr(text_analysis, "_nlp", nlp)
+    return request.param
+
+
+def test_result_matches_analyze_text(nlp_mode):
+    """After every segment, the result equals analyze_text on the text so far."""
+    analyzer = IncrementalTextAnalyzer()
+    for i, segment in enumerate(SEGMENTS, start=1):
+        analyzer.add_segment(segment)
+        text = " ".join(s.strip() for s in SEGMENTS[:i] if s.strip())
+        assert analyzer.result() == analyze_text(text)
+
+
+def test_filler_split_across_segments(nlp_mode):
+    """A phrase split over two segments is counted once, as the phrase."""
+    analyzer = IncrementalTextAnalyzer()
+    analyzer.add_segment("I mean, you")
+    assert analyzer.result()["filler_words"] == {}
+    analyzer.add_segment("know what I mean")
+    result = analyzer.result()
+    assert result["filler_words"] == {"you know": 1}
+    assert result["filler_offsets"] == [{"filler": "you know", "start": 8, "end": 16}]
+
+
+def test_windowed_rates(nlp_mode):
+    """Rates cover only segments that ended within the window."""
+    analyzer = IncrementalTextAnalyzer(rate_window=10)
+    analyzer.add_segment("um one two three", 0, 5)
+    analyzer.add_segment("four five six seven", 5, 10)
+    rates = analyzer.rates()
+    assert rates["window"] == 10
+    assert rates["words_per_minute"] == pytest.approx(8 * 6)
+    assert rates["fillers_per_minute"] == pytest.approx(6)
+
+    # The pause from 10 to 16 seconds counts towards the window
+    analyzer.add_segment("eight nine", 16, 20)
+    rates = analyzer.rates()
+    assert rates["window"] == 10
+    assert rates["words_per_minute"] == pytest.approx(2 * 6)
+    assert rates["fillers_per_minute"] == 0
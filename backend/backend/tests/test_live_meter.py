@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.routers import live
+from app.services.live_meter import LiveMeter, RingBuffer
+
+SAMPLE_RATE = 16000
+
+
+def pcm_tone(freq: float, seconds: float) -> bytes:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * freq * t) * 32767).astype("<i2").tobytes()
+
+
+def test_ring_buffer_keeps_latest():
+    """Writes wrap around and reads come back oldest first."""
+    buffer = RingBuffer(5)
+    buffer.extend(np.arange(3))
+    buffer.extend(np.arange(3, 7))
+    np.testing.assert_array_equal(buffer.latest(), [2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(buffer.latest(2), [5, 6])
+    buffer.extend(np.arange(10, 20))
+    np.testing.assert_array_equal(buffer.latest(), [15, 16, 17, 18, 19])
+
+
+def test_meter_tracks_pitch_and_loudness():
+    """A steady tone gives one update per interval at its pitch, flagged monotone."""
+    meter = LiveMeter(sr=SAMPLE_RATE, update_interval=0.1)
+    data = pcm_tone(200.0, 1.0)
+    # Chunks that do not line up with samples or updates
+    updates = [meter.push(data[i:i + 1001]) for i in range(0, len(data), 1001)]
+    updates = [update for update in updates if update is not None]
+    assert len(updates) == 10
+    last = updates[-1]
+    assert last["pitch"] == pytest.approx(200.0, rel=0.02)
+    assert last["rms_db"] == pytest.approx(20 * np.log10(0.3 / np.sqrt(2)), abs=0.5)
+    assert last["voiced"] == 1.0
+    assert last["monotone"] is True
+
+
+def test_meter_reports_silence():
+    """Silence is unvoiced and quiet."""
+    update = LiveMeter(sr=SAMPLE_RATE).push(bytes(2 * SAMPLE_RATE // 10))
+    assert update["pitch"] == 0.0
+    assert update["voiced"] == 0.0
+    assert update["rms_db"] <= -100
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Live meter app that accepts the token "valid"."""
+    monkeypatch.setattr(live, "_verify_token", lambda token: {"id": "user-1"} if token == "valid" else None)
+    app = FastAPI()
+    app.include_router(live.router)
+    return TestClient(app)
+
+
+def test_websocket_streams_updates(client):
+    """The endpoint answers streamed PCM with JSON updates."""
+    with client.websocket_connect("/live?token=valid&sample_rate=16000") as websocket:
+        websocket.send_bytes(pcm_tone(150.0, 0.1))
+        update = websocket.receive_json()
+    assert update["t"] == pytest.approx(0.1)
+    assert update["pitch"] == pytest.approx(150.0, rel=0.02)
+
+
+def test_websocket_rejects_text_messages(client):
+    """Text frames close the connection as unsupported data."""
+    with client.websocket_connect("/live?token=valid") as websocket:
+        websocket.send_text("hello")
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1003
+
+
+@pytest.mark.parametrize("query", ["", "?token=forged"])
+def test_websocket_requires_valid_token(client, query):
+    """Missing and invalid tokens close the handshake as a policy violation."""
+    with client.websocket_connect(f"/live{query}") as websocket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1008
+
+
+def test_websocket_caps_connections(client, monkeypatch):
+    """Streams beyond LIVE_MAX_CONNECTIONS are turned away and the slot is freed on close."""
+    monkeypatch.setattr(live, "LIVE_MAX_CONNECTIONS", 1)
+    with client.websocket_connect("/live?token=valid") as first:
+        first.send_bytes(pcm_tone(150.0, 0.1))
+        first.receive_json()
+        with client.websocket_connect("/live?token=valid") as second:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                second.receive_json()
+        assert closed.value.code == 1013
+    with client.websocket_connect("/live?token=valid") as third:
+        third.send_bytes(pcm_tone(150.0, 0.1))
+        assert "pitch" in third.receive_json()
+
+
+def test_websocket_throttles_by_wall_clock(client, monkeypatch):
+    """Audio sent faster than real time yields no more than one update per interval."""
+    monkeypatch.setattr(live, "LIVE_UPDATE_INTERVAL", 3600.0)
+    with client.websocket_connect("/live?token=valid") as websocket:
+        for _ in range(3):
+            websocket.send_bytes(pcm_tone(150.0, 0.1))
+        websocket.send_text("stop")
+        assert websocket.receive_json()["t"] == pytest.approx(0.1)
+        # The next message is the close, not a second update
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1003
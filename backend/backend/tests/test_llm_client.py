@@ -0,0 +1,37 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import GROQ_CONNECT_TIMEOUT, GROQ_READ_TIMEOUT
+from app.services import llm_feedback
+
+
+def test_client_is_shared_and_closed(monkeypatch):
+    """One pooled client serves every call until it is closed."""
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    asyncio.run(llm_feedback.close_llm_client())
+    client = llm_feedback.init_llm_client()
+    try:
+        assert llm_feedback.get_llm_client() is client
+        assert llm_feedback.init_llm_client() is client
+        timeout = client._client.timeout
+        assert (timeout.connect, timeout.read) == (GROQ_CONNECT_TIMEOUT, GROQ_READ_TIMEOUT)
+        # The scheduler is the only layer that retries
+        assert client.max_retries == 0
+    finally:
+        asyncio.run(llm_feedback.close_llm_client())
+    assert client._client.is_closed
+    assert llm_feedback._client is None
+
+
+def test_missing_key_gives_fallback_feedback(monkeypatch):
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.setattr(llm_feedback, "get_feedback_cache", lambda: None)
+    asyncio.run(llm_feedback.close_llm_client())
+    assert llm_feedback.init_llm_client() is None
+    feedback = asyncio.run(llm_feedback.generate_llm_feedback("Hello.", {}, {}))
+    assert feedback["overall_score"] == 0
+    assert "GROQ_API_KEY" in feedback["summary_feedback"]
@@ -0,0 +1,84 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from groq import APIConnectionError, RateLimitError
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.llm_scheduler import LLMScheduler, TokenBucket
+
+
+def _rate_limited(retry_after="0.01"):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def test_in_flight_requests_are_capped():
+    scheduler = LLMScheduler(max_concurrency=2, requests_per_minute=6000, tokens_per_minute=1e6)
+    running, peak = 0, 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    async def burst():
+        return await asyncio.gather(*(scheduler.submit(call, tokens=10) for _ in range(6)))
+
+    assert asyncio.run(burst()) == ["ok"] * 6
+    assert peak == 2
+
+
+def test_bucket_paces_bursts():
+    """A burst beyond the bucket's capacity waits for it to refill."""
+    async def burst():
+        bucket = TokenBucket(capacity=2, per_second=40)
+        started = time.perf_counter()
+        for _ in range(4):
+            await bucket.acquire(1)
+        return time.perf_counter() - started
+
+    assert asyncio.run(burst()) >= 0.045
+
+
+def test_rate_limited_requests_are_retried():
+    scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=6000, tokens_per_minute=1e6, retries=2)
+    attempts = []
+
+    async def call():
+        attempts.append(time.perf_counter())
+        if len(attempts) < 3:
+            raise _rate_limited()
+        return "ok"
+
+    assert asyncio.run(scheduler.submit(call, tokens=10)) == "ok"
+    assert len(attempts) == 3
+
+    async def always_limited():
+        raise _rate_limited()
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(scheduler.submit(always_limited, tokens=10))
+
+
+def test_connection_errors_are_retried():
+    scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=6000, tokens_per_minute=1e6, retries=1, backoff=0.01)
+    attempts = []
+
+    async def call():
+        attempts.append(time.perf_counter())
+        if len(attempts) < 2:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions"))
+        return "ok"
+
+    assert asyncio.run(scheduler.submit(call, tokens=10)) == "ok"
+    assert len(attempts) == 2
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.numpy_acoustics import compute_frame_features, extract_features_numpy
+
+SAMPLE_RATE = 16000
+
+
+def tone(frequency: float, seconds: float = 2.0, amplitude: float = 0.3) -> np.ndarray:
+    """Generate a sine tone with one harmonic."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)
+            + amplitude / 3 * np.sin(4 * np.pi * frequency * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("frequency", [90.0, 150.0, 260.0])
+def test_pitch_of_steady_tone(frequency):
+    """YIN recovers the fundamental of a steady tone."""
+    result = extract_features_numpy(tone(frequency), SAMPLE_RATE)
+    assert result["pitch_mean"] == pytest.approx(frequency, rel=0.01)
+    assert result["jitter"] < 0.01
+
+
+def test_silence_is_unvoiced():
+    """Silent frames get no pitch and zero energy."""
+    frames = compute_frame_features(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    assert not frames.voiced.any()
+    assert np.all(frames.energy == 0)
+
+
+def test_returns_audio_features_fields():
+    """The NumPy engine returns the same fields as the openSMILE engine."""
+    result = extract_features_numpy(tone(120.0), SAMPLE_RATE)
+    for field in ["pitch_mean", "pitch_std", "energy_mean", "energy_std",
+                  "jitter", "shimmer", "speaking_duration", "speech_rate"]:
+        assert isinstance(result[field], float)
+    assert result["speaking_duration"] == pytest.approx(2.0)
+
+
+def test_timeseries_windows():
+    """Frame series are reduced to one value per window, including a partial last window."""
+    signal = np.concatenate([tone(150.0, seconds=1.5), np.zeros(SAMPLE_RATE, dtype=np.float32)])
+    series = extract_features_numpy(signal, SAMPLE_RATE, timeseries_window=1.0)["timeseries"]
+    assert series["window"] == 1.0
+    assert len(series["pitch"]) == len(series["energy"]) == len(series["voicing"]) == 3
+    assert series["pitch"][0] == pytest.approx(150.0, rel=0.01)
+    assert series["voicing"][2] == 0.0
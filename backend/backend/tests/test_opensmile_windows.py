@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("librosa")
+pytest.importorskip("opensmile")
+
+from app.services import acoustic_features
+from app.services.acoustic_features import LLD_FRAME_STEP, SMILE_OPTIONS, _opensmile_lld, _opensmile_lld_windowed
+
+SAMPLE_RATE = 16000
+EDGE_FRAMES = 3
+
+
+def fake_lld(duration: float):
+    """Descriptors holding the global frame index, unusable near segment cuts."""
+    def lld(audio_path, start, end):
+        count = int(np.floor((end - start - SMILE_OPTIONS['frameSize']) / LLD_FRAME_STEP + 1e-9)) + 1
+        values = np.round(start / LLD_FRAME_STEP) + np.arange(count, dtype=np.float64)
+        if start > 0:
+            values[:EDGE_FRAMES] = np.nan
+        if end < duration:
+            values[-EDGE_FRAMES:] = np.nan
+        return {"f0": values, "energy": values.copy()}
+    return lld
+
+
+def test_windows_trim_context_to_the_global_grid(monkeypatch):
+    duration = 7.3
+    monkeypatch.setattr(acoustic_features, "_opensmile_lld", fake_lld(duration))
+    single = acoustic_features._opensmile_lld(Path("talk.wav"), 0.0, duration)
+    windowed = _opensmile_lld_windowed(Path("talk.wav"), duration, window_seconds=2.0)
+    for field in single:
+        np.testing.assert_array_equal(windowed[field], single[field])
+
+
+def test_windows_approximately_match_a_single_pass(tmp_path):
+    soundfile = pytest.importorskip("soundfile")
+    duration = 6.0
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.4 * t)
+    y = 0.3 * np.sin(2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE)
+    y += 0.01 * np.random.default_rng(0).standard_normal(len(y))
+    audio_path = tmp_path / "glide.wav"
+    soundfile.write(audio_path, y, SAMPLE_RATE)
+
+    single = _opensmile_lld(audio_path, 0.0, duration)
+    windowed = _opensmile_lld_windowed(audio_path, duration, window_seconds=2.0)
+    assert len(windowed["energy"]) == len(single["energy"])
+    assert np.median(np.abs(windowed["energy"] - single["energy"])) < 1e-3
+    assert abs(np.nanmean(windowed["f0"]) - np.nanmean(single["f0"])) < 0.1
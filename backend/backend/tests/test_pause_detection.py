@@ -0,0 +1,51 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pause_detection import detect_pauses, run_lengths
+
+FRAME_STEP = 0.01
+
+
+def speech_pattern(*segments):
+    """Build energy and voicing arrays from (seconds, is_speech) segments."""
+    mask = np.concatenate([np.full(int(round(seconds / FRAME_STEP)), speaking) for seconds, speaking in segments])
+    energy = np.where(mask, 0.2, 0.001)
+    return energy, mask
+
+
+def test_run_lengths():
+    """Runs are reported with their start, length and value."""
+    starts, lengths, values = run_lengths(np.array([True, True, False, True, False, False]))
+    assert starts.tolist() == [0, 2, 3, 4]
+    assert lengths.tolist() == [2, 1, 1, 2]
+    assert values.tolist() == [True, False, True, False]
+
+
+def test_detect_pauses():
+    """Inner silences above the minimum are pauses; edge silence is ignored."""
+    energy, voiced = speech_pattern((1.0, False), (2.0, True), (0.1, False), (1.0, True),
+                                    (0.6, False), (1.0, True), (3.0, False), (1.0, True), (2.0, False))
+    result = detect_pauses(energy, voiced, FRAME_STEP, speech_units=10)
+    assert result["pause_count"] == 2
+    assert result["longest_pause"] == pytest.approx(3.0)
+    assert result["total_pause_time"] == pytest.approx(3.6)
+    assert result["phonation_time"] == pytest.approx(5.1)
+    assert result["articulation_rate"] == pytest.approx(10 / 5.1)
+    assert sum(result["pause_histogram"]["counts"]) == 2
+
+
+def test_detect_pauses_is_fast():
+    """An hour of frames is processed in well under a second."""
+    rng = np.random.default_rng(0)
+    voiced = np.repeat(rng.random(36000) > 0.3, 10)
+    energy = np.where(voiced, 0.2, 0.001)
+    start = time.perf_counter()
+    detect_pauses(energy, voiced, FRAME_STEP, speech_units=1000)
+    assert time.perf_counter() - start < 0.5
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.filler_words import find_fillers
+from app.services.prompt_builder import (
+    OMISSION_MARK,
+    build_prompt,
+    compact_metrics,
+    count_tokens,
+    select_excerpts,
+)
+
+
+def test_compact_metrics_drop_noise():
+    text_analysis = {
+        "word_count": 120,
+        "filler_words": {"um": 3},
+        "filler_offsets": [{"filler": "um", "start": 0, "end": 2}],
+        "repeated_phrases": [{"phrase": "at the end of the day", "count": 3, "offsets": [{"start": 5, "end": 26}]}],
+        "readability_scores": {"flesch_reading_ease": 71.2345, "smog_index": 0.0},
+        "sentence_metrics": {"word_counts": [10, 31, 8], "long_sentences": [1]},
+        "keywords": [],
+        "speaking_rate": 150.0,
+        "words_per_minute": [0.0, 120.5, 0],
+    }
+    assert compact_metrics(text_analysis) == {
+        "word_count": 120,
+        "filler_words": {"um": 3},
+        "repeated_phrases": ["at the end of the day (3)"],
+        "readability_scores": {"flesch_reading_ease": 71.2},
+        "sentence_metrics": {"long_sentences": 1, "max_words": 31},
+        "words_per_minute": [0.0, 120.0, 0],
+    }
+
+
+def test_short_transcripts_are_sent_whole():
+    system_prompt, user_prompt, tokens = build_prompt("Hello everyone.", {"word_count": 2}, {"pitch_mean": 120.5})
+    assert "Transcript:\nHello everyone." in user_prompt
+    assert '{"word_count":2}' in user_prompt
+    assert tokens == count_tokens(system_prompt) + count_tokens(user_prompt)
+
+
+def test_long_transcripts_are_excerpted():
+    """Opening, closing and filler-dense sentences are kept within the budget."""
+    sentences = [f"Point number {i} covers the quarterly numbers in detail." for i in range(300)]
+    sentences[150] = "Um, so, like, um, you know, basically um."
+    sentences[0] = "Welcome to the review."
+    sentences[-1] = "Thanks for listening."
+    transcript = " ".join(sentences)
+    fillers = find_fillers(transcript)["offsets"]
+
+    excerpt = select_excerpts(transcript, 200, fillers)
+    assert count_tokens(excerpt) <= 200
+    assert excerpt.startswith("Welcome to the review.")
+    assert excerpt.endswith("Thanks for listening.")
+    assert "Um, so, like, um, you know, basically um." in excerpt
+    assert OMISSION_MARK in excerpt
+
+    _, user_prompt, tokens = build_prompt(transcript, {"filler_offsets": fillers}, {}, budget=1000)
+    assert tokens <= 1000
+    assert "Transcript excerpts" in user_prompt
+
+
+def test_unpunctuated_transcripts_are_cut_at_words():
+    """A transcript that is one long sentence is still excerpted, not dropped."""
+    transcript = " ".join(f"word{i}" for i in range(2000))
+    excerpt = select_excerpts(transcript, 200)
+    assert 0 < count_tokens(excerpt) <= 200
+    assert excerpt.startswith("word0 word1")
+    assert excerpt.endswith("word1999")
+    assert OMISSION_MARK in excerpt
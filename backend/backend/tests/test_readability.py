@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.readability import ReadabilityCounts, count_syllables
+
+TEXT = "The cat sat on the mat. It was a beautiful, comfortable afternoon. Everyone relaxed."
+
+
+def test_counts_and_scores():
+    """Scores follow the standard formulas applied to shared counts."""
+    counts = ReadabilityCounts.from_text(TEXT)
+    assert counts.sentences == 3
+    assert counts.words == 14
+    scores = counts.scores()
+    words_per_sentence = 14 / 3
+    syllables_per_word = counts.syllables / 14
+    assert scores["flesch_reading_ease"] == pytest.approx(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, abs=0.01)
+    assert scores["flesch_kincaid_grade"] == pytest.approx(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, abs=0.01)
+    assert scores["smog_index"] > 3.1291
+
+
+def test_counts_are_additive():
+    """Counts of two parts add up to the counts of the whole."""
+    first, second = "The cat sat on the mat.", "It was a beautiful, comfortable afternoon. Everyone relaxed."
+    assert ReadabilityCounts.from_text(first) + ReadabilityCounts.from_text(second) == ReadabilityCounts.from_text(TEXT)
+
+
+def test_syllables_are_memoized():
+    """Each distinct word is looked up once."""
+    count_syllables.cache_clear()
+    ReadabilityCounts.from_text("the the the cat cat")
+    assert count_syllables.cache_info().misses == 2
+    assert count_syllables("cat") == 1
+    assert count_syllables("beautiful") == 3
+
+
+def test_empty_text():
+    assert ReadabilityCounts.from_text("").scores()["flesch_reading_ease"] == 0.0
@@ -0,0 +1,58 @@
+import sys
+from itertools import product
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.repeated_phrases import RepeatedPhraseDetector, find_repeated_phrases
+
+TEXT = (
+    "At the end of the day, we ship. What I mean is, at the end of the day it works. "
+    "And at the end of the day, what I mean is simple. What I mean is that of the of the of the."
+)
+
+
+def test_reports_maximal_phrases():
+    """Only the longest phrase is reported, not the shorter phrases inside it."""
+    phrases = find_repeated_phrases(TEXT)
+    assert [(p["phrase"], p["count"]) for p in phrases] == [("at the end of the day", 3), ("what i mean is", 3)]
+    assert [TEXT[o["start"]:o["end"]] for o in phrases[0]["offsets"]] == ["At the end of the day"] + ["at the end of the day"] * 2
+
+
+def test_runs_longer_than_max_n_are_one_phrase():
+    """A run longer than PHRASE_MAX_N words is not reported as overlapping pieces."""
+    text = "At the end of the day we ship it. So at the end of the day we ship it. Yes, at the end of the day we ship it."
+    phrases = find_repeated_phrases(text)
+    assert [(p["phrase"], p["count"]) for p in phrases] == [("at the end of the day we ship it", 3)]
+    assert [text[o["start"]:o["end"]] for o in phrases[0]["offsets"]] == ["At the end of the day we ship it"] + ["at the end of the day we ship it"] * 2
+
+
+def test_phrases_stop_at_sentence_ends():
+    """Words on either side of a sentence end do not form a phrase."""
+    assert find_repeated_phrases("It ends. Today we. It ends. Today we. It ends. Today we.") == [
+        {"phrase": "it ends", "count": 3, "offsets": [{"start": 0, "end": 7}, {"start": 19, "end": 26}, {"start": 38, "end": 45}]},
+        {"phrase": "today we", "count": 3, "offsets": [{"start": 9, "end": 17}, {"start": 28, "end": 36}, {"start": 47, "end": 55}]},
+    ]
+
+
+def test_chunks_match_one_pass():
+    """Feeding consecutive chunks with their offsets gives the same phrases."""
+    detector = RepeatedPhraseDetector()
+    chunks = TEXT.split(" ")
+    offset = 0
+    for i, chunk in enumerate(chunks):
+        piece = chunk if i == 0 else " " + chunk
+        detector.feed(piece, offset)
+        offset += len(piece)
+    assert detector.phrases() == find_repeated_phrases(TEXT)
+
+
+def test_memory_is_bounded():
+    """The counter never tracks more phrases than its capacity, and frequent phrases survive."""
+    distinct = ["".join(letters) for letters in product("bcdfghjklm", repeat=4)][:5000]
+    text = " ".join(f"{word} never mind then" if i % 7 == 3 else word for i, word in enumerate(distinct))
+    detector = RepeatedPhraseDetector(capacity=500)
+    detector.feed(text)
+    assert len(detector.counts) <= 500
+    assert detector.phrases(limit=1)[0]["phrase"] == "never mind then"
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.readability import count_syllables
+from app.services.sentence_metrics import sentence_metrics
+
+spacy = pytest.importorskip("spacy")
+
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def test_matches_token_loop(nlp):
+    """Array reductions agree with a plain loop over each sentence's tokens."""
+    doc = nlp("We shipped it. Extraordinary organizations communicate effectively, honestly! Ok?")
+    metrics = sentence_metrics(doc, long_sentence_words=3)
+
+    expected_words, expected_syllables = [], []
+    for sentence in doc.sents:
+        expected_words.append(sum(1 for t in sentence if not t.is_punct and not t.is_space))
+        alpha = [t.lower_ for t in sentence if t.is_alpha]
+        expected_syllables.append(round(sum(count_syllables(w) for w in alpha) / len(alpha), 2))
+
+    assert metrics["word_counts"] == expected_words == [3, 5, 1]
+    assert metrics["syllables_per_word"] == expected_syllables
+    assert metrics["long_sentences"] == [1]
+    assert metrics["complex_word_ratio"][0] == 0
+
+
+def test_scales_to_long_transcripts(nlp):
+    """Tens of thousands of tokens reduce to one entry per sentence."""
+    doc = nlp("This sentence has exactly seven words here. " * 5000)
+    metrics = sentence_metrics(doc)
+    assert len(metrics["word_counts"]) == 5000
+    assert set(metrics["word_counts"]) == {7}
+    assert metrics["long_sentences"] == []
+
+
+def test_empty_doc(nlp):
+    assert sentence_metrics(nlp("")) == {
+        "word_counts": [], "syllables_per_word": [], "complex_word_ratio": [], "long_sentences": [],
+    }
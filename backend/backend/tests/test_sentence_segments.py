@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.text_analysis import _parse, analyze_text, segment_starts
+
+spacy = pytest.importorskip("spacy")
+
+TEXT = "so we started early and then the results came in. They were good"
+SEGMENTS = [
+    {"start": 0.0, "end": 2.1, "text": " so we started early"},
+    {"start": 2.1, "end": 4.0, "text": " and then the results came in."},
+    {"start": 4.0, "end": 5.2, "text": " They were good"},
+]
+
+
+def blank_pipeline():
+    """Tokenizer plus sentencizer, the parts of the trimmed pipeline analyze_text reads."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def test_segment_starts():
+    assert segment_starts(TEXT, SEGMENTS) == [0, 20, 50]
+
+
+def test_segments_set_sentence_boundaries():
+    """Whisper segments add boundaries to the sentencizer's punctuation-based ones."""
+    nlp = blank_pipeline()
+    assert len(list(_parse(nlp, TEXT, None).sents)) == 2
+    sentences = [sentence.text for sentence in _parse(nlp, TEXT, SEGMENTS).sents]
+    assert sentences == ["so we started early", "and then the results came in.", "They were good"]
+
+
+def test_single_segment_keeps_punctuation_boundaries():
+    """A segment spanning the whole text does not merge its sentences."""
+    nlp = blank_pipeline()
+    segments = [{"start": 0.0, "end": 5.2, "text": TEXT}]
+    assert len(list(_parse(nlp, TEXT, segments).sents)) == 2
+
+
+def test_fallback_counts_segments():
+    """Without a spaCy model segments and punctuation both end sentences."""
+    assert analyze_text(TEXT, segments=SEGMENTS)["sentence_count"] == 3
+    assert analyze_text(TEXT, segments=[{"start": 0.0, "end": 5.2, "text": TEXT}])["sentence_count"] == 2
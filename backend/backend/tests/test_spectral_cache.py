@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.spectral_cache import SpectralCache
+from app.services.speech_rate import estimate_speech_rate
+
+SAMPLE_RATE = 16000
+
+
+def tone(freq: float, seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_power_is_computed_once():
+    """Every band reads the same memoized power spectrum."""
+    cache = SpectralCache(tone(440.0, 2.0))
+    power = cache.power
+    assert power.shape == (2 * SAMPLE_RATE // 160 + 1, 201)
+    cache.band_power((300.0, 3000.0))
+    cache.band_power((800.0, 1200.0))
+    assert cache.power is power
+
+
+def test_band_power_finds_tone():
+    """A tone's power falls in the band that contains it."""
+    cache = SpectralCache(tone(1000.0, 1.0))
+    inside = cache.band_power((800.0, 1200.0))
+    outside = cache.band_power((2000.0, 4000.0))
+    assert np.all(inside[5:-5] > 1000 * outside[5:-5])
+
+
+def test_speech_rate_reuses_cache():
+    """Speech rate gives the same answer from a shared cache."""
+    t = np.arange(5 * SAMPLE_RATE) / SAMPLE_RATE
+    signal = (0.3 * np.sin(2 * np.pi * 150 * t) * np.maximum(0.0, np.sin(2 * np.pi * 3.0 * t)) ** 2).astype(np.float32)
+    shared = estimate_speech_rate(signal, SAMPLE_RATE, cache=SpectralCache(signal))
+    own = estimate_speech_rate(signal, SAMPLE_RATE)
+    assert shared["syllable_count"] == own["syllable_count"] == 15
+    np.testing.assert_array_equal(shared["rate_curve"], own["rate_curve"])
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.numpy_acoustics import compute_frame_features, downsample_frames
+from app.services.speech_rate import estimate_speech_rate, find_syllable_nuclei
+
+SAMPLE_RATE = 16000
+
+
+def syllable_train(rate: float, seconds: float) -> np.ndarray:
+    """Harmonic tone amplitude-modulated into `rate` bursts per second."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    carrier = np.sin(2 * np.pi * 150 * t) + 0.5 * np.sin(2 * np.pi * 450 * t) + 0.3 * np.sin(2 * np.pi * 900 * t)
+    envelope = np.maximum(0.0, np.sin(2 * np.pi * rate * t)) ** 2
+    return (0.3 * carrier * envelope).astype(np.float32)
+
+
+def test_counts_syllable_bursts():
+    """Each intensity burst is one syllable nucleus."""
+    result = estimate_speech_rate(syllable_train(2.0, 10.0), SAMPLE_RATE)
+    assert result["syllable_count"] == 20
+    assert result["speech_rate"] == pytest.approx(2.0)
+
+
+def test_rate_curve_drops_in_silence():
+    """The windowed rate curve follows local speaking rate."""
+    signal = np.concatenate([syllable_train(2.0, 10.0), np.zeros(10 * SAMPLE_RATE, dtype=np.float32)])
+    curve = estimate_speech_rate(signal, SAMPLE_RATE, curve_step=1.0)["rate_curve"]
+    assert curve.dtype == np.float32
+    assert len(curve) == 21
+    assert curve[2] == pytest.approx(2.0, abs=0.3)
+    assert curve[-1] == 0.0
+
+
+@pytest.mark.parametrize("seconds", [0.05, 2.0, 10.0])
+def test_rate_curve_matches_timeseries_grid(seconds):
+    """The rate curve has one point per time series window, even below RATE_WINDOW."""
+    signal = syllable_train(2.0, seconds)
+    curve = estimate_speech_rate(signal, SAMPLE_RATE, curve_step=1.0)["rate_curve"]
+    pitch = downsample_frames(compute_frame_features(signal, SAMPLE_RATE), 1.0)["pitch"]
+    assert len(curve) == len(pitch)
+
+
+def test_last_peak_dip_ends_at_the_peak():
+    """A shallow last peak is not accepted because of a dip after it."""
+    intensity = np.array([0.0, 10.0, 9.5, 10.5, -20.0, -20.0])
+    assert find_syllable_nuclei(intensity, frame_step=1.0).tolist() == [1]
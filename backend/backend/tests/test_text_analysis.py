@@ -34,7 +34,7 @@ def test_analyze_text_simple():
     # If we can't import the real service, define a mock function
     if not USING_REAL_SERVICE:
         def analyze_text(text: str) -> Dict[str, Any]:
-            # In a real test, this would call spaCy and textstat
+            # In a real test, this would call spaCy
             # But for our test, we'll just return the expected analysis
             return EXPECTED_ANALYSIS
     
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the parent directory to the path so we can import from app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.numpy_acoustics import extract_features_numpy
+from app.services.running_stats import RunningStats
+from app.services.sampled_acoustics import extract_features_sampled
+from app.services.windowed_acoustics import extract_features_windowed, shutdown_executor
+
+SAMPLE_RATE = 16000
+
+
+def gliding_speech(seconds: float) -> np.ndarray:
+    """Tone with a wandering pitch, pauses and noise."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    gate = (np.sin(2 * np.pi * 0.7 * t) > -0.5).astype(np.float64)
+    noise = np.random.default_rng(1).normal(0, 0.01, t.size)
+    return (0.3 * np.sin(phase) * gate + noise).astype(np.float32)
+
+
+def test_running_stats_merge_matches_single_pass():
+    """Chan's merge of partial statistics equals the statistics of all values."""
+    values = np.random.default_rng(0).normal(5.0, 2.0, 1000)
+    merged = RunningStats.merge_all(RunningStats.from_values(part) for part in np.array_split(values, 7))
+    assert merged.count == 1000
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(values.std(), rel=1e-12)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_windowed_matches_single_pass(parallel):
+    """Merged window statistics reproduce the single-pass functionals."""
+    signal = gliding_speech(12.0)
+    single = extract_features_numpy(signal, SAMPLE_RATE)
+    windowed = extract_features_windowed(signal, SAMPLE_RATE, window_seconds=2.5, parallel=parallel)
+    shutdown_executor()
+    for field in ["pitch_mean", "pitch_std", "energy_mean", "energy_std", "jitter", "shimmer",
+                  "speech_rate", "pause_count"]:
+        assert windowed[field] == pytest.approx(single[field], rel=1e-9), field
+    assert windowed["statistics"]["pitch"]["count"] > 0
+
+
+def test_sampled_census_matches_windowed():
+    """Sampling every window reproduces the full computation with zero-width intervals."""
+    signal = gliding_speech(12.0)
+    windowed = extract_features_windowed(signal, SAMPLE_RATE, window_seconds=1.0, parallel=False)
+    sampled = extract_features_sampled(signal, SAMPLE_RATE, window_seconds=1.0, target_width=0.0, parallel=False)
+    assert sampled["estimation"]["sampled_fraction"] == 1.0
+    for field in ["pitch_mean", "pitch_std", "energy_mean", "energy_std"]:
+        assert sampled[field] == pytest.approx(windowed[field], rel=1e-9), field
+        low, high = sampled["estimation"]["intervals"][field]
+        assert low == pytest.approx(high)
+
+
+def test_sampled_estimate_stops_early():
+    """A steady recording converges on a fraction of its windows."""
+    t = np.arange(120 * SAMPLE_RATE) / SAMPLE_RATE
+    signal = (0.3 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    sampled = extract_features_sampled(signal, SAMPLE_RATE, window_seconds=1.0, initial_windows=8, parallel=False)
+    estimation = sampled["estimation"]
+    assert estimation["sampled_windows"] < estimation["total_windows"]
+    low, high = estimation["intervals"]["pitch_mean"]
+    assert low <= sampled["pitch_mean"] <= high
+    assert sampled["pitch_mean"] == pytest.approx(150.0, rel=0.01)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmark PitchPerfect's acoustic feature engines.
+
+Runs the openSMILE and pure-NumPy engines over the same audio files and
+reports their speed and how closely their features agree. The engines are
+called directly, so a failing openSMILE run is reported instead of silently
+falling back to NumPy.
+
+Only fields in the same units are compared: energy only with ComParE_2016
+(eGeMAPS reports loudness, NumPy RMS energy), and not the speech rate,
+which both engines replace with syllable nuclei in the pipeline.
+
+Usage:
+    python benchmark_acoustic_engines.py [audio files...] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+try:
+    from app.config import ANALYSIS_SAMPLE_RATE, OPENSMILE_FEATURE_SET
+    from app.services.acoustic_features import (
+        _extract_opensmile,
+        get_audio_duration,
+        load_audio,
+        opensmile_available,
+    )
+    from app.services.numpy_acoustics import extract_features_numpy
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    sys.exit(1)
+
+COMPARED_FIELDS = ["pitch_mean", "pitch_std", "jitter", "shimmer"]
+if OPENSMILE_FEATURE_SET == "ComParE_2016":
+    COMPARED_FIELDS += ["energy_mean", "energy_std"]
+
+
+def run_opensmile(audio_path: Path):
+    """openSMILE functionals, without the NumPy fallback."""
+    return _extract_opensmile(audio_path, get_audio_duration(audio_path))
+
+
+def run_numpy(audio_path: Path):
+    """NumPy engine over the decoded signal."""
+    return extract_features_numpy(load_audio(audio_path), ANALYSIS_SAMPLE_RATE)
+
+
+def time_engine(audio_path: Path, run, repeat: int):
+    """Run one engine repeatedly, decoding included, and return (features, mean seconds per run)."""
+    features = run(audio_path)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run(audio_path)
+    return features, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark openSMILE against the NumPy acoustic engine.")
+    parser.add_argument("audio_paths", nargs="*", default=["backend/tests/data/sample.wav"])
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per engine and file")
+    args = parser.parse_args()
+
+    if not opensmile_available:
+        print("❌ openSMILE is not installed; nothing to compare against")
+        sys.exit(1)
+
+    print("⏱️  PitchPerfect Acoustic Engine Benchmark")
+    print("=" * 50)
+    for audio_path in map(Path, args.audio_paths):
+        if not audio_path.exists():
+            print(f"❌ Audio file not found: {audio_path}")
+            continue
+
+        try:
+            smile_features, smile_time = time_engine(audio_path, run_opensmile, args.repeat)
+        except Exception as e:
+            print(f"❌ openSMILE failed on {audio_path}: {e}")
+            continue
+        numpy_features, numpy_time = time_engine(audio_path, run_numpy, args.repeat)
+
+        print(f"\n📁 {audio_path} ({smile_features['speaking_duration']:.1f}s)")
+        print(f"   openSMILE: {smile_time * 1000:8.1f} ms")
+        print(f"   NumPy:     {numpy_time * 1000:8.1f} ms  ({smile_time / max(numpy_time, 1e-9):.1f}x)")
+        print(f"   Feature set: {OPENSMILE_FEATURE_SET}")
+        print(f"   {'field':<14}{'openSMILE':>12}{'NumPy':>12}{'rel. diff':>12}")
+        for field in COMPARED_FIELDS:
+            a, b = smile_features.get(field, 0.0), numpy_features.get(field, 0.0)
+            rel = abs(a - b) / max(abs(a), 1e-9)
+            print(f"   {field:<14}{a:>12.4f}{b:>12.4f}{rel:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
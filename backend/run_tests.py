@@ -33,7 +33,6 @@ def verify_python_environment():
         'python-multipart',
         'whisper',
         'spacy',
-        'textstat',
         'pandas',
         'numpy',
         'requests',